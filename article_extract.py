@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+import re
+from datetime import datetime
+from stage_profiler import StageProfiler
+
+# 文章抓取、正文提取和分段（fetch_articles.py 和重新抓取脚本共用）
+# requests / bs4 只在真正抓取时导入，只读取数据的命令不需要加载它们
+
+NO_PROFILE = StageProfiler(None, enabled=False)
+
+def extract_article_content(article_url, profiler=NO_PROFILE):
+    """抓取并提取文章内容"""
+    try:
+        import requests
+        from bs4 import BeautifulSoup
+        print(f"  正在抓取: {article_url}")
+        with profiler.stage('network'):
+            response = requests.get(article_url, timeout=15)
+            response.raise_for_status()
+
+        with profiler.stage('parse'):
+            soup = BeautifulSoup(response.content, 'html.parser')
+
+        return extract_from_soup(soup, profiler)
+
+    except Exception as e:
+        print(f"    错误: {e}")
+        return {
+            "success": False,
+            "error": str(e),
+            "paragraphs": [],
+            "word_count": 0,
+            "paragraph_count": 0
+        }
+
+def extract_from_soup(soup, profiler=NO_PROFILE):
+    """从解析后的页面中提取正文并分段"""
+    with profiler.stage('extract'):
+        # 移除不需要的元素
+        for unwanted in soup.find_all(['script', 'style', 'nav', 'header', 'footer', 'iframe']):
+            unwanted.decompose()
+
+        # 尝试找到主要内容容器
+        content_selectors = [
+            'table',  # Paul Graham 网站主要使用table布局
+            'body',
+            'main',
+            '.content',
+            '#content'
+        ]
+
+        main_content = None
+        for selector in content_selectors:
+            content = soup.select_one(selector)
+            if content:
+                main_content = content
+                break
+
+        if not main_content:
+            main_content = soup
+
+        # 提取文本并分段
+        full_text = main_content.get_text()
+
+    # 清理和分段
+    with profiler.stage('segment'):
+        paragraphs = split_into_paragraphs(full_text)
+
+    return {
+        "success": True,
+        "paragraphs": paragraphs,
+        "word_count": len(full_text.split()),
+        "paragraph_count": len(paragraphs)
+    }
+
+def split_into_paragraphs(text):
+    """将文本智能分段"""
+    # 清理文本
+    text = re.sub(r'\s+', ' ', text.strip())
+
+    # 按段落分割（双换行或句号后换行）
+    paragraphs = []
+
+    # 按句号分割，但保留一些连接
+    sentences = re.split(r'(?<=[.!?])\s+', text)
+
+    current_paragraph = ""
+
+    for sentence in sentences:
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+
+        # 如果当前段落为空或者很短，添加句子
+        if len(current_paragraph) < 200:
+            current_paragraph += sentence + " "
+        else:
+            # 保存当前段落并开始新段落
+            if current_paragraph.strip():
+                paragraphs.append(current_paragraph.strip())
+            current_paragraph = sentence + " "
+
+    # 添加最后一个段落
+    if current_paragraph.strip():
+        paragraphs.append(current_paragraph.strip())
+
+    # 过滤掉太短的段落
+    paragraphs = [p for p in paragraphs if len(p.split()) > 5]
+
+    return paragraphs
+
+def processed_filename(article):
+    """文章在 data/processed 中的文件名"""
+    return article['filename'].replace('.html', '.json')
+
+def pending_translation(para):
+    """未翻译段落的占位符"""
+    return f"[待翻译] {para[:50]}..." if len(para) > 50 else f"[待翻译] {para}"
+
+def build_processed_article(article, content_result):
+    """组装 data/processed 中保存的文章数据，段落带翻译占位符"""
+    processed_article = {
+        "title": article['title'],
+        "title_zh": article.get('title_zh', f"[待翻译] {article['title']}"),
+        "url": article['url'],
+        "filename": article['filename'],
+        "date": article.get('date', 'Unknown'),
+        "id": article['id'],
+        "content": content_result,
+        "processed_at": datetime.now().isoformat()
+    }
+
+    # 为内容添加翻译占位符
+    if content_result['success']:
+        processed_article['paragraphs'] = [
+            {"original": para, "translated": pending_translation(para)}
+            for para in content_result['paragraphs']
+        ]
+    else:
+        processed_article['paragraphs'] = []
+    return processed_article
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+import json
+import os
+import sys
+from bisect import bisect_right
+from datetime import datetime
+from build_manifest import build_manifest
+
+# 文章列表维护：id 一旦分配就不再改变（页面和缓存都用它做键），
+# 列表始终按日期降序排列（无日期的在最后），order 字段是按显示顺序递增的排序键。
+# order 之间留有间隔，插入或移动文章时只给这一篇取前后两篇之间的值，其他文章的 order 不变
+ARTICLES_FILE = os.path.join('data', 'articles.json')
+PROCESSED_DIR = os.path.join('data', 'processed')
+
+# 首页读取的分页索引：head.json 只含首屏文章和分页信息，其余按显示顺序分到 page-N.json
+INDEX_DIR = os.path.join('data', 'index')
+HEAD_SIZE = 20
+PAGE_SIZE = 50
+SHARD_FIELDS = ('id', 'order', 'title', 'title_zh', 'filename', 'date')
+ORDER_STEP = 1024
+
+def normalize_date(date, max_year=None):
+    """校验日期，无效或晚于 max_year 的日期改为 Unknown"""
+    if date == 'Unknown':
+        return date
+    try:
+        parsed = datetime.strptime(date, '%Y-%m-%d')
+    except (TypeError, ValueError):
+        return 'Unknown'
+    if max_year is not None and parsed.year > max_year:
+        return 'Unknown'
+    return date
+
+def sort_key(article):
+    """升序排列的键：日期越新越靠前，无日期的在最后（YYYY-MM-DD 转成整数比较，不再逐次解析日期）
+
+    无法解析的日期（如 "June 2005"）和 Unknown 一样排在最后，之后由 fix_dates 修正。
+    """
+    try:
+        return (0, -int(article['date'].replace('-', '')))
+    except (AttributeError, ValueError):
+        return (1, 0)
+
+class ArticleIndex:
+    """按日期有序的文章列表，支持增量插入和移动，只修改被插入或移动的文章的 order"""
+
+    def __init__(self, articles):
+        self.articles = articles
+        self.keys = [sort_key(a) for a in articles]
+        self.next_id = max((a['id'] for a in articles), default=0) + 1
+        # 载入时的内容，用于判断哪些文章真正发生了变化
+        self.original = {a['id']: dict(a) for a in articles}
+        # 旧数据没有 order 字段时按当前位置编号
+        if any('order' not in a for a in articles):
+            self.renumber()
+
+    @classmethod
+    def load(cls, path=ARTICLES_FILE):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def renumber(self):
+        """按当前位置重新编号，相邻两篇间隔 ORDER_STEP"""
+        for position, article in enumerate(self.articles):
+            article['order'] = (position + 1) * ORDER_STEP
+
+    def assign_order(self, position):
+        """给 position 处的文章取前后两篇之间的 order，间隔用完时才整体重新编号"""
+        before = self.articles[position - 1]['order'] if position > 0 else None
+        after = self.articles[position + 1]['order'] if position + 1 < len(self.articles) else None
+        if before is None and after is None:
+            order = ORDER_STEP
+        elif before is None:
+            order = after - ORDER_STEP
+        elif after is None:
+            order = before + ORDER_STEP
+        elif after - before > 1:
+            order = (before + after) // 2
+        else:
+            self.renumber()
+            return
+        self.articles[position]['order'] = order
+
+    def changed(self):
+        """与载入时相比内容或顺序变化的文章"""
+        return [a for a in self.articles if self.original.get(a['id']) != a]
+
+    def insert(self, article, hi=None):
+        """按日期插入一篇文章（同一日期的排在已有文章之后），没有 id 时分配新的 id"""
+        if 'id' not in article:
+            article['id'] = self.next_id
+        self.next_id = max(self.next_id, article['id'] + 1)
+        key = sort_key(article)
+        position = bisect_right(self.keys, key, 0, len(self.keys) if hi is None else hi)
+        self.articles.insert(position, article)
+        self.keys.insert(position, key)
+        self.assign_order(position)
+        return position
+
+    def remove(self, position):
+        article = self.articles.pop(position)
+        self.keys.pop(position)
+        return article
+
+    def set_date(self, position, date):
+        """修改日期并移动到新的位置，返回新位置"""
+        article = self.articles[position]
+        if article['date'] == date:
+            return position
+        self.remove(position)
+        article['date'] = date
+        return self.insert(article)
+
+    def find(self, filename):
+        return [a['id'] for a in self.articles if a['filename'] == filename]
+
+    def position_of(self, article_id):
+        for position, article in enumerate(self.articles):
+            if article['id'] == article_id:
+                return position
+        return None
+
+    def fix_dates(self, max_year=None):
+        """把无效或未来的日期改为 Unknown，返回被修改的文章"""
+        fixed = []
+        position = 0
+        while position < len(self.articles):
+            article = self.articles[position]
+            date = normalize_date(article['date'], max_year)
+            if date != article['date']:
+                print(f"修正: {article['title']} 从 {article['date']} 改为 {date}")
+                fixed.append(article)
+                self.set_date(position, date)
+                continue  # 当前位置换成了下一篇文章
+            position += 1
+        return fixed
+
+    def fix_order(self):
+        """把不在正确位置的文章逐篇移回（正常情况下没有，只检查一遍 keys）"""
+        moved = 0
+        position = 1
+        while position < len(self.articles):
+            if self.keys[position - 1] > self.keys[position]:
+                # 前面 position 篇已经有序，只在这一段里二分查找
+                article = self.remove(position)
+                self.insert(article, hi=position)
+                moved += 1
+            position += 1
+        return moved
+
+    def save(self, path=ARTICLES_FILE, index_dir=INDEX_DIR):
+        """有变化时才写入 articles.json 和变化的索引分片，返回是否写入"""
+        if not self.changed() and len(self.articles) == len(self.original):
+            return False
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.articles, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+        build_shards(self.articles, index_dir)
+        build_manifest()
+        return True
+
+def write_if_changed(path, content):
+    """内容不同时才写入文件，返回是否写入"""
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            if f.read() == content:
+                return False
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+    return True
+
+def build_shards(articles, index_dir=INDEX_DIR, head_size=HEAD_SIZE, page_size=PAGE_SIZE):
+    """生成首页分页索引，只写入内容变化的分片，返回写入的文件数
+
+    分页从列表末尾开始对齐（第一页可能不满），新文章插到最前面时只有 head.json 和
+    page-1.json 变化，直到第一页满了才会整体后移一页。
+    """
+    os.makedirs(index_dir, exist_ok=True)
+    entries = [
+        {field: article.get(field, (position + 1) * ORDER_STEP) if field == 'order' else article[field]
+         for field in SHARD_FIELDS}
+        for position, article in enumerate(articles)
+    ]
+    rest = entries[head_size:]
+    first = len(rest) % page_size or page_size
+    pages = [rest[:first]] if rest else []
+    pages += [rest[i:i + page_size] for i in range(first, len(rest), page_size)]
+
+    def dumps(data):
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+    written = 0
+    head = {
+        "total": len(entries),
+        "pages": len(pages),
+        "page_size": page_size,
+        "articles": entries[:head_size]
+    }
+    written += write_if_changed(os.path.join(index_dir, 'head.json'), dumps(head))
+    for number, page in enumerate(pages, 1):
+        written += write_if_changed(os.path.join(index_dir, f'page-{number}.json'), dumps(page))
+
+    # 文章变少时删除多余的分片
+    number = len(pages) + 1
+    while os.path.exists(os.path.join(index_dir, f'page-{number}.json')):
+        os.remove(os.path.join(index_dir, f'page-{number}.json'))
+        number += 1
+    return written
+
+def sync_processed_dates(articles, processed_dir=PROCESSED_DIR):
+    """把修改后的日期写回对应的 processed 文件（只改这几篇）"""
+    for article in articles:
+        path = os.path.join(processed_dir, article['filename'].replace('.html', '.json'))
+        if not os.path.exists(path):
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('date') == article['date']:
+            continue
+        data['date'] = article['date']
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        print(f"  更新 {path}")
+
+def print_usage():
+    print("用法:")
+    print("  python article_index.py add <filename> <日期> <英文标题> [中文标题]  # 按日期插入新文章（分配新 id）")
+    print("  python article_index.py date <filename> <日期>                       # 修改日期并移动到对应位置")
+    print("  python article_index.py fix-dates                                    # 无效或未来的日期改为 Unknown")
+    print("  python article_index.py sort                                         # 检查顺序，只移动位置不对的文章")
+    print("  python article_index.py shards                                       # 重新生成首页分页索引 data/index")
+    print("id 保持不变，只有插入或移动的文章会修改 order；只有内容变化时才写入 articles.json 和对应的分片")
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print_usage()
+        sys.exit(1)
+
+    command = sys.argv[1]
+    index = ArticleIndex.load()
+    date_changed = []
+
+    if command == "add" and len(sys.argv) >= 5:
+        filename, date, title = sys.argv[2], normalize_date(sys.argv[3]), sys.argv[4]
+        position = index.insert({
+            "title": title,
+            "url": f"https://www.paulgraham.com/{filename}",
+            "filename": filename,
+            "title_zh": sys.argv[5] if len(sys.argv) > 5 else "",
+            "date": date
+        })
+        print(f"插入到第 {position + 1} 位，id {index.articles[position]['id']}")
+
+    elif command == "date" and len(sys.argv) == 4:
+        article_ids = index.find(sys.argv[2])
+        if not article_ids:
+            print(f"错误: 未找到文章 {sys.argv[2]}")
+            sys.exit(1)
+        date = normalize_date(sys.argv[3])
+        for article_id in article_ids:
+            position = index.position_of(article_id)
+            date_changed.append(index.articles[position])
+            position = index.set_date(position, date)
+            print(f"{index.articles[position]['title']} 移动到第 {position + 1} 位")
+
+    elif command == "fix-dates":
+        date_changed = index.fix_dates(max_year=datetime.now().year)
+        print(f"修正了 {len(date_changed)} 个日期")
+
+    elif command == "sort":
+        print(f"移动了 {index.fix_order()} 篇文章")
+
+    elif command == "shards":
+        print(f"写入了 {build_shards(index.articles)} 个分片（未变化的分片不重写）")
+        build_manifest()
+        sys.exit(0)
+
+    else:
+        print_usage()
+        sys.exit(1)
+
+    sync_processed_dates(date_changed)
+    if index.save():
+        print(f"已更新 {ARTICLES_FILE}（{len(index.changed())} 篇文章变化，id 不变）")
+    else:
+        print("没有变化")
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+import difflib
+import json
+import os
+import sys
+import time
+from article_extract import extract_article_content, build_processed_article, processed_filename, pending_translation
+from translation_memory import normalize_text
+from sentence_align import attach_alignment
+
+# 原文更新后的增量同步：重新抓取文章，把新段落和已保存的段落做序列比对，
+# 未变化和移动位置的段落保留原有译文，只有新增和修改的段落标记为 [待翻译]，
+# 之后运行翻译脚本时只会翻译这些段落。
+
+def merge_paragraphs(old_paragraphs, new_texts):
+    """按序列比对合并新旧段落，返回 (新的段落列表, 各类段落数)"""
+    old_keys = [normalize_text(para['original']) for para in old_paragraphs]
+    new_keys = [normalize_text(text) for text in new_texts]
+    # 移动位置的段落不在比对的相同区块中，按原文查找
+    by_key = {key: para for key, para in zip(old_keys, old_paragraphs)}
+    carried = set()  # 译文被保留下来的旧段落（按对象 id）
+
+    def carry(old, text):
+        carried.add(id(old))
+        para = dict(old, original=text)
+        if text != old['original']:
+            attach_alignment(para)  # 空白变化后对齐位置不再有效
+        return para
+
+    merged = []
+    counts = {"kept": 0, "moved": 0, "modified": 0, "inserted": 0, "deleted": 0}
+    replaced = []  # 每个不相同区块的 (旧段落, 其中修改的段落数)
+    matcher = difflib.SequenceMatcher(None, old_keys, new_keys, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            for old, text in zip(old_paragraphs[i1:i2], new_texts[j1:j2]):
+                merged.append(carry(old, text))
+            counts['kept'] += i2 - i1
+            continue
+        modified = 0
+        for key, text in zip(new_keys[j1:j2], new_texts[j1:j2]):
+            if key in by_key:
+                merged.append(carry(by_key[key], text))
+                counts['moved'] += 1
+            else:
+                merged.append({"original": text, "translated": pending_translation(text)})
+                if tag == 'replace':
+                    modified += 1
+                else:
+                    counts['inserted'] += 1
+        counts['modified'] += modified
+        replaced.append((old_paragraphs[i1:i2], modified))
+    # 不相同区块中没有被保留或移动的旧段落，除去被修改段落替换的，算作删除
+    # （不能用总数相减：被删段落的位置可能由另一段的重复填上）
+    for olds, modified in replaced:
+        dropped = sum(1 for old in olds if id(old) not in carried)
+        counts['deleted'] += max(dropped - modified, 0)
+    return merged, counts
+
+def resync_article(article, processed_dir, dry_run=False):
+    """重新抓取并增量同步单篇文章，返回各类段落数；抓取失败时返回 None，已有文件不变"""
+    path = os.path.join(processed_dir, processed_filename(article))
+    content_result = extract_article_content(article['url'])
+    if not content_result['success']:
+        print(f"    ✗ 抓取失败: {content_result.get('error', '未知错误')}，保留原有内容")
+        return None
+
+    processed_article = build_processed_article(article, content_result)
+    counts = {"kept": 0, "moved": 0, "modified": 0, "inserted": len(content_result['paragraphs']), "deleted": 0}
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            old_article = json.load(f)
+        old_paragraphs = old_article.get('paragraphs', [])
+        if old_paragraphs and isinstance(old_paragraphs[0], dict):
+            processed_article['paragraphs'], counts = merge_paragraphs(old_paragraphs, content_result['paragraphs'])
+        # 已翻译的标题不受正文变化影响
+        if not old_article.get('title_zh', '[待翻译]').startswith('[待翻译]'):
+            processed_article['title_zh'] = old_article['title_zh']
+
+    pending = counts['modified'] + counts['inserted']
+    print(f"    保留 {counts['kept']} 段，移动 {counts['moved']} 段，修改 {counts['modified']} 段，"
+          f"新增 {counts['inserted']} 段，删除 {counts['deleted']} 段 → {pending} 段待翻译")
+    if not dry_run and (pending or counts['deleted'] or counts['moved']):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(processed_article, f, ensure_ascii=False, indent=2)
+    return counts
+
+def resync_articles(article_ids, data_dir="data", dry_run=False):
+    """增量同步指定 id 的文章（article_ids 为 None 时同步全部），返回有变化的篇数"""
+    with open(os.path.join(data_dir, 'articles.json'), 'r', encoding='utf-8') as f:
+        articles = json.load(f)
+    targets = [a for a in articles if article_ids is None or a['id'] in article_ids]
+    print(f"找到 {len(targets)} 篇需要同步的文章{'（只比对，不写入）' if dry_run else ''}")
+
+    changed = pending = 0
+    processed_dir = os.path.join(data_dir, 'processed')
+    for i, article in enumerate(targets):
+        print(f"\n同步文章 {article['id']}: {article['title']}")
+        counts = resync_article(article, processed_dir, dry_run)
+        if counts and (counts['modified'] or counts['inserted'] or counts['deleted'] or counts['moved']):
+            changed += 1
+            pending += counts['modified'] + counts['inserted']
+        # 延时避免请求过于频繁
+        if i + 1 < len(targets):
+            time.sleep(1)
+
+    print(f"\n同步完成！{changed} 篇文章有变化，共 {pending} 段待翻译")
+    if pending and not dry_run:
+        print("运行 python translate_simple.py batch 只翻译这些段落")
+    return changed
+
+if __name__ == "__main__":
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    ids = {int(a) for a in sys.argv[1:] if a.isdigit()}
+    if not ids and "--all" not in sys.argv:
+        print("用法: python article_sync.py <id ...> [--dry-run]")
+        print("      python article_sync.py --all [--dry-run]   # 检查全部文章是否有更新")
+        sys.exit(1)
+    resync_articles(ids or None, dry_run="--dry-run" in sys.argv)
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+import hashlib
+import json
+import os
+import sys
+from datetime import datetime
+from translate_simple import build_messages, needs_paragraph_translation
+from token_chunker import count_tokens, max_tokens_for
+from translation_backends import DEFAULT_MODEL
+from sentence_align import attach_alignment
+from glossary import Glossary, GLOSSARY_FILE
+
+# 批量任务文件默认位置（仓库根目录的 requests.jsonl 是需求清单，不能覆盖）
+BATCH_DIR = os.path.join("data", "batch")
+DEFAULT_REQUESTS_FILE = os.path.join(BATCH_DIR, "requests.jsonl")
+DEFAULT_RESULTS_FILE = os.path.join(BATCH_DIR, "results.jsonl")
+
+def paragraph_digest(original):
+    """段落原文的短哈希"""
+    return hashlib.sha1(original.encode('utf-8')).hexdigest()[:12]
+
+def make_custom_id(slug, index, original):
+    """生成稳定的请求ID：文章名 + 段落序号 + 原文哈希
+
+    原文哈希用于在导入时发现文章已被重新抓取、段落已经变化的情况。
+    """
+    return f"{slug}:{index}:{paragraph_digest(original)}"
+
+def parse_custom_id(custom_id):
+    """解析请求ID，返回 (slug, index, digest)"""
+    slug, index, digest = custom_id.rsplit(':', 2)
+    return slug, int(index), digest
+
+def get_article_paragraphs(data):
+    """获取文章的段落列表（original/translated 格式）
+
+    只有 content.paragraphs 的文章会先补上 [待翻译] 占位段落（短段落与 translate_article 一样直接保留原文）。
+    """
+    if data.get('paragraphs') and isinstance(data['paragraphs'][0], dict):
+        return data['paragraphs']
+
+    originals = data.get('content', {}).get('paragraphs', [])
+    data['paragraphs'] = [
+        {
+            "original": para,
+            "translated": placeholder_translation(para)
+        }
+        for para in originals
+    ]
+    return data['paragraphs']
+
+def placeholder_translation(para):
+    if is_short_paragraph(para):
+        return para
+    return f"[待翻译] {para[:50]}..." if len(para) > 50 else f"[待翻译] {para}"
+
+def is_short_paragraph(para):
+    return len(para.strip().split()) < 3
+
+def keep_short_originals(paragraphs):
+    """把仍是占位标记的短段落改为原文，返回修改的段数"""
+    changed = 0
+    for para in paragraphs:
+        translated = para.get('translated', '')
+        if is_short_paragraph(para.get('original', '')) and (
+                not translated or translated.startswith(("[待翻译]", "[翻译失败]"))):
+            para['translated'] = para['original']
+            changed += 1
+    return changed
+
+def export_batch(data_dir, output_file, model=DEFAULT_MODEL):
+    """把所有待翻译段落写入批量任务文件"""
+    processed_dir = os.path.join(data_dir, 'processed')
+    glossary = Glossary.load(os.path.join(data_dir, GLOSSARY_FILE))
+    os.makedirs(os.path.dirname(output_file) or '.', exist_ok=True)
+
+    request_count = 0
+    article_count = 0
+
+    with open(output_file, 'w', encoding='utf-8') as out:
+        for filename in sorted(os.listdir(processed_dir)):
+            if not filename.endswith('.json'):
+                continue
+            try:
+                with open(os.path.join(processed_dir, filename), 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except Exception as e:
+                print(f"读取文件 {filename} 失败: {e}")
+                continue
+
+            slug = filename[:-len('.json')]
+            pending = 0
+            for i, para in enumerate(get_article_paragraphs(data)):
+                # 与其他翻译脚本使用同一判断（太短的段落直接保留原文，不需要请求）
+                if not needs_paragraph_translation(para):
+                    continue
+
+                original = para['original']
+                messages = build_messages(original, glossary.lookup([original]))
+                request = {
+                    "custom_id": make_custom_id(slug, i, original),
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": {
+                        "model": model,
+                        "messages": messages,
+                        "temperature": 0.7,
+                        # 与实时翻译相同，按输入长度设置
+                        "max_tokens": max_tokens_for(sum(count_tokens(m['content']) for m in messages))
+                    }
+                }
+                out.write(json.dumps(request, ensure_ascii=False) + '\n')
+                pending += 1
+
+            if pending:
+                article_count += 1
+                request_count += pending
+
+    print(f"已导出 {request_count} 个段落请求（{article_count} 篇文章）到 {output_file}")
+    return request_count
+
+def read_results(results_file):
+    """读取批量结果文件，按文章分组返回 {slug: {index: (digest, translated)}}"""
+    grouped = {}
+    failed = 0
+
+    with open(results_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            result = json.loads(line)
+            response = result.get('response') or {}
+            if result.get('error') or response.get('status_code') != 200:
+                failed += 1
+                continue
+            try:
+                content = response['body']['choices'][0]['message']['content'].strip()
+            except (KeyError, IndexError, TypeError):
+                failed += 1
+                continue
+
+            slug, index, digest = parse_custom_id(result['custom_id'])
+            grouped.setdefault(slug, {})[index] = (digest, content)
+
+    return grouped, failed
+
+def ingest_results(data_dir, results_file):
+    """把批量结果写回 data/processed 中对应的段落"""
+    processed_dir = os.path.join(data_dir, 'processed')
+    grouped, failed = read_results(results_file)
+
+    applied = 0
+    stale = 0
+
+    for slug, translations in sorted(grouped.items()):
+        article_file = os.path.join(processed_dir, f"{slug}.json")
+        if not os.path.exists(article_file):
+            print(f"  跳过: 文件 {slug}.json 不存在")
+            stale += len(translations)
+            continue
+
+        with open(article_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        paragraphs = get_article_paragraphs(data)
+        article_applied = 0
+        for index, (digest, content) in translations.items():
+            if index >= len(paragraphs):
+                stale += 1
+                continue
+            # 原文已变化（文章重新抓取过），结果作废
+            if paragraph_digest(paragraphs[index].get('original', '')) != digest:
+                stale += 1
+                continue
+            paragraphs[index]['translated'] = content
+            attach_alignment(paragraphs[index])
+            article_applied += 1
+
+        if not article_applied:
+            continue
+        # 短段落不会导出为请求，在这里保留原文，否则会一直停在占位标记上
+        keep_short_originals(paragraphs)
+
+        success_count = sum(1 for p in paragraphs if not needs_paragraph_translation(p))
+        data['translation_completed'] = datetime.now().isoformat()
+        data['translation_stats'] = {
+            "total_paragraphs": len(paragraphs),
+            "success_count": success_count,
+            "success_rate": f"{success_count/len(paragraphs)*100:.1f}%"
+        }
+
+        with open(article_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+
+        applied += article_applied
+        print(f"  ✓ {slug}: 写入 {article_applied} 段")
+
+    print(f"\n导入完成: 写入 {applied} 段, 失败结果 {failed} 个, 过期结果 {stale} 个")
+    return applied
+
+def simulate_results(requests_file, results_file):
+    """根据批量任务文件生成本地模拟结果，用于测试导入流程"""
+    count = 0
+    with open(requests_file, 'r', encoding='utf-8') as f, \
+         open(results_file, 'w', encoding='utf-8') as out:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            request = json.loads(line)
+            prompt = request['body']['messages'][-1]['content']
+            text = prompt.split("英文原文：", 1)[-1].strip()
+            result = {
+                "id": f"batch_req_{count}",
+                "custom_id": request['custom_id'],
+                "response": {
+                    "status_code": 200,
+                    "body": {
+                        "object": "chat.completion",
+                        "model": request['body']['model'],
+                        "choices": [
+                            {
+                                "index": 0,
+                                "message": {"role": "assistant", "content": f"[模拟译文] {text}"},
+                                "finish_reason": "stop"
+                            }
+                        ]
+                    }
+                },
+                "error": None
+            }
+            out.write(json.dumps(result, ensure_ascii=False) + '\n')
+            count += 1
+
+    print(f"已生成 {count} 条模拟结果到 {results_file}")
+    return count
+
+def print_usage():
+    """显示命令行用法"""
+    print("用法:")
+    print("  python batch_api.py export [输出文件]              # 导出所有待翻译段落为批量任务 JSONL")
+    print("  python batch_api.py ingest [结果文件]              # 把服务商返回的结果 JSONL 写回文章")
+    print("  python batch_api.py simulate [任务文件] [结果文件]  # 生成本地模拟结果（测试导入）")
+    print(f"默认任务文件: {DEFAULT_REQUESTS_FILE}")
+    print(f"默认结果文件: {DEFAULT_RESULTS_FILE}")
+
+if __name__ == "__main__":
+    DATA_DIR = "data"
+
+    if len(sys.argv) < 2:
+        print_usage()
+        sys.exit(1)
+
+    command = sys.argv[1]
+
+    if command == "export":
+        output_file = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_REQUESTS_FILE
+        export_batch(DATA_DIR, output_file, model=os.getenv("TRANSLATE_MODEL", DEFAULT_MODEL))
+
+    elif command == "ingest":
+        results_file = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_RESULTS_FILE
+        ingest_results(DATA_DIR, results_file)
+
+    elif command == "simulate":
+        requests_file = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_REQUESTS_FILE
+        results_file = sys.argv[3] if len(sys.argv) > 3 else DEFAULT_RESULTS_FILE
+        simulate_results(requests_file, results_file)
+
+    else:
+        print_usage()
+        sys.exit(1)
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""热点路径基准测试（离线运行）
+
+覆盖分段、正文提取、JSON 读写和翻译状态扫描，报告耗时和峰值内存，
+并与 benchmarks/baseline.json 比较以发现性能回退。
+
+基线保存的是相对耗时：每个用例的最小耗时除以校准循环（固定的纯 Python 计算）的最小耗时，
+校准循环与用例交替运行，换一台机器或机器负载变化时不会误报回退。
+
+fixtures/*.html 按 paulgraham.com 的 table 布局，由 data/processed 中的段落生成；
+fixtures/worked.txt 是 worked.html 的纯文本，分段用例不需要 bs4。
+正文提取用例（extract_article_content*）依赖 bs4（requirements.txt），未安装时跳过。
+
+用法:
+  python benchmarks/bench_hotpaths.py                  # 运行并与基线比较
+  python benchmarks/bench_hotpaths.py --save-baseline  # 运行并保存为新基线
+  python benchmarks/bench_hotpaths.py --threshold 3    # 超过基线 3 倍视为回退（默认 2）
+"""
+import contextlib
+import io
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, REPO_ROOT)
+
+FIXTURES_DIR = os.path.join(BENCH_DIR, 'fixtures')
+BASELINE_FILE = os.path.join(BENCH_DIR, 'baseline.json')
+DATA_DIR = os.path.join(REPO_ROOT, 'data')
+PROCESSED_DIR = os.path.join(DATA_DIR, 'processed')
+
+def largest_processed_files(count=3):
+    """data/processed 中最大的几个文件"""
+    files = [os.path.join(PROCESSED_DIR, f) for f in os.listdir(PROCESSED_DIR) if f.endswith('.json')]
+    return sorted(files, key=os.path.getsize, reverse=True)[:count]
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), 'r', encoding='utf-8') as f:
+        return f.read()
+
+def quiet(func):
+    """屏蔽被测函数的 print 输出"""
+    def wrapper():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return func()
+    return wrapper
+
+def calibration_loop():
+    """校准用的固定计算：字符串处理、字典和整数运算，与被测代码的负载类似"""
+    counts = {}
+    total = 0
+    for i in range(5000):
+        key = f"para-{i % 97}"
+        counts[key] = counts.get(key, 0) + 1
+        total += len(key.upper().split('-')[0]) * i
+    return total
+
+def build_cases():
+    """构造基准测试用例，返回 [(名称, 函数 或 跳过原因)]"""
+    cases = []
+
+    # 分段（纯文本，不依赖 bs4）
+    from article_extract import extract_from_soup, split_into_paragraphs
+    worked_text = read_fixture('worked.txt')
+    cases.append(('split_into_paragraphs', lambda: split_into_paragraphs(worked_text)))
+
+    # 正文提取（可选，依赖 bs4）
+    try:
+        from bs4 import BeautifulSoup
+    except ImportError as e:
+        cases.append(('extract_article_content', f"缺少可选依赖: {e}"))
+        cases.append(('extract_article_content_small', f"缺少可选依赖: {e}"))
+    else:
+        worked_html = read_fixture('worked.html')
+        cases.append(('extract_article_content', lambda: extract_from_soup(BeautifulSoup(worked_html, 'html.parser'))))
+        small_html = read_fixture('13sentences.html')
+        cases.append(('extract_article_content_small', lambda: extract_from_soup(BeautifulSoup(small_html, 'html.parser'))))
+
+    # 最大几个文件的 JSON 读写
+    for path in largest_processed_files():
+        name = os.path.basename(path)[:-len('.json')]
+        with open(path, 'r', encoding='utf-8') as f:
+            raw = f.read()
+        data = json.loads(raw)
+        cases.append((f'json_load[{name}]', lambda raw=raw: json.loads(raw)))
+        cases.append((f'json_dump[{name}]', lambda data=data: json.dumps(data, ensure_ascii=False, indent=2)))
+
+    # 翻译状态扫描（全部 data/processed）
+    from check_translation_status import check_translation_status
+    from check_and_translate import find_untranslated_articles
+    cases.append(('check_translation_status', quiet(lambda: check_translation_status(DATA_DIR))))
+    cases.append(('find_untranslated_articles', quiet(lambda: find_untranslated_articles(PROCESSED_DIR))))
+    from translate_simple import check_article_needs_translation
+    files = [os.path.join(PROCESSED_DIR, f) for f in sorted(os.listdir(PROCESSED_DIR)) if f.endswith('.json')]
+    cases.append(('check_article_needs_translation', lambda: [check_article_needs_translation(f) for f in files]))
+
+    return cases
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+def measure(func, repeat):
+    """返回 (中位耗时秒, 最小耗时秒, 峰值内存字节, 校准循环最小耗时秒)"""
+    func()  # 预热
+    timings = []
+    calibration = []
+    for _ in range(repeat):
+        # 每次运行前后各跑一次校准循环，两者处在相同的机器负载下
+        calibration.append(timed(calibration_loop))
+        timings.append(timed(func))
+        calibration.append(timed(calibration_loop))
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return statistics.median(timings), min(timings), peak, min(calibration)
+
+def run(repeat=10, threshold=2.0, save_baseline=False):
+    baseline = {}
+    if os.path.exists(BASELINE_FILE):
+        with open(BASELINE_FILE, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    results = {}
+    regressions = []
+
+    print(f"{'用例':<40} {'中位耗时':>10} {'最小耗时':>10} {'峰值内存':>10}  对比基线（相对校准循环）")
+    for name, case in build_cases():
+        if isinstance(case, str):
+            print(f"{name:<40} 跳过（{case}）")
+            continue
+
+        median, best, peak, calibration = measure(case, repeat)
+        relative = best / calibration
+        results[name] = {"relative": relative, "median": median, "min": best, "peak_bytes": peak}
+
+        compare = "无基线"
+        if 'relative' in baseline.get(name, {}):
+            # 用最小耗时比较，受机器负载抖动的影响最小；除以校准耗时消除机器快慢的差别
+            ratio = relative / baseline[name]["relative"]
+            compare = f"{ratio:.2f}x"
+            if ratio > threshold:
+                compare += "  ← 回退"
+                regressions.append(name)
+        print(f"{name:<40} {median*1000:>8.2f}ms {best*1000:>8.2f}ms {peak/1024:>8.0f}KB  {compare}")
+
+    if save_baseline:
+        baseline = results
+        with open(BASELINE_FILE, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, ensure_ascii=False, indent=2)
+        print(f"\n已保存基线: {BASELINE_FILE}")
+
+    if regressions:
+        print(f"\n发现 {len(regressions)} 项性能回退（阈值 {threshold}x）: {', '.join(regressions)}")
+        return False
+    return True
+
+if __name__ == "__main__":
+    threshold = 2.0
+    if "--threshold" in sys.argv:
+        threshold = float(sys.argv[sys.argv.index("--threshold") + 1])
+    repeat = 10
+    if "--repeat" in sys.argv:
+        repeat = int(sys.argv[sys.argv.index("--repeat") + 1])
+
+    ok = run(repeat=repeat, threshold=threshold, save_baseline="--save-baseline" in sys.argv)
+    sys.exit(0 if ok else 1)
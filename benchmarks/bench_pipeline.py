@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""端到端翻译流程基准测试
+
+把 data/processed 复制到临时目录，按比例把段落重置为 [待翻译]，
+然后用 translate_simple.translate_batch 对本地模拟翻译服务（mock_server.py）跑完整流程，
+报告吞吐量、API 调用次数、浪费的调用（重复翻译本来已经翻好的段落）和总耗时。
+
+用法:
+  python benchmarks/bench_pipeline.py --articles 20 --pending-rate 0.2 --latency 0.2 --jitter 0.5 \\
+      --distribution lognormal --error-rate 0.02 --rate-limit-rate 0.05 --workers 4
+"""
+import argparse
+import contextlib
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, REPO_ROOT)
+
+from mock_server import create_server
+from token_chunker import PARAGRAPH_SEPARATOR
+
+PENDING_MARKERS = ('[待翻译]', '[翻译失败]')
+
+def is_pending(translated):
+    return translated == '' or any(marker in translated for marker in PENDING_MARKERS)
+
+def prepare_corpus(work_dir, articles, pending_rate, seed):
+    """复制语料并重置部分段落，返回 (待翻译段落数, 已翻译原文计数)"""
+    source_dir = os.path.join(REPO_ROOT, 'data', 'processed')
+    target_dir = os.path.join(work_dir, 'processed')
+    os.makedirs(target_dir)
+
+    filenames = sorted(f for f in os.listdir(source_dir) if f.endswith('.json'))
+    if articles:
+        filenames = filenames[:articles]
+
+    rng = random.Random(seed)
+    pending = 0
+    good_originals = Counter()
+
+    for filename in filenames:
+        with open(os.path.join(source_dir, filename), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        for para in data.get('paragraphs', []):
+            if rng.random() < pending_rate:
+                para['translated'] = f"[待翻译] {para['original'][:50]}..."
+            if is_pending(para.get('translated', '')):
+                pending += 1
+            else:
+                good_originals[para['original'].strip()] += 1
+
+        with open(os.path.join(target_dir, filename), 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+
+    return len(filenames), pending, good_originals
+
+def count_pending(work_dir):
+    processed_dir = os.path.join(work_dir, 'processed')
+    pending = 0
+    for filename in os.listdir(processed_dir):
+        if not filename.endswith('.json'):
+            continue
+        with open(os.path.join(processed_dir, filename), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        pending += sum(1 for p in data.get('paragraphs', []) if is_pending(p.get('translated', '')))
+    return pending
+
+def analyse_requests(request_log, good_originals):
+    """统计发给服务商的段落中有多少本来已经翻译好"""
+    wasted_paragraphs = 0
+    wasted_calls = 0
+    sent_paragraphs = 0
+
+    for prompt in request_log:
+        text = prompt.split("英文原文：", 1)[-1]
+        texts = [t.strip() for t in text.split(PARAGRAPH_SEPARATOR) if t.strip()]
+        wasted = sum(1 for t in texts if good_originals[t] > 0)
+        sent_paragraphs += len(texts)
+        wasted_paragraphs += wasted
+        if texts and wasted == len(texts):
+            wasted_calls += 1
+
+    return sent_paragraphs, wasted_paragraphs, wasted_calls
+
+def run(args):
+    work_dir = tempfile.mkdtemp(prefix='bench_pipeline_')
+    server = create_server(
+        port=0,
+        latency=args.latency,
+        jitter=args.jitter,
+        distribution=args.distribution,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        seed=args.seed
+    )
+    server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+    server_thread.start()
+
+    try:
+        article_count, pending_before, good_originals = prepare_corpus(
+            work_dir, args.articles, args.pending_rate, args.seed
+        )
+
+        os.environ["TRANSLATE_BACKEND"] = "http"
+        os.environ["TRANSLATE_API_BASE"] = f"http://127.0.0.1:{server.server_port}/v1/chat/completions"
+        os.environ["TRANSLATE_RATE_LIMIT"] = str(args.client_rate_limit)
+
+        from translate_simple import translate_batch
+
+        start = time.perf_counter()
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            translate_batch(work_dir, "bench", workers=args.workers)
+        wall_time = time.perf_counter() - start
+
+        request_log = list(server.RequestHandlerClass.request_log)
+        pending_after = count_pending(work_dir)
+        sent, wasted_paragraphs, wasted_calls = analyse_requests(request_log, good_originals)
+        translated = pending_before - pending_after
+
+        result = {
+            "articles": article_count,
+            "workers": args.workers,
+            "pending_before": pending_before,
+            "pending_after": pending_after,
+            "paragraphs_translated": translated,
+            "wall_seconds": round(wall_time, 3),
+            "paragraphs_per_second": round(translated / wall_time, 3) if wall_time else 0,
+            "api_calls": len(request_log),
+            "paragraphs_sent": sent,
+            "wasted_paragraphs": wasted_paragraphs,
+            "wasted_calls": wasted_calls,
+            "provider": {
+                "latency": args.latency,
+                "jitter": args.jitter,
+                "distribution": args.distribution,
+                "error_rate": args.error_rate,
+                "rate_limit_rate": args.rate_limit_rate,
+                "seed": args.seed
+            }
+        }
+    finally:
+        server.shutdown()
+        if args.keep:
+            print(f"保留临时目录: {work_dir}")
+        else:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    return result
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="端到端翻译流程基准测试（本地模拟服务）")
+    parser.add_argument('--articles', type=int, default=20, help="使用的文章数（按文件名排序取前 N 篇，0 表示全部）")
+    parser.add_argument('--pending-rate', type=float, default=0.1, help="重置为 [待翻译] 的段落比例")
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--client-rate-limit', type=float, default=0.0, help="客户端请求间隔（秒），默认不限制")
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--distribution', choices=['uniform', 'lognormal', 'exponential'], default='uniform')
+    parser.add_argument('--error-rate', type=float, default=0.0, help="HTTP 500 概率")
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help="HTTP 429 概率")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="结果另存为 JSON 文件")
+    parser.add_argument('--keep', action='store_true', help="保留临时语料目录")
+    args = parser.parse_args()
+
+    result = run(args)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
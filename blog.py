@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+import os
+import runpy
+import sys
+
+# 统一的命令行入口：python blog.py <命令> [子命令] [参数...]
+# 每个子命令交给已有脚本的命令行处理，只在运行时才导入对应模块，
+# 因此 status 等只读命令不会加载 requests / bs4 / dotenv，启动只需几十毫秒。
+# (模块名, 插在参数前面的固定参数, 说明)
+COMMANDS = {
+    "fetch": {
+        "": ("fetch_articles", [], "抓取所有未处理的文章（--profile 性能分析，--report 只输出统计）"),
+        "refetch": ("fetch_articles", ["--refetch"], "按 id 重新抓取文章，如 refetch 1 2"),
+        "resync": ("article_sync", [], "原文更新后增量同步，只重新翻译变化的段落（id ... 或 --all，--dry-run）"),
+    },
+    "translate": {
+        "batch": ("translate_simple", ["batch"], "批量翻译（--workers N --store --dedup --priority ... --resume）"),
+        "single": ("translate_simple", ["single"], "翻译单篇文章，如 single field"),
+        "failed": ("retranslate_failed", [], "重新翻译含失败段落的文章（可指定文件名）"),
+        "titles": ("translate_titles", [], "合并请求翻译缺失的中文标题（--dry-run）"),
+        "glossary": ("glossary", ["translate"], "合并请求翻译术语表中还没有译法的术语"),
+        "dedup": ("paragraph_dedup", [], "全语料段落去重翻译（--dry-run）"),
+    },
+    "status": {
+        "": ("check_translation_status", [], "翻译状态汇总"),
+        "queue": ("translation_scheduler", [], "待翻译队列和优先级（--priority ... --top N）"),
+        "budget": ("token_budget", [], "token / 费用预算用量（--reset-run）"),
+        "quality": ("quality_check", [], "译文质量筛查（--top N）"),
+        "glossary": ("glossary", ["list"], "术语表和常用术语的译法"),
+        "db": ("corpus_db", ["status"], "SQLite 语料库中的翻译状态"),
+    },
+    "repair": {
+        "dates": ("article_index", ["fix-dates"], "无效或未来的日期改为 Unknown"),
+        "sort": ("article_index", ["sort"], "按日期修正文章列表顺序（id 不变）"),
+        "date": ("article_index", ["date"], "修改单篇文章日期，如 date field.html 2025-06-01"),
+        "quality": ("quality_check", ["--mark"], "把质量筛查发现的问题段落标记为 [翻译失败]"),
+    },
+    "build": {
+        "": ("article_index", ["shards"], "生成首页分页索引和 service worker 缓存清单"),
+        "manifest": ("build_manifest", [], "只重新生成 sw-manifest.js"),
+        "store": ("paragraph_store", ["convert"], "processed JSON 转换为段落库（可指定 slug）"),
+        "db": ("corpus_db", ["import"], "重建 SQLite 语料库 data/corpus.db"),
+        "align": ("sentence_align", [], "为已翻译段落补充句子对齐（可指定 slug 查看结果）"),
+        "glossary": ("glossary", ["build"], "从全部原文挖掘术语，更新 data/glossary.json"),
+    },
+}
+
+def print_usage():
+    print("用法: python blog.py <命令> [子命令] [参数...]")
+    for command, subcommands in COMMANDS.items():
+        for subcommand, (_, _, description) in subcommands.items():
+            print(f"  {(command + ' ' + subcommand).strip():<18} {description}")
+
+def resolve(argv):
+    """解析命令行，返回 (模块名, 传给模块的参数)；无法识别时返回 None"""
+    if not argv or argv[0] not in COMMANDS:
+        return None
+    subcommands = COMMANDS[argv[0]]
+    if len(argv) > 1 and argv[1] in subcommands:
+        module, fixed, _ = subcommands[argv[1]]
+        return module, fixed + argv[2:]
+    if "" in subcommands:
+        module, fixed, _ = subcommands[""]
+        return module, fixed + argv[1:]
+    return None
+
+if __name__ == "__main__":
+    target = resolve(sys.argv[1:])
+    if target is None:
+        print_usage()
+        sys.exit(1)
+
+    # 各脚本都按仓库根目录的相对路径读写 data/
+    root = os.path.dirname(os.path.abspath(__file__))
+    os.chdir(root)
+    module, args = target
+    sys.argv = [os.path.join(root, f"{module}.py")] + args
+    runpy.run_module(module, run_name="__main__", alter_sys=True)
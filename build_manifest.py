@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+import hashlib
+import json
+import os
+
+# Service Worker 预缓存清单：页面、文章列表和首页分页索引。
+# 版本号是这些文件内容的哈希，任一文件变化后 sw-manifest.js 随之变化，浏览器会重新安装 sw.js
+MANIFEST_FILE = 'sw-manifest.js'
+SHELL_FILES = ['index.html', 'article.html', os.path.join('data', 'articles.json')]
+INDEX_DIR = os.path.join('data', 'index')
+
+def precache_files(root='.'):
+    files = list(SHELL_FILES)
+    index_dir = os.path.join(root, INDEX_DIR)
+    if os.path.isdir(index_dir):
+        files += [os.path.join(INDEX_DIR, f) for f in sorted(os.listdir(index_dir)) if f.endswith('.json')]
+    return [f for f in files if os.path.exists(os.path.join(root, f))]
+
+def build_manifest(root='.'):
+    """生成 sw-manifest.js，返回版本号"""
+    files = precache_files(root)
+    digest = hashlib.sha1()
+    for path in files:
+        digest.update(path.encode('utf-8'))
+        with open(os.path.join(root, path), 'rb') as f:
+            digest.update(f.read())
+    version = digest.hexdigest()[:12]
+
+    manifest = {
+        "version": version,
+        "precache": ['./'] + [path.replace(os.sep, '/') for path in files]
+    }
+    content = (
+        "// 由 build_manifest.py 生成，请勿手动修改\n"
+        f"self.CACHE_MANIFEST = {json.dumps(manifest, ensure_ascii=False, indent=2)};\n"
+    )
+    with open(os.path.join(root, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+        f.write(content)
+    return version, len(manifest["precache"])
+
+if __name__ == "__main__":
+    version, count = build_manifest()
+    print(f"已生成 {MANIFEST_FILE}：版本 {version}，预缓存 {count} 个文件")
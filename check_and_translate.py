@@ -4,6 +4,7 @@ import os
 import subprocess
 import sys
 from pathlib import Path
+from translate_simple import needs_paragraph_translation
 
 def find_untranslated_articles(data_dir="data/processed"):
     """查找包含未翻译内容的文章"""
@@ -25,15 +26,7 @@ def find_untranslated_articles(data_dir="data/processed"):
             has_untranslated = False
             
             if 'paragraphs' in data and data['paragraphs']:
-                for para in data['paragraphs']:
-                    translated = para.get('translated', '')
-                    if (translated.startswith('[翻译失败]') or 
-                        translated.startswith('[待翻译]') or 
-                        translated == '' or
-                        '[翻译失败]' in translated or
-                        '[待翻译]' in translated):
-                        has_untranslated = True
-                        break
+                has_untranslated = any(needs_paragraph_translation(para) for para in data['paragraphs'])
             elif 'content' in data and 'paragraphs' in data['content']:
                 # 如果只有原始内容但没有翻译过的paragraphs字段
                 has_untranslated = True
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 import json
 import os
+from translate_simple import needs_paragraph_translation
 
 def check_translation_status(data_dir):
     """检查翻译状态"""
@@ -27,12 +28,7 @@ def check_translation_status(data_dir):
                     total_count = len(data['paragraphs'])
                     
                     for para in data['paragraphs']:
-                        translated = para.get('translated', '')
-                        if (translated.startswith('[翻译失败]') or 
-                            translated.startswith('[待翻译]') or 
-                            translated == '' or
-                            '[翻译失败]' in translated or
-                            '[待翻译]' in translated):
+                        if needs_paragraph_translation(para):
                             failed_count += 1
                     
                     if failed_count == total_count:
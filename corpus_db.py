@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+from datetime import datetime
+from paragraph_store import split_article, write_article_json
+from article_index import ArticleIndex, ORDER_STEP, build_shards, normalize_date
+from build_manifest import build_manifest
+
+# 可选的单文件语料库：data/articles.json 和 data/processed/*.json 合并到 SQLite，
+# 状态查询、排序和局部修改都走索引，最后再导出页面读取的静态 JSON
+DB_FILE = "corpus.db"
+
+# articles 对应 articles.json 的每一项（同一篇文章可能出现多次，slug 不唯一）；
+# documents 保存 processed 文章的元数据，paragraphs 保存段落
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    slug TEXT NOT NULL,
+    title TEXT,
+    url TEXT,
+    filename TEXT,
+    title_zh TEXT,
+    date TEXT,
+    display_order INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_articles_slug ON articles(slug);
+CREATE INDEX IF NOT EXISTS idx_articles_order ON articles(display_order);
+CREATE INDEX IF NOT EXISTS idx_articles_date ON articles(date);
+
+CREATE TABLE IF NOT EXISTS documents (
+    slug TEXT PRIMARY KEY,
+    header TEXT NOT NULL,
+    status TEXT NOT NULL,
+    total_paragraphs INTEGER NOT NULL,
+    pending_paragraphs INTEGER NOT NULL,
+    failed_paragraphs INTEGER NOT NULL,
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_documents_status ON documents(status);
+
+CREATE TABLE IF NOT EXISTS paragraphs (
+    slug TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    original TEXT NOT NULL,
+    translated TEXT NOT NULL,
+    status TEXT NOT NULL,
+    extra TEXT,
+    PRIMARY KEY (slug, idx)
+);
+CREATE INDEX IF NOT EXISTS idx_paragraphs_status ON paragraphs(status, slug);
+"""
+
+ARTICLE_FIELDS = ('title', 'url', 'filename', 'title_zh', 'date', 'id')
+
+def connect(data_dir, create=False):
+    """打开语料库；create 为 False 时数据库必须已存在（避免 sqlite3 悄悄建出一个空库）"""
+    path = os.path.join(data_dir, DB_FILE)
+    if not create and not os.path.exists(path):
+        raise FileNotFoundError(f"未找到 {path}，请先运行 python corpus_db.py import")
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(SCHEMA)
+    return conn
+
+def paragraph_status(translated):
+    """段落翻译状态：done / pending / failed"""
+    if '[翻译失败]' in translated:
+        return 'failed'
+    if translated == '' or '[待翻译]' in translated:
+        return 'pending'
+    return 'done'
+
+def import_corpus(data_dir):
+    """从 JSON 重建数据库"""
+    conn = connect(data_dir, create=True)
+    with conn:
+        conn.execute("DELETE FROM articles")
+        conn.execute("DELETE FROM documents")
+        conn.execute("DELETE FROM paragraphs")
+
+        with open(os.path.join(data_dir, 'articles.json'), 'r', encoding='utf-8') as f:
+            articles = json.load(f)
+        conn.executemany(
+            "INSERT INTO articles (id, slug, title, url, filename, title_zh, date, display_order)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [(a['id'], a['filename'][:-len('.html')], a['title'], a['url'], a['filename'], a.get('title_zh', ''),
+              a['date'], a.get('order', (position + 1) * ORDER_STEP))
+             for position, a in enumerate(articles)]
+        )
+
+        processed_dir = os.path.join(data_dir, 'processed')
+        for filename in sorted(os.listdir(processed_dir)):
+            if not filename.endswith('.json'):
+                continue
+            slug = filename[:-len('.json')]
+            with open(os.path.join(processed_dir, filename), 'r', encoding='utf-8') as f:
+                header, paragraphs = split_article(json.load(f))
+            rows = []
+            for i, para in enumerate(paragraphs):
+                extra = {k: v for k, v in para.items() if k not in ('original', 'translated')}
+                if extra and list(para)[:2] != ['original', 'translated']:
+                    # 字段顺序不是 original、translated 开头时，保存完整的字段顺序（两列的值用 null 占位）
+                    extra = {k: None if k in ('original', 'translated') else v for k, v in para.items()}
+                rows.append((slug, i, para['original'], para.get('translated', ''),
+                             paragraph_status(para.get('translated', '')),
+                             json.dumps(extra, ensure_ascii=False) if extra else None))
+            conn.executemany(
+                "INSERT INTO paragraphs (slug, idx, original, translated, status, extra) VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            conn.execute(
+                "INSERT INTO documents (slug, header, status, total_paragraphs, pending_paragraphs, failed_paragraphs)"
+                " VALUES (?, ?, '', 0, 0, 0)",
+                (slug, json.dumps(header, ensure_ascii=False))
+            )
+            refresh_document_status(conn, slug)
+
+    print(f"已导入 {len(articles)} 条文章列表、{conn.execute('SELECT COUNT(*) FROM documents').fetchone()[0]} 篇文章内容")
+    return conn
+
+def refresh_document_status(conn, slug):
+    """根据段落状态更新文章状态（与 check_translation_status 的分类一致）"""
+    counts = dict(conn.execute(
+        "SELECT status, COUNT(*) FROM paragraphs WHERE slug = ? GROUP BY status", (slug,)
+    ).fetchall())
+    total = sum(counts.values())
+    unfinished = counts.get('pending', 0) + counts.get('failed', 0)
+    if total == 0 or unfinished == total:
+        status = 'untranslated'
+    elif unfinished:
+        status = 'partial'
+    else:
+        status = 'completed'
+    conn.execute(
+        "UPDATE documents SET status = ?, total_paragraphs = ?, pending_paragraphs = ?, failed_paragraphs = ?,"
+        " updated_at = ? WHERE slug = ?",
+        (status, total, counts.get('pending', 0), counts.get('failed', 0), datetime.now().isoformat(), slug)
+    )
+
+def update_paragraph(conn, slug, idx, translated):
+    """修改单个段落的译文"""
+    conn.execute(
+        "UPDATE paragraphs SET translated = ?, status = ? WHERE slug = ? AND idx = ?",
+        (translated, paragraph_status(translated), slug, idx)
+    )
+    refresh_document_status(conn, slug)
+
+def load_index(conn):
+    """按显示顺序读出文章列表，排序和 order 的维护交给 ArticleIndex（与 article_index.py 的规则一致）"""
+    return ArticleIndex([
+        {**{field: row[field] for field in ARTICLE_FIELDS}, "order": row['display_order']}
+        for row in conn.execute("SELECT * FROM articles ORDER BY display_order")
+    ])
+
+def save_index(conn, index):
+    """写回日期或显示顺序变化的文章，返回变化的条数"""
+    changed = index.changed()
+    conn.executemany(
+        "UPDATE articles SET date = ?, display_order = ? WHERE id = ?",
+        [(a['date'], a['order'], a['id']) for a in changed]
+    )
+    return len(changed)
+
+def update_article(conn, article_id, field, value):
+    """修改文章列表中的单个字段，返回需要重新导出的文章 slug（没有时为 None）
+
+    修改日期时同时移动显示顺序，并更新对应文章内容中的日期。
+    """
+    if field not in ('title', 'url', 'title_zh', 'date'):
+        raise ValueError(f"不支持修改字段: {field}")
+    if field != 'date':
+        conn.execute(f"UPDATE articles SET {field} = ? WHERE id = ?", (value, article_id))
+        return None
+
+    index = load_index(conn)
+    position = index.position_of(article_id)
+    if position is None:
+        raise ValueError(f"没有 id 为 {article_id} 的文章")
+    date = normalize_date(value)
+    slug = index.articles[position]['filename'][:-len('.html')]
+    index.set_date(position, date)
+    save_index(conn, index)
+
+    row = conn.execute("SELECT header FROM documents WHERE slug = ?", (slug,)).fetchone()
+    if row is None:
+        return None
+    header = json.loads(row['header'])
+    if header.get('date') == date:
+        return None
+    header['date'] = date
+    conn.execute("UPDATE documents SET header = ? WHERE slug = ?", (json.dumps(header, ensure_ascii=False), slug))
+    return slug
+
+def resort_articles(conn):
+    """把不在正确位置（日期降序，无日期的在最后）的文章移回，id 不变，只修改被移动文章的 order"""
+    index = load_index(conn)
+    index.fix_order()
+    return save_index(conn, index)
+
+def export_articles(conn, data_dir):
+    """导出 data/articles.json 和首页分页索引"""
+    articles = [
+        {**{field: row[field] for field in ARTICLE_FIELDS}, "order": row['display_order']}
+        for row in conn.execute("SELECT * FROM articles ORDER BY display_order")
+    ]
+    with open(os.path.join(data_dir, 'articles.json'), 'w', encoding='utf-8') as f:
+        json.dump(articles, f, ensure_ascii=False, indent=2)
+    build_shards(articles, os.path.join(data_dir, 'index'))
+    build_manifest(os.path.dirname(os.path.abspath(data_dir)))
+    return len(articles)
+
+def iter_document_paragraphs(conn, slug):
+    for row in conn.execute(
+        "SELECT original, translated, extra FROM paragraphs WHERE slug = ? ORDER BY idx", (slug,)
+    ):
+        # 字段顺序与导入前一致：通常是 original、translated，然后是其他字段（如 align）
+        extra = json.loads(row['extra']) if row['extra'] else {}
+        if 'original' in extra:
+            para = extra
+            para['original'] = row['original']
+            para['translated'] = row['translated']
+        else:
+            para = {"original": row['original'], "translated": row['translated'], **extra}
+        yield para
+
+def export_documents(conn, data_dir, slugs=None):
+    """导出 data/processed/<slug>.json（不指定 slugs 时导出全部）"""
+    if not slugs:
+        slugs = [row['slug'] for row in conn.execute("SELECT slug FROM documents ORDER BY slug")]
+    for slug in slugs:
+        row = conn.execute("SELECT header FROM documents WHERE slug = ?", (slug,)).fetchone()
+        if row is None:
+            print(f"  ✗ 数据库中没有文章: {slug}")
+            continue
+        write_article_json(
+            os.path.join(data_dir, 'processed', f"{slug}.json"),
+            json.loads(row['header']),
+            lambda slug=slug: iter_document_paragraphs(conn, slug)
+        )
+    return len(slugs)
+
+def verify_documents(conn, data_dir):
+    """把每篇文章导出到临时目录，与 data/processed 中的文件逐字节比较，返回不一致的 slug 列表"""
+    mismatched = []
+    processed_dir = os.path.join(data_dir, 'processed')
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for row in conn.execute("SELECT slug, header FROM documents ORDER BY slug").fetchall():
+            slug = row['slug']
+            exported = os.path.join(tmp_dir, f"{slug}.json")
+            write_article_json(exported, json.loads(row['header']), lambda slug=slug: iter_document_paragraphs(conn, slug))
+            with open(exported, 'rb') as f, open(os.path.join(processed_dir, f"{slug}.json"), 'rb') as g:
+                if f.read() != g.read():
+                    mismatched.append(slug)
+    return mismatched
+
+def print_status(conn):
+    """按状态统计文章（走 documents.status 索引，不读取任何 JSON）"""
+    counts = dict(conn.execute("SELECT status, COUNT(*) FROM documents GROUP BY status").fetchall())
+    print("翻译状态汇总:")
+    print(f"- 完全未翻译: {counts.get('untranslated', 0)} 篇")
+    print(f"- 部分翻译失败: {counts.get('partial', 0)} 篇")
+    print(f"- 翻译完成: {counts.get('completed', 0)} 篇")
+    print(f"- 总计: {sum(counts.values())} 篇")
+
+    partial = conn.execute(
+        "SELECT slug, pending_paragraphs + failed_paragraphs AS unfinished, total_paragraphs FROM documents"
+        " WHERE status = 'partial' ORDER BY unfinished DESC LIMIT 10"
+    ).fetchall()
+    if partial:
+        print("\n未完成段落最多的文章:")
+        for i, row in enumerate(partial):
+            print(f"  {i+1}. {row['slug']} ({row['unfinished']}/{row['total_paragraphs']} 段落未完成)")
+
+    pending = conn.execute("SELECT COUNT(*) FROM paragraphs WHERE status != 'done'").fetchone()[0]
+    print(f"\n待翻译段落: {pending}")
+
+def print_usage():
+    print("用法:")
+    print("  python corpus_db.py import                    # 从 data/articles.json 和 data/processed 重建 data/corpus.db")
+    print("  python corpus_db.py status                    # 翻译状态汇总")
+    print("  python corpus_db.py sort                      # 按日期更新显示顺序（id 不变）并导出 articles.json")
+    print("  python corpus_db.py set <id> <字段> <值>      # 修改文章列表字段（title/url/title_zh/date）并导出 articles.json")
+    print("  python corpus_db.py export [slug ...]         # 导出 articles.json 和 processed JSON（不指定 slug 时导出全部）")
+    print("  python corpus_db.py verify                    # 检查导出的 processed JSON 与现有文件逐字节一致")
+
+if __name__ == "__main__":
+    DATA_DIR = "data"
+
+    if len(sys.argv) < 2:
+        print_usage()
+        sys.exit(1)
+
+    command = sys.argv[1]
+
+    if command != "import" and not os.path.exists(os.path.join(DATA_DIR, DB_FILE)):
+        print(f"错误: 未找到 {os.path.join(DATA_DIR, DB_FILE)}，请先运行 python corpus_db.py import")
+        sys.exit(1)
+
+    if command == "import":
+        import_corpus(DATA_DIR)
+
+    elif command == "status":
+        print_status(connect(DATA_DIR))
+
+    elif command == "sort":
+        conn = connect(DATA_DIR)
+        with conn:
+            changed = resort_articles(conn)
+        export_articles(conn, DATA_DIR)
+        print(f"完成！{changed} 篇文章显示顺序变化")
+
+    elif command == "set" and len(sys.argv) == 5:
+        conn = connect(DATA_DIR)
+        try:
+            with conn:
+                slug = update_article(conn, int(sys.argv[2]), sys.argv[3], sys.argv[4])
+        except ValueError as e:
+            print(f"错误: {e}")
+            sys.exit(1)
+        export_articles(conn, DATA_DIR)
+        if slug:
+            export_documents(conn, DATA_DIR, [slug])
+        print(f"已更新文章 {sys.argv[2]} 的 {sys.argv[3]}")
+
+    elif command == "export":
+        conn = connect(DATA_DIR)
+        slugs = sys.argv[2:]
+        if not slugs:
+            print(f"已导出 {export_articles(conn, DATA_DIR)} 条文章列表")
+        print(f"已导出 {export_documents(conn, DATA_DIR, slugs)} 篇文章内容")
+
+    elif command == "verify":
+        mismatched = verify_documents(connect(DATA_DIR), DATA_DIR)
+        for slug in mismatched:
+            print(f"  ✗ {slug}.json 导出结果与现有文件不一致")
+        print("✓ 全部文章导出结果与现有文件一致" if not mismatched else f"{len(mismatched)} 篇文章不一致")
+        sys.exit(1 if mismatched else 0)
+
+    else:
+        print_usage()
@@ -1,102 +1,13 @@
 #!/usr/bin/env python3
-import requests
-from bs4 import BeautifulSoup
 import json
 import os
 import time
-import re
-from datetime import datetime
+import sys
+from stage_profiler import StageProfiler
+from article_extract import extract_article_content, build_processed_article, processed_filename
 
-def extract_article_content(article_url):
-    """抓取并提取文章内容"""
-    try:
-        print(f"  正在抓取: {article_url}")
-        response = requests.get(article_url, timeout=15)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # 移除不需要的元素
-        for unwanted in soup.find_all(['script', 'style', 'nav', 'header', 'footer', 'iframe']):
-            unwanted.decompose()
-        
-        # 尝试找到主要内容容器
-        content_selectors = [
-            'table',  # Paul Graham 网站主要使用table布局
-            'body',
-            'main',
-            '.content',
-            '#content'
-        ]
-        
-        main_content = None
-        for selector in content_selectors:
-            content = soup.select_one(selector)
-            if content:
-                main_content = content
-                break
-        
-        if not main_content:
-            main_content = soup
-        
-        # 提取文本并分段
-        full_text = main_content.get_text()
-        
-        # 清理和分段
-        paragraphs = split_into_paragraphs(full_text)
-        
-        return {
-            "success": True,
-            "paragraphs": paragraphs,
-            "word_count": len(full_text.split()),
-            "paragraph_count": len(paragraphs)
-        }
-        
-    except Exception as e:
-        print(f"    错误: {e}")
-        return {
-            "success": False,
-            "error": str(e),
-            "paragraphs": [],
-            "word_count": 0,
-            "paragraph_count": 0
-        }
-
-def split_into_paragraphs(text):
-    """将文本智能分段"""
-    # 清理文本
-    text = re.sub(r'\s+', ' ', text.strip())
-    
-    # 按段落分割（双换行或句号后换行）
-    paragraphs = []
-    
-    # 按句号分割，但保留一些连接
-    sentences = re.split(r'(?<=[.!?])\s+', text)
-    
-    current_paragraph = ""
-    
-    for sentence in sentences:
-        sentence = sentence.strip()
-        if not sentence:
-            continue
-            
-        # 如果当前段落为空或者很短，添加句子
-        if len(current_paragraph) < 200:
-            current_paragraph += sentence + " "
-        else:
-            # 保存当前段落并开始新段落
-            if current_paragraph.strip():
-                paragraphs.append(current_paragraph.strip())
-            current_paragraph = sentence + " "
-    
-    # 添加最后一个段落
-    if current_paragraph.strip():
-        paragraphs.append(current_paragraph.strip())
-    
-    # 过滤掉太短的段落
-    paragraphs = [p for p in paragraphs if len(p.split()) > 5]
-    
-    return paragraphs
+# 性能分析（--profile 时启用，结果写入 data/profile/fetch）
+profiler = StageProfiler(os.path.join('data', 'profile', 'fetch'), enabled=False)
 
 def process_all_articles():
     """处理所有文章"""
@@ -127,7 +38,7 @@ def process_all_articles():
         print(f"\n处理第 {i//batch_size + 1} 批 ({i+1}-{min(i+batch_size, len(articles))}/{len(articles)})")
         
         for j, article in enumerate(batch):
-            filename = article['filename'].replace('.html', '.json')
+            filename = processed_filename(article)
             
             # 跳过已处理的文章
             if filename in processed_files:
@@ -137,48 +48,11 @@ def process_all_articles():
             
             print(f"  {i+j+1}. 处理: {article['title']}")
             
-            # 抓取文章内容
-            content_result = extract_article_content(article['url'])
-            
-            # 准备保存的数据
-            processed_article = {
-                "title": article['title'],
-                "title_zh": article.get('title_zh', f"[待翻译] {article['title']}"),
-                "url": article['url'],
-                "filename": article['filename'],
-                "date": article.get('date', 'Unknown'),
-                "id": article['id'],
-                "content": content_result,
-                "processed_at": datetime.now().isoformat()
-            }
-            
-            # 为内容添加翻译占位符
-            if content_result['success']:
-                processed_paragraphs = []
-                for para in content_result['paragraphs']:
-                    processed_paragraphs.append({
-                        "original": para,
-                        "translated": f"[待翻译] {para[:50]}..." if len(para) > 50 else f"[待翻译] {para}"
-                    })
-                processed_article['paragraphs'] = processed_paragraphs
+            with profiler.article(filename[:-len('.json')]):
+                ok = process_article(article, filename)
+            if ok:
+                success_count += 1
             else:
-                processed_article['paragraphs'] = []
-            
-            # 保存处理后的文章
-            try:
-                output_path = f'data/processed/{filename}'
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    json.dump(processed_article, f, ensure_ascii=False, indent=2)
-                
-                if content_result['success']:
-                    print(f"    ✓ 成功: {content_result['paragraph_count']} 段, {content_result['word_count']} 词")
-                    success_count += 1
-                else:
-                    print(f"    ✗ 失败: {content_result.get('error', '未知错误')}")
-                    error_count += 1
-                    
-            except Exception as e:
-                print(f"    ✗ 保存失败: {e}")
                 error_count += 1
             
             # 添加延时避免请求过于频繁
@@ -191,41 +65,120 @@ def process_all_articles():
     
     print(f"\n处理完成！成功: {success_count}, 失败: {error_count}")
     
+    profiler.write_summary()
+    
     # 生成统计报告
     generate_processing_report()
 
+def process_article(article, filename):
+    """抓取单篇文章并保存到 data/processed，返回是否成功"""
+    # 抓取文章内容
+    content_result = extract_article_content(article['url'], profiler)
+    processed_article = build_processed_article(article, content_result)
+    
+    # 保存处理后的文章
+    try:
+        output_path = f'data/processed/{filename}'
+        with profiler.stage('json_dump'), open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(processed_article, f, ensure_ascii=False, indent=2)
+        
+        if content_result['success']:
+            print(f"    ✓ 成功: {content_result['paragraph_count']} 段, {content_result['word_count']} 词")
+            return True
+        else:
+            print(f"    ✗ 失败: {content_result.get('error', '未知错误')}")
+            return False
+            
+    except Exception as e:
+        print(f"    ✗ 保存失败: {e}")
+        return False
+
+def refetch_articles(article_ids):
+    """按 id 重新抓取指定文章（覆盖已有的 processed 文件），返回成功篇数"""
+    with open('data/articles.json', 'r', encoding='utf-8') as f:
+        articles = json.load(f)
+    
+    target_articles = [a for a in articles if a['id'] in article_ids]
+    print(f"找到 {len(target_articles)} 篇需要重新抓取的文章")
+    
+    success_count = 0
+    for i, article in enumerate(target_articles):
+        print(f"\n处理文章 {article['id']}: {article['title']}")
+        filename = processed_filename(article)
+        with profiler.article(filename[:-len('.json')]):
+            ok = process_article(article, filename)
+        if ok:
+            success_count += 1
+        # 延时避免请求过于频繁
+        if i + 1 < len(target_articles):
+            time.sleep(1)
+    
+    print(f"\n重新抓取完成！成功: {success_count}/{len(target_articles)}")
+    
+    profiler.write_summary()
+    return success_count
+
 def generate_processing_report():
-    """生成处理报告"""
+    """生成全部已处理文章的统计报告"""
     try:
-        processed_files = [f for f in os.listdir('data/processed') if f.endswith('.json')]
+        processed_files = sorted(f for f in os.listdir('data/processed') if f.endswith('.json'))
         
         print(f"\n处理报告:")
         print(f"已处理文章数: {len(processed_files)}")
         
         # 统计成功率
         success_count = 0
+        failed_files = []
         total_paragraphs = 0
         total_words = 0
+        sizes = []
         
-        for filename in processed_files[:5]:  # 只检查前5个作为样本
+        for filename in processed_files:
             try:
                 with open(f'data/processed/{filename}', 'r', encoding='utf-8') as f:
                     data = json.load(f)
-                if data.get('content', {}).get('success', False):
+                content = data.get('content', {})
+                if content.get('success', False):
                     success_count += 1
-                    total_paragraphs += data['content'].get('paragraph_count', 0)
-                    total_words += data['content'].get('word_count', 0)
-            except:
-                pass
+                    total_paragraphs += content.get('paragraph_count', 0)
+                    total_words += content.get('word_count', 0)
+                    sizes.append((content.get('word_count', 0), content.get('paragraph_count', 0), filename))
+                else:
+                    failed_files.append(filename)
+            except Exception as e:
+                failed_files.append(f"{filename} ({e})")
+        
+        print(f"抓取成功: {success_count}, 失败: {len(failed_files)}")
+        print(f"总段落数: {total_paragraphs}, 总词数: {total_words}")
         
         if success_count > 0:
             print(f"平均段落数: {total_paragraphs // success_count}")
             print(f"平均词数: {total_words // success_count}")
         
+        if sizes:
+            print("最长的5篇文章:")
+            for words, paragraph_count, filename in sorted(sizes, reverse=True)[:5]:
+                print(f"  {filename}: {words} 词, {paragraph_count} 段")
+        
+        if failed_files:
+            print("抓取失败的文章:")
+            for filename in failed_files:
+                print(f"  {filename}")
+        
     except Exception as e:
         print(f"生成报告失败: {e}")
 
 if __name__ == "__main__":
     os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    if "--profile" in sys.argv:
+        profiler = StageProfiler(profiler.output_dir, enabled=True)
+        print(f"性能分析已开启，结果保存到 {profiler.output_dir}")
+    if "--report" in sys.argv:
+        generate_processing_report()
+        sys.exit(0)
+    if "--refetch" in sys.argv:
+        # 重新抓取指定 id 的文章：--refetch 1 2
+        refetch_articles({int(a) for a in sys.argv[sys.argv.index("--refetch") + 1:] if a.isdigit()})
+        sys.exit(0)
     print("开始抓取所有文章内容...")
     process_all_articles()
\ No newline at end of file
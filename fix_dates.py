@@ -1,41 +1,23 @@
 #!/usr/bin/env python3
-import json
 from datetime import datetime
+from article_index import ArticleIndex, sync_processed_dates
 
 # 读取数据
-with open('data/articles.json', 'r', encoding='utf-8') as f:
-    articles = json.load(f)
+index = ArticleIndex.load()
 
 # 修正不合理的日期（2025年的日期）
+# 被修正的文章移动到列表末尾，其他文章的 id 不变，只更新受影响的 order
 current_year = datetime.now().year
 print('修正不合理的日期...')
-
-for article in articles:
-    if article['date'] != 'Unknown':
-        try:
-            date = datetime.strptime(article['date'], '%Y-%m-%d')
-            if date.year > current_year:
-                print(f'修正: {article["title"]} 从 {article["date"]} 改为 Unknown')
-                article['date'] = 'Unknown'
-        except:
-            article['date'] = 'Unknown'
-
-# 重新排序
-valid_articles = [a for a in articles if a['date'] != 'Unknown']
-unknown_articles = [a for a in articles if a['date'] == 'Unknown']
-
-valid_articles.sort(key=lambda x: datetime.strptime(x['date'], '%Y-%m-%d'), reverse=True)
-final_articles = valid_articles + unknown_articles
-
-# 重新编号
-for i, article in enumerate(final_articles):
-    article['id'] = i + 1
+fixed = index.fix_dates(max_year=current_year)
 
 # 保存
-with open('data/articles.json', 'w', encoding='utf-8') as f:
-    json.dump(final_articles, f, ensure_ascii=False, indent=2)
+sync_processed_dates(fixed)
+index.save()
 
-print(f'完成！{len(valid_articles)} 篇有效日期，{len(unknown_articles)} 篇无日期')
+articles = index.articles
+unknown_count = sum(1 for a in articles if a['date'] == 'Unknown')
+print(f'完成！{len(articles) - unknown_count} 篇有效日期，{unknown_count} 篇无日期')
 print('\n最新5篇:')
-for i in range(min(5, len(final_articles))):
-    print(f'{i+1}. {final_articles[i]["title"]} - {final_articles[i]["date"]}')
\ No newline at end of file
+for i in range(min(5, len(articles))):
+    print(f'{i+1}. {articles[i]["title"]} - {articles[i]["date"]}')
@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+import json
+import math
+import os
+import re
+import sys
+from collections import Counter, deque
+
+# 术语表：从全部文章的原文中挖掘反复出现的术语，确定统一译法后保存在 data/glossary.json，
+# 翻译时只把段落中实际出现的术语（用 Aho-Corasick 自动机一次扫描匹配）附加到提示词中。
+GLOSSARY_FILE = "glossary.json"
+
+# 语料中已有多种译法的常见术语，译法取现有译文中用得最多的一种
+SEED_TERMS = {
+    "startup": "初创公司",
+    "founder": "创始人",
+    "investor": "投资者",
+    "hacker": "黑客",
+    "venture capital": "风险投资",
+    "venture capitalist": "风险投资人",
+    "angel investor": "天使投资者",
+    "Y Combinator": "Y Combinator",
+    "YC": "YC",
+    "Silicon Valley": "硅谷",
+    "Hacker News": "Hacker News",
+}
+
+# 挖掘条件：至少出现在多少篇文章中，最多保留多少个术语
+MIN_DOCS = 5
+MAX_TERMS = 200
+# 首字母大写的比例不低于此值才算专有名词（排除句首以外也常大写的普通词）
+MIN_CAPITALIZED_RATIO = 0.9
+# 双词搭配的点互信息阈值
+MIN_PMI = 8.0
+# 每个请求最多附加多少个术语
+MAX_PROMPT_TERMS = 20
+
+STOPWORDS = set("""
+a about above after again against all also am an and any are as at be because been before being
+below between both but by can could did do does doing down during each even ever every few for from
+further get gets got had has have having he her here hers him his how i if in into is it its itself
+just like made make makes many may me might more most much must my no nor not now of off often on
+once one only or other our ours out over own people per really same say says she should so some
+such than that the their theirs them then there these they thing things think this those though
+through to too under until up us very was way we were what when where which while who whom why
+will with would you your yours yet lot lots well still back good new first two three
+else ago later old big large small little number amount kind type reason couple several almost quite
+less never going year month week day time ten six twenty fifty hundred million reading draft
+till whether without across together alone aside versa myself yourself
+""".split())
+# 常见的大写普通词（月份、星期、称呼等），不作为专有名词
+COMMON_CAPITALIZED = set("""
+I I'm I've I'd I'll Mr Mrs Ms Dr Jan Feb Mar Apr Jun Jul Aug Sep Sept Oct Nov Dec January February
+March April May June July August September October November December Monday Tuesday Wednesday
+Thursday Friday Saturday Sunday Notes Note Thanks OK Translation
+""".split())
+# 国籍和语言名（多来自文末的译本链接），译法随上下文变化（"American" 可以是美国的 / 美国人），不作为术语
+COMMON_CAPITALIZED |= set("""
+American Americans European Europeans English Chinese Japanese Korean French German Italian Spanish
+Portuguese Russian Romanian Greek Hebrew Arabic Turkish Dutch Latin
+""".split())
+# 双词搭配中常见的泛用修饰词和动词，由它们组成的是普通搭配（如 "powerful force"、"raising money"）而不是术语
+GENERIC_WORDS = set("""
+powerful conscious extreme special certain whole nice varying defining paying raising talking create creating
+walk pick keep feel fall spread mentioned near net hardest biggest earliest smaller toward worth optimal
+encouraging underlying distinctive theoretical present previous future opposite external natural everyday
+rapidly ahead win winner reaction technical human intellectual limiting university science department
+consulting obliged guilty short term thousand billion dollar page degree part career size age scale effort
+force case quality attention money danger guy result firm custom feature question thought standard hand kid
+""".split())
+
+WORD_PATTERN = re.compile(r"[A-Za-z][A-Za-z'’-]*[A-Za-z]|[A-Za-z]")
+SENTENCE_END = re.compile(r'[.!?:]["\'”’)\]]*\s*$')
+# 抓取时丢失空格粘在一起的单词（如 "TranslationJapanese"），在小写字母后的大写处拆开
+GLUED_WORDS = re.compile(r'(?<=[a-z]{5})(?=[A-Z][a-z])')
+
+def load_texts(processed_dir):
+    """每篇文章的原文段落列表（读取 content.paragraphs）"""
+    texts = []
+    for filename in sorted(os.listdir(processed_dir)):
+        if not filename.endswith('.json'):
+            continue
+        with open(os.path.join(processed_dir, filename), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        paragraphs = data.get('content', {}).get('paragraphs', [])
+        if paragraphs:
+            texts.append(paragraphs)
+    return texts
+
+def tokenize(paragraph):
+    """(单词, 是否句首, 是否与前一个词只隔空白) 列表"""
+    tokens = []
+    last_end = 0
+    for match in WORD_PATTERN.finditer(paragraph):
+        gap = paragraph[last_end:match.start()]
+        sentence_start = last_end == 0 or bool(SENTENCE_END.search(gap))
+        word = re.sub(r"['’]s$", '', match.group())  # 去掉所有格
+        for i, part in enumerate(GLUED_WORDS.split(word)):
+            tokens.append((part, sentence_start and i == 0, i == 0 and last_end > 0 and not gap.strip()))
+        last_end = match.end()
+    return tokens
+
+def is_generic_pair(first, second):
+    """副词、动名词结尾和泛用词组成的搭配不算术语"""
+    if first in GENERIC_WORDS or second in GENERIC_WORDS:
+        return True
+    return first.endswith('ly') or second.endswith(('ly', 'ing', 'ed'))
+
+def singular(word):
+    """简单的复数还原，用于合并 startup / startups"""
+    if word.endswith('ies') and len(word) > 4:
+        return word[:-3] + 'y'
+    if word.endswith('s') and not word.endswith(('ss', 'us', 'is')) and len(word) > 3:
+        return word[:-1]
+    return word
+
+def capitalized_runs(tokens):
+    """句中连续的首字母大写词组（1-3 个词，中间只隔空白），作为专有名词候选"""
+    runs, run = [], []
+    for word, sentence_start, joined in tokens:
+        if word[0].isupper() and not sentence_start and word not in COMMON_CAPITALIZED:
+            # "Hackers & Painters" 这样中间有标点的不合并
+            if run and not joined:
+                runs.append(run)
+                run = []
+            run.append(word)
+            continue
+        if run:
+            runs.append(run)
+        run = []
+    if run:
+        runs.append(run)
+    return [' '.join(run) for run in runs if len(run) <= 3]
+
+def mine_terms(articles):
+    """从各篇文章的段落中挖掘候选术语，返回 {术语: 出现的文章数}"""
+    case_counts = Counter()       # 单词（小写）在句中出现时首字母大写 / 小写的次数
+    proper_docs = Counter()       # 连续大写词组 → 文章数
+    word_counts = Counter()
+    pair_counts = Counter()
+    pair_docs = Counter()
+    total = 0
+
+    for paragraphs in articles:
+        proper_seen = set()
+        pairs_seen = set()
+        for paragraph in paragraphs:
+            tokens = tokenize(paragraph)
+            for word, sentence_start, _ in tokens:
+                if not sentence_start:
+                    case_counts[(word.lower(), word[0].isupper())] += 1
+            proper_seen.update(capitalized_runs(tokens))
+
+            # 双词搭配只统计小写词（人名等大写词组已经作为专有名词处理）
+            words = [singular(word) if word.islower() and word.isalpha() else None for word, _, _ in tokens]
+            word_counts.update(word for word in words if word)
+            total += len(words)
+            for (first, second), (_, _, joined) in zip(zip(words, words[1:]), tokens[1:]):
+                if not first or not second or not joined or first in STOPWORDS or second in STOPWORDS:
+                    continue
+                if len(first) < 3 or len(second) < 3 or is_generic_pair(first, second):
+                    continue
+                pair_counts[(first, second)] += 1
+                pairs_seen.add((first, second))
+        proper_docs.update(proper_seen)
+        pair_docs.update(pairs_seen)
+
+    candidates = {}
+    names = [term for term, docs in proper_docs.items() if docs >= MIN_DOCS and ' ' in term]
+    name_words = {word for term in names for word in term.split()}
+    for term in names:
+        candidates[term] = proper_docs[term]
+    for term, docs in proper_docs.items():
+        # 单个大写词：跳过多词名称的一部分（如 "Combinator"），以及在句中也常小写的普通词
+        if docs < MIN_DOCS or ' ' in term or term in name_words:
+            continue
+        upper, lower = case_counts[(term.lower(), True)], case_counts[(term.lower(), False)]
+        if upper / max(upper + lower, 1) >= MIN_CAPITALIZED_RATIO:
+            candidates[term] = docs
+    for (first, second), docs in pair_docs.items():
+        if docs < MIN_DOCS:
+            continue
+        pmi = math.log2(pair_counts[(first, second)] * total / (word_counts[first] * word_counts[second]))
+        if pmi >= MIN_PMI:
+            candidates[f"{first} {second}"] = docs
+
+    ranked = sorted(candidates.items(), key=lambda item: (-item[1], item[0]))[:MAX_TERMS]
+    return dict(ranked)
+
+def variants(term):
+    """术语的匹配形式：小写术语同时匹配复数"""
+    forms = [term, term + 's']
+    if term.islower() and term.endswith('y'):
+        forms.append(term[:-1] + 'ies')
+    return forms
+
+class TermMatcher:
+    """Aho-Corasick 自动机：一次扫描文本找出所有术语
+
+    不区分大小写建树，匹配后再检查单词边界；含大写字母的术语（专有名词）要求大小写一致。
+    """
+
+    def __init__(self, patterns):
+        # patterns: {匹配形式: 术语}
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+        for pattern, term in patterns.items():
+            node = 0
+            for ch in pattern.lower():
+                if ch not in self.goto[node]:
+                    self.goto[node][ch] = len(self.goto)
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                node = self.goto[node][ch]
+            self.output[node].append((pattern, term))
+
+        # 按层次遍历设置失败指针，并合并后缀状态的输出
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self.goto[node].items():
+                queue.append(child)
+                state = self.fail[node]
+                while state and ch not in self.goto[state]:
+                    state = self.fail[state]
+                self.fail[child] = self.goto[state].get(ch, 0)
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+
+    def find(self, text):
+        """按出现顺序返回文本中的术语（可能重复）
+
+        最左最长匹配：被更长的术语覆盖或与前一个术语重叠的匹配都去掉，
+        "Hacker News" 中不会再匹配出 "hacker"。
+        """
+        matches = []
+        node = 0
+        for end, ch in enumerate(text, 1):
+            ch = ch.lower()
+            while node and ch not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(ch, 0)
+            for pattern, term in self.output[node]:
+                start = end - len(pattern)
+                if start > 0 and text[start - 1].isalnum():
+                    continue
+                if end < len(text) and text[end].isalnum():
+                    continue
+                if pattern.islower() or text[start:end] == pattern:
+                    matches.append((start, -len(pattern), term))
+
+        found = []
+        covered = 0
+        for start, length, term in sorted(matches, key=lambda m: m[:2]):
+            if start >= covered:
+                found.append(term)
+                covered = start - length
+        return found
+
+class Glossary:
+    """术语 → {"zh": 译法, "docs": 出现的文章数}；译法为空的术语不会加入提示词"""
+
+    def __init__(self, entries=None):
+        self.entries = entries or {}
+        patterns = {}
+        for term, entry in self.entries.items():
+            if entry.get('zh'):
+                for form in variants(term):
+                    patterns.setdefault(form, term)
+        # 精确的术语优先于其他术语的复数形式（如 "VCs" 本身也是术语）
+        patterns.update({term: term for term, entry in self.entries.items() if entry.get('zh')})
+        self.matcher = TermMatcher(patterns)
+
+    @classmethod
+    def load(cls, path):
+        """读取术语表，文件不存在时返回空术语表"""
+        if not path or not os.path.exists(path):
+            return cls()
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def save(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, ensure_ascii=False, indent=2)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def lookup(self, texts):
+        """文本中出现的术语及译法 [(术语, 译法)]，按首次出现的顺序，最多 MAX_PROMPT_TERMS 个"""
+        terms = []
+        for text in texts:
+            for term in self.matcher.find(text):
+                if term not in terms:
+                    terms.append(term)
+        return [(term, self.entries[term]['zh']) for term in terms[:MAX_PROMPT_TERMS]]
+
+def format_terms(terms):
+    """提示词中的术语表段落（没有相关术语时为空字符串）"""
+    if not terms:
+        return ""
+    lines = [f"- {term}：{zh}" + ("（保留原文）" if zh == term else "") for term, zh in terms]
+    return "术语表（请统一使用以下译法）：\n" + "\n".join(lines) + "\n\n"
+
+def build_glossary(processed_dir, existing):
+    """挖掘术语并与已有术语表合并：已有的译法（包括手工修改的）保留，不再出现且没有译法的术语删除"""
+    articles = load_texts(processed_dir)
+    mined = mine_terms(articles)
+    # 预置术语的文章数直接用自动机统计
+    matcher = TermMatcher({form: term for term in SEED_TERMS for form in variants(term)})
+    seed_docs = Counter()
+    for paragraphs in articles:
+        seed_docs.update(set(matcher.find('\n'.join(paragraphs))))
+    entries = {}
+    for term, zh in SEED_TERMS.items():
+        entries[term] = {"zh": zh, "docs": seed_docs[term]}
+    for term, docs in mined.items():
+        entries.setdefault(term, {"zh": "", "docs": docs})
+    for term, entry in existing.entries.items():
+        if entry.get('zh'):
+            docs = entries[term]['docs'] if term in entries else entry.get('docs', 0)
+            entries[term] = {"zh": entry['zh'], "docs": docs}
+    return Glossary(entries)
+
+# 每个请求合并翻译的术语数
+TERMS_PER_REQUEST = 50
+
+def translate_terms(glossary, translator):
+    """合并请求翻译还没有译法的术语，返回失败的个数"""
+    missing = [term for term, entry in glossary.entries.items() if not entry.get('zh')]
+    print(f"共 {len(glossary)} 个术语，{len(missing)} 个需要调用API翻译")
+    failed = 0
+    for start in range(0, len(missing), TERMS_PER_REQUEST):
+        batch = missing[start:start + TERMS_PER_REQUEST]
+        print(f"  翻译术语 {start+1}-{start+len(batch)}/{len(missing)}")
+        for term, result in zip(batch, translator.translate_group(batch)):
+            if result['success']:
+                glossary.entries[term]['zh'] = result['translated']
+            else:
+                failed += 1
+                print(f"    ✗ {term}: {result.get('error', '未知错误')}")
+    return failed
+
+if __name__ == "__main__":
+    DATA_DIR = "data"
+    glossary_file = os.path.join(DATA_DIR, GLOSSARY_FILE)
+    glossary = Glossary.load(glossary_file)
+    command = sys.argv[1] if len(sys.argv) > 1 else "list"
+
+    if command == "build":
+        glossary = build_glossary(os.path.join(DATA_DIR, 'processed'), glossary)
+        glossary.save(glossary_file)
+        missing = sum(1 for entry in glossary.entries.values() if not entry['zh'])
+        print(f"完成！术语表共 {len(glossary)} 个术语，{missing} 个还没有译法: {glossary_file}")
+        if missing:
+            print("运行 python glossary.py translate 翻译，或直接编辑该文件")
+    elif command == "translate":
+        from dotenv import load_dotenv
+        load_dotenv()
+        API_KEY = os.getenv("TRANSLATE_API_KEY")
+        if not API_KEY and os.getenv("TRANSLATE_BACKEND") != "mock":
+            print("错误: 未找到 API 密钥。请在 .env 文件中设置 TRANSLATE_API_KEY。")
+            sys.exit(1)
+        from translate_simple import SimpleTranslator
+        failed = translate_terms(glossary, SimpleTranslator(API_KEY, glossary=glossary))
+        glossary.save(glossary_file)
+        sys.exit(1 if failed else 0)
+    elif command == "match":
+        # 查看一段文本会附加哪些术语
+        for term, zh in glossary.lookup([' '.join(sys.argv[2:])]):
+            print(f"  {term} → {zh}")
+    else:
+        translated = sorted((t for t, e in glossary.entries.items() if e.get('zh')),
+                            key=lambda t: -glossary.entries[t].get('docs', 0))
+        print(f"术语表 {glossary_file}: {len(glossary)} 个术语，{len(translated)} 个有译法")
+        for term in translated[:30]:
+            print(f"  {term:<24} {glossary.entries[term]['zh']}  ({glossary.entries[term].get('docs', 0)} 篇)")
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from translation_backends import MockBackend
+from token_chunker import count_tokens
+
+class MockChatHandler(BaseHTTPRequestHandler):
+    """模拟 OpenAI 兼容的 /v1/chat/completions 接口"""
+    backend = None
+    token_delay = 0.0  # 流式模式下每个词之间的间隔（秒）
+    request_log = None  # 记录每次请求的提示词（压测统计用）
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        try:
+            payload = json.loads(self.rfile.read(length) or b'{}')
+            messages = payload['messages']
+        except Exception as e:
+            self.send_json(400, {"error": {"message": f"invalid request: {e}"}})
+            return
+
+        if self.request_log is not None:
+            self.request_log.append(messages[-1]['content'])
+
+        delay, status_code = self.backend.next_outcome()
+        time.sleep(delay)
+
+        if status_code == 429:
+            self.send_json(429, {"error": {"message": "rate limit exceeded (mock)"}})
+            return
+        if status_code != 200:
+            self.send_json(status_code, {"error": {"message": "internal error (mock)"}})
+            return
+
+        content = self.backend.fake_translation(messages)
+        if payload.get('stream'):
+            self.send_stream(content)
+            return
+
+        prompt_tokens = sum(count_tokens(m['content']) for m in messages)
+        completion_tokens = count_tokens(content)
+        self.send_json(200, {
+            "id": "mock-completion",
+            "object": "chat.completion",
+            "model": payload.get('model', 'mock'),
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop"
+                }
+            ],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens
+            }
+        })
+
+    def send_stream(self, content):
+        """以 SSE 格式逐词返回译文"""
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream; charset=utf-8')
+        self.end_headers()
+        words = content.split(' ')
+        for i, word in enumerate(words):
+            chunk = {
+                "object": "chat.completion.chunk",
+                "choices": [
+                    {
+                        "index": 0,
+                        "delta": {"content": word if i == len(words) - 1 else word + ' '},
+                        "finish_reason": None
+                    }
+                ]
+            }
+            self.wfile.write(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode('utf-8'))
+            self.wfile.flush()
+            if self.token_delay:
+                time.sleep(self.token_delay)
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+        self.close_connection = True
+
+    def send_json(self, status_code, body):
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status_code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        # 压测时不输出每个请求的日志
+        pass
+
+def create_server(port=8765, latency=0.05, jitter=0.0, error_rate=0.0, rate_limit_rate=0.0, seed=0,
+                  token_delay=0.0, distribution="uniform"):
+    """创建模拟服务器（调用方负责 serve_forever / shutdown）"""
+    handler = type('Handler', (MockChatHandler,), {
+        'token_delay': token_delay,
+        'request_log': [],
+        'backend': MockBackend(
+            latency=latency,
+            jitter=jitter,
+            error_rate=error_rate,
+            rate_limit_rate=rate_limit_rate,
+            seed=seed,
+            distribution=distribution
+        )
+    })
+    return ThreadingHTTPServer(('127.0.0.1', port), handler)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="本地模拟翻译服务（OpenAI 兼容接口）")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.05, help="每次请求的基础延迟（秒）")
+    parser.add_argument('--jitter', type=float, default=0.0, help="延迟的随机抖动（含义取决于 --distribution）")
+    parser.add_argument('--distribution', choices=['uniform', 'lognormal', 'exponential'], default='uniform',
+                        help="延迟分布")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="返回 HTTP 500 的概率")
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help="返回 HTTP 429 的概率")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--token-delay', type=float, default=0.0, help="流式响应中每个词的间隔（秒）")
+    args = parser.parse_args()
+
+    server = create_server(
+        port=args.port,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        seed=args.seed,
+        token_delay=args.token_delay,
+        distribution=args.distribution
+    )
+    print(f"模拟翻译服务已启动: http://127.0.0.1:{args.port}/v1/chat/completions")
+    print("使用方法: TRANSLATE_API_BASE=http://127.0.0.1:%d/v1/chat/completions python translate_simple.py batch" % args.port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n已停止")
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+import json
+import os
+import sys
+from token_chunker import build_chunks
+from translation_memory import TranslationMemory, MEMORY_FILE, normalize_text, text_key
+from translate_simple import SimpleTranslator, needs_paragraph_translation
+from sentence_align import attach_alignment
+
+def scan_corpus(processed_dir):
+    """读取全部文章，按规范化原文的哈希分组
+
+    返回 (文章数据 {路径: 数据}, 分组 {key: [(路径, 段落序号), ...]})
+    """
+    articles = {}
+    groups = {}
+    for filename in sorted(os.listdir(processed_dir)):
+        if not filename.endswith('.json'):
+            continue
+        path = os.path.join(processed_dir, filename)
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        paragraphs = data.get('paragraphs', [])
+        if not paragraphs or not isinstance(paragraphs[0], dict):
+            continue  # 还没有段落结构的文章交给 translate_article 处理
+        articles[path] = data
+        for i, para in enumerate(paragraphs):
+            groups.setdefault(text_key(para['original']), []).append((path, i))
+    return articles, groups
+
+def dedup_corpus(data_dir, translator=None, dry_run=False):
+    """全语料段落去重：相同段落只翻译一次，译文填到所有出现的位置"""
+    processed_dir = os.path.join(data_dir, 'processed')
+    memory = TranslationMemory(os.path.join(data_dir, MEMORY_FILE))
+    articles, groups = scan_corpus(processed_dir)
+
+    def para_at(location):
+        path, i = location
+        return articles[path]['paragraphs'][i]
+
+    pending_total = 0
+    resolved = {}       # key → 译文
+    from_corpus = 0     # 语料中其他位置已有译文
+    from_memory = 0     # 翻译记忆中已有译文
+    to_translate = []   # [(key, 原文)]，每个唯一段落一次
+
+    for key, locations in groups.items():
+        pending = [loc for loc in locations if needs_paragraph_translation(para_at(loc))]
+        if not pending:
+            continue
+        pending_total += len(pending)
+        done = [loc for loc in locations if loc not in pending and len(para_at(loc)['original'].strip().split()) >= 3]
+        if done:
+            resolved[key] = para_at(done[0])['translated']
+            from_corpus += 1
+        elif memory.lookup(para_at(pending[0])['original']):
+            resolved[key] = memory.lookup(para_at(pending[0])['original'])
+            from_memory += 1
+        else:
+            to_translate.append((key, normalize_text(para_at(pending[0])['original'])))
+
+    # 不去重时的请求数：每篇文章各自按 token 预算分块
+    naive_requests = 0
+    for path, data in articles.items():
+        items = [(i, p['original']) for i, p in enumerate(data['paragraphs']) if needs_paragraph_translation(p)]
+        naive_requests += len(build_chunks(items))
+    dedup_chunks = build_chunks(to_translate)
+
+    print("段落去重统计:")
+    print(f"  待翻译段落: {pending_total}（唯一段落 {from_corpus + from_memory + len(to_translate)}）")
+    print(f"  复用语料中已有译文: {from_corpus}，复用翻译记忆: {from_memory}")
+    print(f"  需要调用API翻译: {len(to_translate)} 段，{len(dedup_chunks)} 个请求（不去重需要 {naive_requests} 个请求）")
+
+    if dry_run:
+        print(f"  预计节省请求: {naive_requests - len(dedup_chunks)}")
+        return True
+
+    requests_before = translator.request_count if translator else 0
+    failed = 0
+    for n, chunk in enumerate(dedup_chunks):
+        print(f"  翻译唯一段落（请求 {n+1}/{len(dedup_chunks)}）")
+        results = translator.translate_group([text for _, text in chunk])
+        for (key, text), result in zip(chunk, results):
+            if result['success']:
+                resolved[key] = result['translated']
+                memory.add(text, result['translated'])
+            else:
+                failed += 1
+                print(f"    ✗ 翻译失败: {result.get('error', '未知错误')}")
+
+    # 把译文填到所有待翻译的位置，每篇文章只写一次
+    changed_files = set()
+    filled = 0
+    for key, translated in resolved.items():
+        for location in groups[key]:
+            para = para_at(location)
+            if needs_paragraph_translation(para):
+                para['translated'] = translated
+                attach_alignment(para)
+                changed_files.add(location[0])
+                filled += 1
+
+    for path in sorted(changed_files):
+        data = articles[path]
+        success_count = sum(
+            1 for p in data['paragraphs']
+            if len(p['original'].strip().split()) >= 3 and not needs_paragraph_translation(p)
+        )
+        stats = data.setdefault('translation_stats', {})
+        stats['total_paragraphs'] = len(data['paragraphs'])
+        stats['success_count'] = success_count
+        stats['success_rate'] = f"{success_count/len(data['paragraphs'])*100:.1f}%"
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+
+    api_requests = (translator.request_count if translator else 0) - requests_before
+    print(f"完成！填入 {filled} 个段落，更新 {len(changed_files)} 篇文章，失败 {failed} 段")
+    print(f"  实际请求: {api_requests}，不去重预计请求: {naive_requests}，节省: {naive_requests - api_requests}")
+    return failed == 0
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    load_dotenv()
+    DATA_DIR = "data"
+
+    if "--dry-run" in sys.argv:
+        dedup_corpus(DATA_DIR, dry_run=True)
+        sys.exit(0)
+
+    API_KEY = os.getenv("TRANSLATE_API_KEY")
+    if not API_KEY and os.getenv("TRANSLATE_BACKEND") != "mock":
+        print("错误: 未找到 API 密钥。请在 .env 文件中设置 TRANSLATE_API_KEY。")
+        sys.exit(1)
+
+    ok = dedup_corpus(DATA_DIR, SimpleTranslator(API_KEY))
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+import json
+import os
+import shutil
+import sys
+
+# 每篇文章一个 JSONL 段落库：第一行是文章元数据（段落位置用 null 占位），之后每行一个段落
+STORE_DIR = "paragraphs"
+
+def store_path(data_dir, slug):
+    return os.path.join(data_dir, STORE_DIR, f"{slug}.jsonl")
+
+def read_header(path):
+    """读取段落库的文章元数据（只读第一行）"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.loads(f.readline())
+
+def iter_paragraphs(path):
+    """逐个读取段落，不把整篇文章载入内存"""
+    with open(path, 'r', encoding='utf-8') as f:
+        f.readline()  # 跳过元数据
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+class ParagraphWriter:
+    """逐段写入段落库，写完后原子替换旧文件
+
+    段落先写入临时文件，关闭时再写元数据行，因此 header 可以在写完段落后更新（如翻译统计）。
+    """
+
+    def __init__(self, path, header):
+        self.path = path
+        self.header = header
+        self.tmp_path = path + '.tmp'
+        self.body_path = path + '.body.tmp'
+        self.file = None
+        self.count = 0
+
+    def __enter__(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self.file = open(self.body_path, 'w', encoding='utf-8')
+        return self
+
+    def write(self, paragraph):
+        self.file.write(json.dumps(paragraph, ensure_ascii=False) + '\n')
+        self.count += 1
+
+    def __exit__(self, exc_type, exc, tb):
+        self.file.close()
+        try:
+            if exc_type is None:
+                with open(self.tmp_path, 'w', encoding='utf-8') as out, \
+                        open(self.body_path, 'r', encoding='utf-8') as body:
+                    out.write(json.dumps(self.header, ensure_ascii=False) + '\n')
+                    shutil.copyfileobj(body, out)
+                os.replace(self.tmp_path, self.path)
+        finally:
+            os.remove(self.body_path)
+        return False
+
+def split_article(data):
+    """把 processed 文章拆成 (元数据, 段落列表)，元数据中段落位置用 null 占位"""
+    if data.get('paragraphs') and isinstance(data['paragraphs'][0], dict):
+        paragraphs = data['paragraphs']
+    else:
+        paragraphs = [
+            {
+                "original": para,
+                "translated": f"[待翻译] {para[:50]}..." if len(para) > 50 else f"[待翻译] {para}"
+            }
+            for para in data.get('content', {}).get('paragraphs', [])
+        ]
+
+    # 段落位置用 null 占位，导出时按原顺序写回
+    header = dict(data)
+    header['paragraphs'] = None
+    if isinstance(header.get('content'), dict) and 'paragraphs' in header['content']:
+        header['content'] = dict(header['content'])
+        header['content']['paragraphs'] = None
+    return header, paragraphs
+
+def convert_json_to_store(json_path, path):
+    """把 data/processed 中的文章转换为段落库（一次性迁移）"""
+    with open(json_path, 'r', encoding='utf-8') as f:
+        header, paragraphs = split_article(json.load(f))
+
+    with ParagraphWriter(path, header) as writer:
+        for para in paragraphs:
+            writer.write(para)
+    return writer.count
+
+def _dump_value(value, level):
+    """按 json.dump(indent=2) 的格式输出嵌套在 level 层的值"""
+    return json.dumps(value, ensure_ascii=False, indent=2).replace('\n', '\n' + '  ' * level)
+
+def _write_stream_list(f, items, level):
+    """流式写出一个列表，格式与 json.dump(indent=2) 一致"""
+    first = True
+    for item in items:
+        f.write('[\n' if first else ',\n')
+        f.write('  ' * (level + 1) + _dump_value(item, level + 1))
+        first = False
+    f.write('[]' if first else '\n' + '  ' * level + ']')
+
+def _write_object(f, obj, level, stream_lists):
+    """写出对象，值为 None 且在 stream_lists 中的键改为流式写出列表"""
+    if not obj:
+        f.write('{}')
+        return
+    f.write('{\n')
+    for n, (key, value) in enumerate(obj.items()):
+        f.write('  ' * (level + 1) + json.dumps(key, ensure_ascii=False) + ': ')
+        if value is None and key in stream_lists:
+            _write_stream_list(f, stream_lists[key](), level + 1)
+        elif isinstance(value, dict) and key == 'content':
+            _write_object(f, value, level + 1, {'paragraphs': stream_lists['content.paragraphs']})
+        else:
+            f.write(_dump_value(value, level + 1))
+        f.write(',\n' if n < len(obj) - 1 else '\n')
+    f.write('  ' * level + '}')
+
+def write_article_json(json_path, header, iter_func):
+    """按元数据和段落迭代函数流式写出 processed JSON（iter_func 每次调用返回一个新的段落迭代器）"""
+    stream_lists = {
+        'paragraphs': iter_func,
+        'content.paragraphs': lambda: (p['original'] for p in iter_func())
+    }
+    tmp_path = json_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        _write_object(f, header, 0, stream_lists)
+    os.replace(tmp_path, json_path)
+
+def export_store_to_json(path, json_path):
+    """从段落库生成页面读取的 data/processed JSON（逐段写出，不构建整篇文档）"""
+    write_article_json(json_path, read_header(path), lambda: iter_paragraphs(path))
+
+def list_slugs(directory, suffix):
+    return sorted(f[:-len(suffix)] for f in os.listdir(directory) if f.endswith(suffix))
+
+if __name__ == "__main__":
+    DATA_DIR = "data"
+    processed_dir = os.path.join(DATA_DIR, 'processed')
+
+    if len(sys.argv) < 2 or sys.argv[1] not in ('convert', 'export'):
+        print("用法:")
+        print("  python paragraph_store.py convert [slug ...]  # data/processed/*.json → data/paragraphs/*.jsonl")
+        print("  python paragraph_store.py export [slug ...]   # data/paragraphs/*.jsonl → data/processed/*.json")
+        print("不指定 slug 时处理全部文章")
+        sys.exit(1)
+
+    command = sys.argv[1]
+    slugs = sys.argv[2:]
+
+    if command == 'convert':
+        slugs = slugs or list_slugs(processed_dir, '.json')
+        for slug in slugs:
+            count = convert_json_to_store(os.path.join(processed_dir, f"{slug}.json"), store_path(DATA_DIR, slug))
+            print(f"  ✓ {slug}: {count} 段")
+        print(f"已转换 {len(slugs)} 篇文章到 {os.path.join(DATA_DIR, STORE_DIR)}")
+
+    else:
+        slugs = slugs or list_slugs(os.path.join(DATA_DIR, STORE_DIR), '.jsonl')
+        for slug in slugs:
+            export_store_to_json(store_path(DATA_DIR, slug), os.path.join(processed_dir, f"{slug}.json"))
+            print(f"  ✓ {slug}")
+        print(f"已导出 {len(slugs)} 篇文章到 {processed_dir}")
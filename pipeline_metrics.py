@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+import json
+import os
+import time
+from contextlib import contextmanager
+
+# 直方图的分桶上限（秒）
+DEFAULT_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 20, 60)
+
+class PipelineMetrics:
+    """翻译流程的指标收集
+
+    - 计数器：按标签计数（如按 HTTP 状态统计请求数）
+    - 直方图：API 延迟、频率控制等待、JSON 读写耗时等
+    - 事件日志：每个请求/文章一行 JSON，写入 events_file
+    多进程运行时每个进程各自收集，由主进程通过 to_dict() / merge() 汇总。
+    """
+
+    def __init__(self, events_file=None):
+        self.counters = {}
+        self.histograms = {}
+        self.start_time = time.time()
+        self.events_file = events_file
+        if events_file:
+            os.makedirs(os.path.dirname(events_file) or '.', exist_ok=True)
+
+    def inc(self, name, value=1, **labels):
+        """计数器加 value"""
+        key = json.dumps(labels, sort_keys=True)
+        series = self.counters.setdefault(name, {})
+        series[key] = series.get(key, 0) + value
+
+    def observe(self, name, seconds):
+        """记录一次耗时"""
+        hist = self.histograms.setdefault(name, {
+            "buckets": [0] * len(DEFAULT_BUCKETS),
+            "sum": 0.0,
+            "count": 0
+        })
+        for i, bound in enumerate(DEFAULT_BUCKETS):
+            if seconds <= bound:
+                hist["buckets"][i] += 1
+                break
+        hist["sum"] += seconds
+        hist["count"] += 1
+
+    @contextmanager
+    def timer(self, name):
+        """统计代码块耗时"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def event(self, kind, **fields):
+        """追加一条事件日志"""
+        if not self.events_file:
+            return
+        record = {"ts": round(time.time(), 3), "pid": os.getpid(), "event": kind}
+        record.update(fields)
+        with open(self.events_file, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    def total(self, name):
+        """计数器所有标签的合计"""
+        return sum(self.counters.get(name, {}).values())
+
+    def paragraphs_per_minute(self):
+        elapsed = max(time.time() - self.start_time, 1e-6)
+        return self.total('paragraphs_translated') / elapsed * 60
+
+    def to_dict(self):
+        return {
+            "counters": self.counters,
+            "histograms": self.histograms
+        }
+
+    def merge(self, snapshot):
+        """合并其他进程的指标快照"""
+        for name, series in snapshot["counters"].items():
+            target = self.counters.setdefault(name, {})
+            for key, value in series.items():
+                target[key] = target.get(key, 0) + value
+        for name, hist in snapshot["histograms"].items():
+            target = self.histograms.setdefault(name, {
+                "buckets": [0] * len(DEFAULT_BUCKETS),
+                "sum": 0.0,
+                "count": 0
+            })
+            target["buckets"] = [a + b for a, b in zip(target["buckets"], hist["buckets"])]
+            target["sum"] += hist["sum"]
+            target["count"] += hist["count"]
+
+    def write_prometheus(self, path):
+        """导出 Prometheus 文本格式"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        lines = []
+
+        for name, series in sorted(self.counters.items()):
+            lines.append(f"# TYPE translate_{name}_total counter")
+            for key, value in sorted(series.items()):
+                labels = json.loads(key)
+                label_text = ','.join(f'{k}="{v}"' for k, v in sorted(labels.items()))
+                label_text = f"{{{label_text}}}" if label_text else ""
+                lines.append(f"translate_{name}_total{label_text} {value}")
+
+        for name, hist in sorted(self.histograms.items()):
+            lines.append(f"# TYPE translate_{name}_seconds histogram")
+            cumulative = 0
+            for bound, count in zip(DEFAULT_BUCKETS, hist["buckets"]):
+                cumulative += count
+                lines.append(f'translate_{name}_seconds_bucket{{le="{bound}"}} {cumulative}')
+            lines.append(f'translate_{name}_seconds_bucket{{le="+Inf"}} {hist["count"]}')
+            lines.append(f"translate_{name}_seconds_sum {hist['sum']:.6f}")
+            lines.append(f"translate_{name}_seconds_count {hist['count']}")
+
+        lines.append("# TYPE translate_paragraphs_per_minute gauge")
+        lines.append(f"translate_paragraphs_per_minute {self.paragraphs_per_minute():.2f}")
+
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+
+    def print_summary(self):
+        """在终端显示指标汇总"""
+        print("\n指标汇总:")
+        requests_by_status = self.counters.get('api_requests', {})
+        for key, value in sorted(requests_by_status.items()):
+            status = json.loads(key).get('status', '?')
+            print(f"  API请求 [{status}]: {value}")
+        print(f"  重试次数: {self.total('retries')}")
+        for name in ('api_latency', 'rate_limit_wait', 'json_read', 'json_write'):
+            hist = self.histograms.get(name)
+            if hist and hist["count"]:
+                print(f"  {name}: 平均 {hist['sum']/hist['count']:.3f}s, 合计 {hist['sum']:.1f}s ({hist['count']} 次)")
+        for key, value in sorted(self.counters.get('failures', {}).items()):
+            print(f"  失败原因 {json.loads(key).get('cause', '?')}: {value}")
+        print(f"  段落/分钟: {self.paragraphs_per_minute():.1f}")
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+import json
+import os
+import sys
+import threading
+import time
+
+class ProgressDashboard(threading.Thread):
+    """长时间批量翻译的实时进度面板
+
+    后台线程每隔 interval 秒读取 PipelineMetrics 写出的事件日志（所有工作进程共用），
+    汇总吞吐量、剩余段落、错误率和预计剩余时间：
+    - 写入 JSON 状态文件（无终端运行时查看）
+    - live=True 时在终端（stderr）原地刷新显示；stdout 也是终端时，运行期间的逐行日志
+      改写到状态文件旁的 run.log，避免和面板交错
+    翻译循环本身只追加事件日志，不等待面板刷新。
+    """
+
+    def __init__(self, events_file, status_file, total_paragraphs, total_articles,
+                 interval=1.0, live=False):
+        super().__init__(daemon=True)
+        self.events_file = events_file
+        self.status_file = status_file
+        self.total_paragraphs = total_paragraphs
+        self.total_articles = total_articles
+        self.interval = interval
+        self.live = live
+
+        os.makedirs(os.path.dirname(status_file) or '.', exist_ok=True)
+        self.start_time = time.time()
+        # 只统计本次运行产生的事件
+        self.offset = os.path.getsize(events_file) if os.path.exists(events_file) else 0
+        self.stop_event = threading.Event()
+        self.rendered_lines = 0
+        # stderr 不是终端（如重定向到文件）时无法原地刷新，只追加输出
+        self.redraw = live and sys.stderr.isatty()
+        self.log_file = os.path.join(os.path.dirname(status_file), 'run.log')
+        self.saved_stdout = None
+
+        self.paragraphs_done = 0
+        self.paragraphs_failed = 0
+        self.articles_done = 0
+        self.requests = 0
+        self.request_errors = 0
+        self.workers = {}
+
+    def start(self):
+        if self.redraw and sys.stdout.isatty():
+            # 替换文件描述符 1，之后启动的工作进程的输出也写入日志文件
+            sys.stdout.flush()
+            self.saved_stdout = os.dup(1)
+            log_fd = os.open(self.log_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            os.dup2(log_fd, 1)
+            os.close(log_fd)
+        super().start()
+
+    def run(self):
+        while not self.stop_event.wait(self.interval):
+            self.refresh()
+
+    def stop(self):
+        """停止刷新并输出最终状态"""
+        self.stop_event.set()
+        if self.is_alive():
+            self.join()
+        self.refresh()
+        if self.saved_stdout is not None:
+            sys.stdout.flush()
+            os.dup2(self.saved_stdout, 1)
+            os.close(self.saved_stdout)
+            self.saved_stdout = None
+            print(f"运行日志: {self.log_file}")
+
+    def refresh(self):
+        self.poll()
+        status = self.status()
+        self.write_status(status)
+        if self.live:
+            self.render(status)
+
+    def poll(self):
+        """读取新增的事件"""
+        if not os.path.exists(self.events_file):
+            return
+        with open(self.events_file, 'r', encoding='utf-8') as f:
+            f.seek(self.offset)
+            while True:
+                line = f.readline()
+                # 没有换行说明这一行还没写完，下次再读
+                if not line.endswith('\n'):
+                    break
+                self.offset = f.tell()
+                try:
+                    self.handle(json.loads(line))
+                except ValueError:
+                    continue
+
+    def handle(self, event):
+        kind = event.get('event')
+        worker = self.workers.setdefault(event.get('pid'), {
+            "article": None,
+            "paragraphs_done": 0,
+            "last_update": None
+        })
+        worker["last_update"] = event.get('ts')
+
+        if kind == 'request':
+            self.requests += 1
+            if event.get('status') != 200:
+                self.request_errors += 1
+        elif kind == 'article_start':
+            worker["article"] = event.get('file')
+        elif kind == 'chunk':
+            self.paragraphs_done += event.get('paragraphs', 0)
+            self.paragraphs_failed += event.get('failed', 0)
+            worker["article"] = event.get('file')
+            worker["paragraphs_done"] += event.get('paragraphs', 0)
+        elif kind == 'article':
+            self.articles_done += 1
+            worker["article"] = None
+
+    def status(self):
+        elapsed = time.time() - self.start_time
+        rate = self.paragraphs_done / elapsed if elapsed > 0 else 0
+        remaining = max(self.total_paragraphs - self.paragraphs_done, 0)
+        return {
+            "updated_at": time.strftime('%Y-%m-%dT%H:%M:%S'),
+            "elapsed_seconds": round(elapsed, 1),
+            "articles_done": self.articles_done,
+            "articles_total": self.total_articles,
+            "paragraphs_done": self.paragraphs_done,
+            "paragraphs_failed": self.paragraphs_failed,
+            "paragraphs_total": self.total_paragraphs,
+            "paragraphs_remaining": remaining,
+            "paragraphs_per_second": round(rate, 3),
+            "requests": self.requests,
+            "error_rate": round(self.request_errors / self.requests, 4) if self.requests else 0,
+            "eta_seconds": round(remaining / rate) if rate > 0 else None,
+            "workers": {str(pid): info for pid, info in self.workers.items()}
+        }
+
+    def write_status(self, status):
+        """原子写入状态文件"""
+        tmp_file = self.status_file + '.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(status, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_file, self.status_file)
+
+    def render(self, status):
+        """在终端原地刷新面板"""
+        eta = status["eta_seconds"]
+        eta_text = time.strftime('%H:%M:%S', time.gmtime(eta)) if eta is not None else "--:--:--"
+        lines = [
+            "─" * 60,
+            f"文章 {status['articles_done']}/{status['articles_total']}  "
+            f"段落 {status['paragraphs_done']}/{status['paragraphs_total']}  "
+            f"剩余 {status['paragraphs_remaining']}",
+            f"速度 {status['paragraphs_per_second']:.2f} 段/秒  "
+            f"错误率 {status['error_rate']*100:.1f}%  "
+            f"预计剩余 {eta_text}",
+        ]
+        for pid, info in sorted(status["workers"].items()):
+            lines.append(f"  [{pid}] {info['article'] or '空闲'}  已完成 {info['paragraphs_done']} 段")
+        lines.append("─" * 60)
+
+        out = sys.stderr
+        if self.rendered_lines and self.redraw:
+            # 光标上移并清除上一次的面板
+            out.write(f"\x1b[{self.rendered_lines}F\x1b[J")
+        out.write('\n'.join(lines) + '\n')
+        out.flush()
+        self.rendered_lines = len(lines)
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+import json
+import math
+import os
+import re
+import statistics
+import sys
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    # 未安装 numpy 时用纯 Python 计算（结果相同，只是慢一些）
+    np = None
+
+# 译文质量筛查：不调用API，按段落计算特征并标记异常，标记后的段落可交给翻译脚本重新翻译
+QUALITY_DIR = "quality"
+
+# 字符分类（numpy 和纯 Python 两种实现使用相同的范围）
+CJK_RANGES = ((0x3400, 0x9fff), (0xf900, 0xfaff))
+SPACE_CHARS = ' \t\n\r\x0b\x0c\xa0\u3000'
+CJK_PATTERN = re.compile('[' + ''.join(f'{chr(lo)}-{chr(hi)}' for lo, hi in CJK_RANGES) + ']')
+LATIN_PATTERN = re.compile(r'[A-Za-z]')
+SPACE_PATTERN = re.compile(f'[{SPACE_CHARS}]')
+NUMBER_PATTERN = re.compile(r'\d[\d,.]*\d|\d{2,}')
+DIGIT_PATTERN = re.compile(r'\d')
+URL_PATTERN = re.compile(r'https?://\S+|www\.\S+')
+# 模型附带的说明文字
+COMMENTARY_PATTERN = re.compile(r'^(以下是|下面是|翻译[：:]|译文[：:])|(注[：:]|说明[：:]|（注|\(注)')
+
+# 硬性阈值
+MIN_CJK_RATIO = 0.3          # 中文字符占比过低：基本没有翻译
+MAX_LATIN_RATIO = 0.5        # 英文字母占比过高：残留大段英文
+MIN_LENGTH_RATIO = 0.12      # 译文相对原文过短：被截断
+# 长度比（取对数）偏离中位数的稳健 z 分数阈值
+OUTLIER_Z = 3.5
+
+def is_checkable(para):
+    """跳过未翻译、翻译失败和保留原文的短段落"""
+    translated = para.get('translated', '')
+    if not translated or '[待翻译]' in translated or '[翻译失败]' in translated:
+        return False
+    return len(para['original'].strip().split()) >= 3
+
+def char_class_counts(texts):
+    """每段文本的 (非空白字符数, 中文字符数, 英文字母数) 三个列表
+
+    有 numpy 时把所有文本拼成一个码点数组，用掩码和前缀和一次算出所有段落的计数。
+    """
+    if np is not None:
+        codes = np.frombuffer(''.join(texts).encode('utf-32-le'), dtype=np.uint32)
+        ends = np.cumsum([len(t) for t in texts])
+        starts = ends - [len(t) for t in texts]
+
+        def per_text(mask):
+            prefix = np.concatenate(([0], np.cumsum(mask, dtype=np.int64)))
+            return prefix[ends] - prefix[starts]
+
+        space = np.isin(codes, [ord(c) for c in SPACE_CHARS])
+        cjk = np.zeros(len(codes), dtype=bool)
+        for lo, hi in CJK_RANGES:
+            cjk |= (codes >= lo) & (codes <= hi)
+        lower = codes | 0x20
+        latin = (lower >= ord('a')) & (lower <= ord('z'))
+        nonspace = ends - starts - per_text(space)
+        return nonspace.tolist(), per_text(cjk).tolist(), per_text(latin).tolist()
+
+    nonspace = [len(t) - len(SPACE_PATTERN.findall(t)) for t in texts]
+    cjk = [len(CJK_PATTERN.findall(t)) for t in texts]
+    latin = [len(LATIN_PATTERN.findall(t)) for t in texts]
+    return nonspace, cjk, latin
+
+def nonspace_counts(texts):
+    """每段文本的非空白字符数（原文只需要这一项，不必计算字符分类）"""
+    return [len(t) - sum(map(t.count, SPACE_CHARS)) for t in texts]
+
+def preserved_ratio(pattern, original, translated):
+    """原文中匹配 pattern 的片段有多少原样出现在译文中"""
+    items = set(pattern.findall(original))
+    if not items:
+        return 1.0
+    return sum(1 for item in items if item in translated) / len(items)
+
+def robust_z_scores(values):
+    """稳健 z 分数：0.6745 * (x - 中位数) / MAD"""
+    if np is not None:
+        array = np.asarray(values, dtype=float)
+        median = np.median(array)
+        mad = np.median(np.abs(array - median)) or 1e-9
+        return (0.6745 * (array - median) / mad).tolist()
+    median = statistics.median(values)
+    mad = statistics.median(abs(v - median) for v in values) or 1e-9
+    return [0.6745 * (v - median) / mad for v in values]
+
+def compute_features(originals, translations):
+    """按列计算全部段落的特征，返回 {特征名: 列表}"""
+    original_chars = nonspace_counts(originals)
+    translated_chars, cjk_counts, latin_counts = char_class_counts(translations)
+    length_ratio = [max(t, 1) / max(o, 1) for o, t in zip(original_chars, translated_chars)]
+    return {
+        "cjk_ratio": [c / max(t, 1) for c, t in zip(cjk_counts, translated_chars)],
+        "latin_ratio": [l / max(t, 1) for l, t in zip(latin_counts, translated_chars)],
+        "length_ratio": length_ratio,
+        "length_z": robust_z_scores([math.log(r) for r in length_ratio]),
+        # 大部分原文不含数字，先用单个数字快速排除
+        "numbers_kept": [
+            preserved_ratio(NUMBER_PATTERN, o, t) if DIGIT_PATTERN.search(o) else 1.0
+            for o, t in zip(originals, translations)
+        ],
+        # 只有含链接的原文才需要逐段检查
+        "urls_kept": [
+            preserved_ratio(URL_PATTERN, o, t) if ('http' in o or 'www.' in o) else 1.0
+            for o, t in zip(originals, translations)
+        ],
+        "commentary": [bool(COMMENTARY_PATTERN.search(t)) for t in translations]
+    }
+
+def flag_reasons(feature):
+    reasons = []
+    if feature['cjk_ratio'] < MIN_CJK_RATIO:
+        reasons.append('low_cjk')
+    if feature['latin_ratio'] > MAX_LATIN_RATIO:
+        reasons.append('leftover_english')
+    if feature['length_ratio'] < MIN_LENGTH_RATIO:
+        reasons.append('truncated')
+    elif feature['length_z'] < -OUTLIER_Z:
+        reasons.append('too_short')
+    if feature['length_z'] > OUTLIER_Z:
+        reasons.append('too_long')
+    if feature['numbers_kept'] < 1.0:
+        reasons.append('numbers_missing')
+    if feature['urls_kept'] < 1.0:
+        reasons.append('urls_missing')
+    if feature['commentary']:
+        reasons.append('commentary')
+    return reasons
+
+def screen_corpus(processed_dir):
+    """计算全语料的特征并标记异常段落，返回 (检查的段落数, 标记列表)"""
+    rows = []       # [(文件名, 段落序号)]
+    originals = []
+    translations = []
+    for filename in sorted(os.listdir(processed_dir)):
+        if not filename.endswith('.json'):
+            continue
+        with open(os.path.join(processed_dir, filename), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        paragraphs = data.get('paragraphs', [])
+        if not paragraphs or not isinstance(paragraphs[0], dict):
+            continue
+        for i, para in enumerate(paragraphs):
+            if is_checkable(para):
+                rows.append((filename, i))
+                originals.append(para['original'])
+                translations.append(para['translated'])
+
+    if not rows:
+        return 0, []
+
+    columns = compute_features(originals, translations)
+    flagged = []
+    for n, (filename, i) in enumerate(rows):
+        feature = {name: values[n] for name, values in columns.items()}
+        reasons = flag_reasons(feature)
+        if reasons:
+            flagged.append({
+                "file": filename,
+                "index": i,
+                "reasons": reasons,
+                **{k: round(v, 3) if isinstance(v, float) else v for k, v in feature.items()}
+            })
+    return len(rows), flagged
+
+def mark_for_retranslation(processed_dir, flagged, reasons):
+    """把指定原因的异常段落改为 [翻译失败]，交给 retranslate_failed.py 等脚本重新翻译"""
+    by_file = {}
+    for item in flagged:
+        if set(item['reasons']) & reasons:
+            by_file.setdefault(item['file'], []).append(item['index'])
+
+    for filename, indices in by_file.items():
+        path = os.path.join(processed_dir, filename)
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        for i in indices:
+            original = data['paragraphs'][i]['original']
+            data['paragraphs'][i]['translated'] = f"[翻译失败] {original[:50]}..."
+            data['paragraphs'][i].pop('align', None)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+    return sum(len(indices) for indices in by_file.values())
+
+# 默认只对确定有问题的情况标记重译；too_long / numbers_missing 等需要人工确认
+DEFAULT_MARK_REASONS = {'low_cjk', 'leftover_english', 'truncated', 'commentary'}
+
+if __name__ == "__main__":
+    DATA_DIR = "data"
+    processed_dir = os.path.join(DATA_DIR, 'processed')
+
+    start = time.perf_counter()
+    checked, flagged = screen_corpus(processed_dir)
+    elapsed = time.perf_counter() - start
+
+    counts = {}
+    for item in flagged:
+        for reason in item['reasons']:
+            counts[reason] = counts.get(reason, 0) + 1
+
+    print(f"检查 {checked} 个段落，用时 {elapsed:.2f}s（{'numpy' if np is not None else '纯 Python'}），标记 {len(flagged)} 个")
+    for reason, count in sorted(counts.items(), key=lambda item: -item[1]):
+        print(f"  {reason:<18} {count}")
+
+    top = 10
+    if "--top" in sys.argv:
+        top = int(sys.argv[sys.argv.index("--top") + 1])
+    for item in flagged[:top]:
+        print(f"  {item['file']} #{item['index']+1}: {', '.join(item['reasons'])} "
+              f"(中文 {item['cjk_ratio']:.0%}, 长度比 {item['length_ratio']:.2f})")
+
+    output_dir = os.path.join(DATA_DIR, QUALITY_DIR)
+    os.makedirs(output_dir, exist_ok=True)
+    report_file = os.path.join(output_dir, 'flags.json')
+    with open(report_file, 'w', encoding='utf-8') as f:
+        json.dump({"checked": checked, "counts": counts, "flagged": flagged}, f, ensure_ascii=False, indent=2)
+    print(f"详细结果: {report_file}")
+
+    if "--mark" in sys.argv:
+        marked = mark_for_retranslation(processed_dir, flagged, DEFAULT_MARK_REASONS)
+        print(f"已将 {marked} 个段落标记为 [翻译失败]，可运行 retranslate_failed.py 重新翻译")
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+import os
+import time
+import fcntl
+
+class SharedRateLimiter:
+    """跨进程共享的请求频率控制
+
+    所有进程通过同一个状态文件（加文件锁）预约下一个可用的请求时间点，
+    因此无论启动多少个翻译进程，总请求频率都不会超过 interval 的限制。
+    """
+
+    def __init__(self, state_file, interval):
+        self.state_file = state_file
+        self.interval = interval
+        state_dir = os.path.dirname(state_file)
+        if state_dir:
+            os.makedirs(state_dir, exist_ok=True)
+
+    def reserve(self):
+        """预约一个请求时间点，返回需要等待的秒数"""
+        with open(self.state_file, 'a+', encoding='utf-8') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                content = f.read().strip()
+                try:
+                    last_slot = float(content) if content else 0
+                except ValueError:
+                    last_slot = 0
+
+                now = time.time()
+                slot = max(now, last_slot + self.interval)
+
+                f.seek(0)
+                f.truncate()
+                f.write(repr(slot))
+                f.flush()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+        return slot - now
+
+    def wait(self):
+        """等待直到轮到本进程发送请求"""
+        sleep_time = self.reserve()
+        if sleep_time > 0:
+            time.sleep(sleep_time)
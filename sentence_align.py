@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+import json
+import math
+import os
+import re
+import sys
+
+# 句子级对齐：译文翻译完成后，按句子长度和标点把原文句子和译文句子配对（不额外调用API）
+# 结果保存在段落的 align 字段："英文结束位置:中文结束位置 ..."，每组对应一组句子，
+# 最后一组到文本末尾，不写出。位置按 JS 字符串下标（UTF-16）计算，article.html 直接切分显示。
+# 只有一组（单句段落或无法对齐）时不写 align 字段。
+
+# 不作为句子结尾的缩写
+ABBREVIATIONS = {'mr', 'mrs', 'ms', 'dr', 'st', 'jr', 'sr', 'vs', 'e.g', 'i.e', 'u.s', 'inc', 'co', 'no', 'etc'}
+# 句末标点（可带引号、括号和 [7] 这样的脚注编号）后接空白和大写开头；
+# 抓取时丢失空格的 "poor.I don't" 也算断句
+EN_BOUNDARY = re.compile(r'[.!?]["\'”’)\]]*(?:\[\d+\])?\s+(?=["\'“‘(\[]?[A-Z0-9])|(?<=[a-z][.!?])(?=[A-Z])')
+ZH_BOUNDARY = re.compile(r'[。！？!?；]+[”’」』）)]*\s*')
+
+# 允许的配对方式（英文句数, 中文句数）和额外代价：优先一对一，其次一对二、二对一
+MOVES = {(1, 1): 0.0, (1, 2): 0.35, (2, 1): 0.35, (2, 2): 0.6, (1, 3): 0.8, (3, 1): 0.8}
+# 问号一致 / 不一致时的代价调整
+QUESTION_MATCH = -0.3
+QUESTION_MISMATCH = 0.3
+
+def split_english(text):
+    """英文句子的结束位置列表（最后一个为文本长度）"""
+    ends = []
+    for match in EN_BOUNDARY.finditer(text):
+        word = text[:match.start()].rsplit(None, 1)[-1].lower() if text[:match.start()].strip() else ''
+        word = word.strip('"\'“‘(').rstrip('.!?')
+        # 缩写和姓名首字母（如 "J. Smith"）不断句
+        if word in ABBREVIATIONS or (len(word) == 1 and word.isalpha()):
+            continue
+        ends.append(match.end())
+    if not ends or ends[-1] != len(text):
+        ends.append(len(text))
+    return ends
+
+def split_chinese(text):
+    """中文句子的结束位置列表（最后一个为文本长度）"""
+    ends = [match.end() for match in ZH_BOUNDARY.finditer(text) if match.end() < len(text)]
+    ends.append(len(text))
+    return ends
+
+def spans(ends):
+    return list(zip([0] + ends[:-1], ends))
+
+def align_sentences(original, translated):
+    """动态规划对齐句子，返回各组的 (英文结束位置, 中文结束位置)（Python 下标），无法对齐时返回 None"""
+    en = spans(split_english(original))
+    zh = spans(split_chinese(translated))
+    if len(en) < 2 or len(zh) < 2:
+        return None
+
+    # 按本段整体的长度比估算每个英文字符对应的中文字数
+    ratio = len(translated) / max(len(original), 1)
+    n, m = len(en), len(zh)
+    best = {(0, 0): (0.0, None)}
+    for i in range(n + 1):
+        for j in range(m + 1):
+            if (i, j) not in best:
+                continue
+            base = best[(i, j)][0]
+            for (a, b), penalty in MOVES.items():
+                if i + a > n or j + b > m:
+                    continue
+                en_start, en_end = en[i][0], en[i + a - 1][1]
+                zh_start, zh_end = zh[j][0], zh[j + b - 1][1]
+                en_len, zh_len = en_end - en_start, zh_end - zh_start
+                cost = abs(math.log((zh_len + 1) / (en_len * ratio + 1))) + penalty
+                en_question = original[en_start:en_end].rstrip().rstrip('"\'”’)').endswith('?')
+                zh_question = translated[zh_start:zh_end].rstrip().rstrip('”’」』）)').endswith(('？', '?'))
+                if en_question or zh_question:
+                    cost += QUESTION_MATCH if en_question == zh_question else QUESTION_MISMATCH
+                key = (i + a, j + b)
+                if key not in best or base + cost < best[key][0]:
+                    best[key] = (base + cost, (i, j))
+
+    if (n, m) not in best:
+        return None
+    groups = []
+    key = (n, m)
+    while key != (0, 0):
+        previous = best[key][1]
+        groups.append((en[key[0] - 1][1], zh[key[1] - 1][1]))
+        key = previous
+    groups.reverse()
+    return groups if len(groups) > 1 else None
+
+def utf16_offset(text, index):
+    """Python 下标转换为 JS 字符串下标（只有 BMP 以外的字符会不同）"""
+    return index + sum(1 for c in text[:index] if ord(c) > 0xFFFF)
+
+def python_offset(text, offset):
+    """JS 字符串下标转换为 Python 下标"""
+    index = units = 0
+    while units < offset and index < len(text):
+        units += 2 if ord(text[index]) > 0xFFFF else 1
+        index += 1
+    return index
+
+def encode_align(original, translated, groups):
+    return ' '.join(
+        f"{utf16_offset(original, en_end)}:{utf16_offset(translated, zh_end)}"
+        for en_end, zh_end in groups[:-1]
+    )
+
+def aligned_pairs(para):
+    """按 align 字段切分段落，返回 [(原文句子组, 译文句子组)]；没有 align 时整段为一组"""
+    original, translated = para['original'], para.get('translated', '')
+    bounds = []
+    for item in para.get('align', '').split():
+        en_end, zh_end = item.split(':')
+        bounds.append((python_offset(original, int(en_end)), python_offset(translated, int(zh_end))))
+    bounds.append((len(original), len(translated)))
+    pairs = []
+    en_start = zh_start = 0
+    for en_end, zh_end in bounds:
+        pairs.append((original[en_start:en_end], translated[zh_start:zh_end]))
+        en_start, zh_start = en_end, zh_end
+    return pairs
+
+def attach_alignment(para):
+    """为已翻译的段落计算 align 字段（未翻译、失败或只有一组时删除该字段），返回是否有变化"""
+    before = para.get('align')
+    translated = para.get('translated', '')
+    groups = None
+    if translated and not translated.startswith(('[待翻译]', '[翻译失败]')) and translated != para['original']:
+        groups = align_sentences(para['original'], translated)
+    if groups:
+        para['align'] = encode_align(para['original'], translated, groups)
+    else:
+        para.pop('align', None)
+    return para.get('align') != before
+
+def align_corpus(processed_dir):
+    """为全部文章补充句子对齐，只重写有变化的文件，返回 (更新文件数, 有对齐的段落数)"""
+    updated = aligned = 0
+    for filename in sorted(os.listdir(processed_dir)):
+        if not filename.endswith('.json'):
+            continue
+        path = os.path.join(processed_dir, filename)
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        paragraphs = data.get('paragraphs', [])
+        if not paragraphs or not isinstance(paragraphs[0], dict):
+            continue
+        changed = False
+        for para in paragraphs:
+            changed |= attach_alignment(para)
+            aligned += 'align' in para
+        if changed:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            updated += 1
+    return updated, aligned
+
+if __name__ == "__main__":
+    processed_dir = os.path.join("data", "processed")
+    if len(sys.argv) > 1:
+        # 查看单篇文章的对齐结果
+        with open(os.path.join(processed_dir, f"{sys.argv[1]}.json"), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        for i, para in enumerate(data.get('paragraphs', [])):
+            if 'align' in para:
+                print(f"段落 {i+1}:")
+                for en, zh in aligned_pairs(para):
+                    print(f"  {en.strip()}\n  → {zh.strip()}")
+        sys.exit(0)
+    updated, aligned = align_corpus(processed_dir)
+    print(f"完成！更新 {updated} 篇文章，{aligned} 个段落有句子对齐")
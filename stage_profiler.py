@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+import cProfile
+import json
+import os
+import pstats
+import time
+from contextlib import contextmanager
+
+class StageProfiler:
+    """按文章、按阶段统计耗时的性能分析器
+
+    - stage(name): 记录当前文章某个阶段的墙钟时间和 CPU 时间
+    - article(name): 为整篇文章开启 cProfile，结果保存为 <output_dir>/<name>.prof
+    - write_summary(): 输出最慢的文章和阶段排名
+    enabled=False 时所有方法都是空操作，不影响正常运行。
+    """
+
+    def __init__(self, output_dir, enabled=False):
+        self.output_dir = output_dir
+        self.enabled = enabled
+        self.articles = {}
+        self.current = None
+        if enabled:
+            os.makedirs(output_dir, exist_ok=True)
+
+    @contextmanager
+    def article(self, name):
+        if not self.enabled:
+            yield
+            return
+
+        self.current = self.articles.setdefault(name, {"wall": 0.0, "cpu": 0.0, "stages": {}})
+        profile = cProfile.Profile()
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            self.current["wall"] += time.perf_counter() - wall_start
+            self.current["cpu"] += time.process_time() - cpu_start
+            profile.dump_stats(os.path.join(self.output_dir, f"{name}.prof"))
+            self.current = None
+
+    @contextmanager
+    def stage(self, name):
+        if not self.enabled or self.current is None:
+            yield
+            return
+
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            stage = self.current["stages"].setdefault(name, {"wall": 0.0, "cpu": 0.0, "count": 0})
+            stage["wall"] += time.perf_counter() - wall_start
+            stage["cpu"] += time.process_time() - cpu_start
+            stage["count"] += 1
+
+    def stage_totals(self):
+        """各阶段在所有文章上的合计"""
+        totals = {}
+        for info in self.articles.values():
+            for name, stage in info["stages"].items():
+                total = totals.setdefault(name, {"wall": 0.0, "cpu": 0.0, "count": 0})
+                total["wall"] += stage["wall"]
+                total["cpu"] += stage["cpu"]
+                total["count"] += stage["count"]
+        return totals
+
+    def write_summary(self, top=10):
+        """保存 summary.json 并显示最慢的文章和阶段"""
+        if not self.enabled or not self.articles:
+            return
+
+        slowest = sorted(self.articles.items(), key=lambda item: item[1]["wall"], reverse=True)
+        stages = sorted(self.stage_totals().items(), key=lambda item: item[1]["wall"], reverse=True)
+
+        summary = {
+            "articles": len(self.articles),
+            "total_wall": sum(info["wall"] for info in self.articles.values()),
+            "total_cpu": sum(info["cpu"] for info in self.articles.values()),
+            "stages": dict(stages),
+            "slowest_articles": [
+                {"article": name, **info} for name, info in slowest[:top]
+            ]
+        }
+        summary_file = os.path.join(self.output_dir, "summary.json")
+        with open(summary_file, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+
+        print(f"\n性能分析 ({len(self.articles)} 篇文章, 墙钟 {summary['total_wall']:.2f}s, CPU {summary['total_cpu']:.2f}s):")
+        print("阶段耗时排名:")
+        for name, stage in stages:
+            print(f"  {name:<16} 墙钟 {stage['wall']:8.3f}s  CPU {stage['cpu']:8.3f}s  ({stage['count']} 次)")
+        print(f"最慢的 {min(top, len(slowest))} 篇文章:")
+        for name, info in slowest[:top]:
+            worst = max(info["stages"].items(), key=lambda item: item[1]["wall"], default=(None, None))[0]
+            print(f"  {name:<24} 墙钟 {info['wall']:8.3f}s  CPU {info['cpu']:8.3f}s  最慢阶段: {worst}")
+
+        # 合并所有文章的 cProfile 结果，显示最耗时的函数
+        prof_files = [os.path.join(self.output_dir, f"{name}.prof") for name in self.articles]
+        stats = pstats.Stats(*prof_files)
+        print("最耗时的函数（累计时间）:")
+        stats.sort_stats('cumulative').print_stats(15)
+        print(f"详细结果: {summary_file}（单篇 cProfile 文件可用 python -m pstats 查看）")
@@ -0,0 +1,16 @@
+// 由 build_manifest.py 生成，请勿手动修改
+self.CACHE_MANIFEST = {
+  "version": "10dbe41fcc0a",
+  "precache": [
+    "./",
+    "index.html",
+    "article.html",
+    "data/articles.json",
+    "data/index/head.json",
+    "data/index/page-1.json",
+    "data/index/page-2.json",
+    "data/index/page-3.json",
+    "data/index/page-4.json",
+    "data/index/page-5.json"
+  ]
+};
@@ -0,0 +1,109 @@
+// 离线缓存：页面和文章列表预缓存，文章内容按阅读和预取缓存，全部 stale-while-revalidate
+// 预缓存清单和版本号由 build_manifest.py 生成到 sw-manifest.js
+importScripts('sw-manifest.js');
+
+const MANIFEST = self.CACHE_MANIFEST;
+const SHELL_CACHE = `pg-shell-${MANIFEST.version}`;
+const ESSAY_CACHE = 'pg-essays';
+
+// 最多缓存多少篇文章内容（按最近使用淘汰）
+const MAX_ESSAYS = 60;
+
+self.addEventListener('install', event => {
+    event.waitUntil(
+        caches.open(SHELL_CACHE)
+            .then(cache => cache.addAll(MANIFEST.precache))
+            .then(() => self.skipWaiting())
+    );
+});
+
+self.addEventListener('activate', event => {
+    // 删除旧版本的预缓存，文章缓存跨版本保留（靠重新验证更新）
+    event.waitUntil(
+        caches.keys()
+            .then(names => Promise.all(
+                names
+                    .filter(name => name.startsWith('pg-shell-') && name !== SHELL_CACHE)
+                    .map(name => caches.delete(name))
+            ))
+            .then(() => self.clients.claim())
+    );
+});
+
+function isEssay(url) {
+    return url.pathname.includes('/data/processed/');
+}
+
+// 文章缓存超过上限时删除最早缓存的
+async function trimEssayCache(cache) {
+    const keys = await cache.keys();
+    for (let i = 0; i < keys.length - MAX_ESSAYS; i++) {
+        await cache.delete(keys[i]);
+    }
+}
+
+async function putInCache(cacheName, request, response) {
+    const cache = await caches.open(cacheName);
+    if (cacheName === ESSAY_CACHE) {
+        // 先删除再写入，使最近读过的文章排在最后
+        await cache.delete(request);
+        await cache.put(request, response);
+        await trimEssayCache(cache);
+    } else {
+        await cache.put(request, response);
+    }
+}
+
+// 有缓存时立即返回缓存，同时在后台从网络更新；没有缓存时等待网络
+async function staleWhileRevalidate(event, cacheName, ignoreSearch) {
+    const request = event.request;
+    const cached = await caches.match(request, { ignoreSearch });
+
+    const network = fetch(request).then(async response => {
+        if (response.ok) {
+            const key = ignoreSearch ? new URL(request.url).pathname : request;
+            await putInCache(cacheName, key, response.clone());
+        }
+        return response;
+    });
+
+    if (cached) {
+        event.waitUntil(network.catch(() => {}));
+        return cached;
+    }
+    return network;
+}
+
+self.addEventListener('fetch', event => {
+    const request = event.request;
+    const url = new URL(request.url);
+    if (request.method !== 'GET' || url.origin !== self.location.origin) return;
+
+    if (isEssay(url)) {
+        event.respondWith(staleWhileRevalidate(event, ESSAY_CACHE, false));
+    } else if (request.mode === 'navigate') {
+        // article.html?id=... 共用同一份页面缓存
+        event.respondWith(staleWhileRevalidate(event, SHELL_CACHE, true));
+    } else if (url.pathname.endsWith('.json')) {
+        event.respondWith(staleWhileRevalidate(event, SHELL_CACHE, false));
+    }
+});
+
+// 首页把可见文章的内容地址发过来，后台预取尚未缓存的
+self.addEventListener('message', event => {
+    const data = event.data || {};
+    if (data.type !== 'prefetch' || !Array.isArray(data.urls)) return;
+
+    event.waitUntil((async () => {
+        const cache = await caches.open(ESSAY_CACHE);
+        for (const url of data.urls) {
+            if (await cache.match(url)) continue;
+            try {
+                const response = await fetch(url);
+                if (response.ok) await putInCache(ESSAY_CACHE, url, response);
+            } catch (error) {
+                // 离线或网络错误时跳过，下次可见时再试
+            }
+        }
+    })());
+});
@@ -0,0 +1,55 @@
+import os
+from article_index import ArticleIndex, build_shards, sort_key
+
+def make_article(article_id, date):
+    return {"id": article_id, "title": f"Essay {article_id}", "title_zh": "", "filename": f"e{article_id}.html", "date": date}
+
+def make_index(dates):
+    return ArticleIndex([dict(make_article(i + 1, date), order=(i + 1) * 1024) for i, date in enumerate(dates)])
+
+def test_sort_key_puts_unparseable_dates_last():
+    assert sort_key({"date": "June 2005"}) == sort_key({"date": "Unknown"})
+    assert sort_key({"date": "2005-06-01"}) < sort_key({"date": "June 2005"})
+
+def test_fix_dates_repairs_unparseable_date():
+    index = ArticleIndex([make_article(1, "June 2005"), make_article(2, "2010-01-01")])
+    fixed = index.fix_dates()
+    assert [a['id'] for a in fixed] == [1]
+    assert [a['id'] for a in index.articles] == [2, 1]
+    assert index.articles[1]['date'] == 'Unknown'
+
+def test_fix_dates_moves_future_dates_to_end():
+    index = make_index(["2099-01-01", "2010-01-01", "2009-01-01"])
+    index.fix_dates(max_year=2030)
+    assert [a['id'] for a in index.articles] == [2, 3, 1]
+
+def test_insert_keeps_other_orders():
+    index = make_index(["2010-01-01", "2009-01-01", "2008-01-01"])
+    before = {a['id']: a['order'] for a in index.articles}
+    assert index.insert(make_article(10, "2011-01-01")) == 0
+    assert index.insert(make_article(11, "2009-06-01")) == 2
+    orders = [a['order'] for a in index.articles]
+    assert orders == sorted(orders)
+    assert all(a['order'] == before[a['id']] for a in index.articles if a['id'] in before)
+    assert {a['id'] for a in index.changed()} == {10, 11}
+
+def test_insert_renumbers_when_gap_is_used_up():
+    index = make_index(["2010-01-01", "2008-01-01"])
+    index.articles[1]['order'] = index.articles[0]['order'] + 1
+    index.insert(make_article(10, "2009-01-01"))
+    orders = [a['order'] for a in index.articles]
+    assert [a['id'] for a in index.articles] == [1, 10, 2]
+    assert orders == sorted(set(orders))
+
+def test_new_article_only_rewrites_head_and_first_page(tmp_path):
+    index = make_index([f"{2000 - i // 12:04d}-{i % 12 + 1:02d}-01" for i in range(130)])
+    index_dir = str(tmp_path)
+    build_shards(index.articles, index_dir, head_size=20, page_size=50)
+    mtimes = {f: os.stat(os.path.join(index_dir, f)).st_mtime_ns for f in os.listdir(index_dir)}
+    for f in mtimes:
+        os.utime(os.path.join(index_dir, f), ns=(0, 0))
+
+    index.insert(make_article(200, "2020-01-01"))
+    assert build_shards(index.articles, index_dir, head_size=20, page_size=50) == 2
+    rewritten = {f for f in os.listdir(index_dir) if os.stat(os.path.join(index_dir, f)).st_mtime_ns != 0}
+    assert rewritten == {'head.json', 'page-1.json'}
@@ -0,0 +1,29 @@
+from article_sync import merge_paragraphs
+
+def paragraphs(*texts):
+    return [{"original": text, "translated": f"译文 {text}"} for text in texts]
+
+def test_unchanged_paragraphs_keep_translations():
+    merged, counts = merge_paragraphs(paragraphs("A a.", "B b."), ["A a.", "B b."])
+    assert [p['translated'] for p in merged] == ["译文 A a.", "译文 B b."]
+    assert counts == {"kept": 2, "moved": 0, "modified": 0, "inserted": 0, "deleted": 0}
+
+def test_modified_and_inserted_paragraphs_are_pending():
+    merged, counts = merge_paragraphs(paragraphs("A a.", "B b.", "C c."), ["A a.", "B changed.", "C c.", "D d."])
+    assert merged[1]['translated'].startswith('[待翻译]')
+    assert merged[3]['translated'].startswith('[待翻译]')
+    assert counts == {"kept": 2, "moved": 0, "modified": 1, "inserted": 1, "deleted": 0}
+
+def test_moved_paragraph_keeps_translation():
+    merged, counts = merge_paragraphs(paragraphs("A a.", "B b.", "C c."), ["C c.", "A a.", "B b."])
+    assert [p['translated'] for p in merged] == ["译文 C c.", "译文 A a.", "译文 B b."]
+    assert counts['moved'] == 1 and counts['deleted'] == 0
+
+def test_deleted_paragraph_replaced_by_duplicate_is_counted():
+    merged, counts = merge_paragraphs(paragraphs("A a.", "B b.", "C c.", "D d."), ["A a.", "B b.", "A a.", "D d."])
+    assert [p['original'] for p in merged] == ["A a.", "B b.", "A a.", "D d."]
+    assert counts['deleted'] == 1
+
+def test_plain_deletion():
+    _, counts = merge_paragraphs(paragraphs("A a.", "B b.", "C c."), ["A a.", "C c."])
+    assert counts == {"kept": 2, "moved": 0, "modified": 0, "inserted": 0, "deleted": 1}
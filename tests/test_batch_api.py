@@ -0,0 +1,26 @@
+import json
+import os
+from batch_api import export_batch, ingest_results, simulate_results
+from translate_simple import needs_paragraph_translation
+
+def test_batch_round_trip_keeps_short_paragraphs(tmp_path):
+    data_dir = tmp_path / "data"
+    os.makedirs(data_dir / "processed")
+    article = {
+        "title": "Essay",
+        "content": {"paragraphs": ["June 2005", "This paragraph is long enough to translate."]},
+    }
+    with open(data_dir / "processed" / "essay.json", 'w', encoding='utf-8') as f:
+        json.dump(article, f, ensure_ascii=False, indent=2)
+
+    requests_file = str(tmp_path / "requests.jsonl")
+    results_file = str(tmp_path / "results.jsonl")
+    assert export_batch(str(data_dir), requests_file) == 1
+    simulate_results(requests_file, results_file)
+    assert ingest_results(str(data_dir), results_file) == 1
+
+    with open(data_dir / "processed" / "essay.json", encoding='utf-8') as f:
+        paragraphs = json.load(f)["paragraphs"]
+    assert paragraphs[0]["translated"] == "June 2005"
+    assert paragraphs[1]["translated"].startswith("[模拟译文]")
+    assert not any(needs_paragraph_translation(p) for p in paragraphs)
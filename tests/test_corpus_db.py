@@ -0,0 +1,65 @@
+import json
+import os
+import pytest
+from corpus_db import connect, export_articles, export_documents, import_corpus, update_article, verify_documents
+
+ARTICLES = [
+    {"title": "New", "url": "https://www.paulgraham.com/new.html", "filename": "new.html", "title_zh": "新", "date": "2020-01-01", "id": 1, "order": 1024},
+    {"title": "Old", "url": "https://www.paulgraham.com/old.html", "filename": "old.html", "title_zh": "旧", "date": "2010-01-01", "id": 2, "order": 2048},
+]
+
+def write_json(path, data):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+@pytest.fixture
+def data_dir(tmp_path):
+    data_dir = tmp_path / "data"
+    os.makedirs(data_dir / "processed")
+    write_json(data_dir / "articles.json", ARTICLES)
+    write_json(data_dir / "processed" / "new.json", {
+        "title": "New",
+        "date": "2020-01-01",
+        "content": {"paragraphs": ["First one here.", "Second one here."]},
+        "paragraphs": [
+            {"original": "First one here.", "translated": "第一段。", "align": "7:4"},
+            {"original": "Second one here.", "id": 7, "translated": "[待翻译] Second one here."},
+        ],
+    })
+    write_json(data_dir / "processed" / "old.json", {
+        "title": "Old",
+        "date": "2010-01-01",
+        "content": {"paragraphs": ["Only one."]},
+        "paragraphs": [{"original": "Only one.", "translated": "唯一一段。"}],
+    })
+    return str(data_dir)
+
+def test_round_trip_is_byte_identical(data_dir):
+    conn = import_corpus(data_dir)
+    assert verify_documents(conn, data_dir) == []
+
+def test_read_commands_do_not_create_an_empty_database(data_dir):
+    with pytest.raises(FileNotFoundError):
+        connect(data_dir)
+    assert not os.path.exists(os.path.join(data_dir, "corpus.db"))
+
+def test_set_date_moves_article_and_updates_document(data_dir):
+    conn = import_corpus(data_dir)
+    with conn:
+        slug = update_article(conn, 1, 'date', '2005-01-01')
+    assert slug == 'new'
+    export_articles(conn, data_dir)
+    export_documents(conn, data_dir, [slug])
+
+    with open(os.path.join(data_dir, "articles.json"), encoding='utf-8') as f:
+        articles = json.load(f)
+    assert [a['id'] for a in articles] == [2, 1]
+    assert articles[0]['order'] == 2048
+    with open(os.path.join(data_dir, "processed", "new.json"), encoding='utf-8') as f:
+        assert json.load(f)['date'] == '2005-01-01'
+    assert verify_documents(conn, data_dir) == []
+
+def test_set_rejects_unknown_field(data_dir):
+    conn = import_corpus(data_dir)
+    with pytest.raises(ValueError):
+        update_article(conn, 1, 'filename', 'x.html')
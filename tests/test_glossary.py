@@ -0,0 +1,48 @@
+from glossary import Glossary, TermMatcher, capitalized_runs, format_terms, is_generic_pair, tokenize
+
+def make_glossary():
+    return Glossary({
+        "hacker": {"zh": "黑客", "docs": 65},
+        "Hacker News": {"zh": "Hacker News", "docs": 5},
+        "venture capital": {"zh": "风险投资", "docs": 17},
+        "venture capitalist": {"zh": "风险投资人", "docs": 11},
+        "startup": {"zh": "初创公司", "docs": 141},
+        "VC": {"zh": "VC", "docs": 41},
+        "Google": {"zh": "", "docs": 60},
+    })
+
+def test_longer_term_covers_shorter_one():
+    glossary = make_glossary()
+    assert glossary.lookup(["I read Hacker News"]) == [("Hacker News", "Hacker News")]
+    assert glossary.lookup(["a venture capitalist"]) == [("venture capitalist", "风险投资人")]
+
+def test_shorter_term_still_matches_on_its_own():
+    glossary = make_glossary()
+    assert glossary.lookup(["Hacker News is for hackers"]) == [("Hacker News", "Hacker News"), ("hacker", "黑客")]
+
+def test_leftmost_longest_drops_overlapping_match():
+    matcher = TermMatcher({"new york": "new york", "york times": "york times"})
+    assert matcher.find("the new york times") == ["new york"]
+
+def test_word_boundaries_case_and_plurals():
+    glossary = make_glossary()
+    assert glossary.matcher.find("Startups and VCs, not vcs or startupish") == ["startup", "VC"]
+
+def test_terms_without_translation_are_not_used():
+    glossary = make_glossary()
+    assert glossary.lookup(["Google"]) == []
+    assert format_terms([]) == ""
+
+def test_capitalized_runs_stop_at_punctuation():
+    tokens = tokenize("He wrote Hackers & Painters with Robert Morris, Trevor Blackwell.")
+    assert capitalized_runs(tokens) == ["Hackers", "Painters", "Robert Morris", "Trevor Blackwell"]
+
+def test_glued_words_are_split():
+    assert [word for word, _, _ in tokenize("See TranslationJapanese")] == ["See", "Translation", "Japanese"]
+
+def test_generic_pairs_are_filtered():
+    assert is_generic_pair("powerful", "force")
+    assert is_generic_pair("raising", "money")
+    assert is_generic_pair("fairly", "quickly")
+    assert not is_generic_pair("search", "engine")
+    assert not is_generic_pair("operating", "system")
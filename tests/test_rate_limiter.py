@@ -0,0 +1,36 @@
+import multiprocessing
+import time
+from rate_limiter import SharedRateLimiter
+
+def reserve_slots(state_file, interval, count, queue):
+    limiter = SharedRateLimiter(state_file, interval)
+    for _ in range(count):
+        wait = limiter.reserve()
+        queue.put(time.time() + wait)
+
+def test_instances_share_the_interval(tmp_path):
+    state_file = str(tmp_path / "limit" / "rate.state")
+    first = SharedRateLimiter(state_file, 10)
+    second = SharedRateLimiter(state_file, 10)
+    assert first.reserve() <= 0
+    assert 9 < second.reserve() <= 10
+    assert 19 < first.reserve() <= 20
+
+def test_processes_never_share_a_slot(tmp_path):
+    state_file = str(tmp_path / "rate.state")
+    interval = 0.5
+    queue = multiprocessing.Queue()
+    processes = [multiprocessing.Process(target=reserve_slots, args=(state_file, interval, 3, queue))
+                 for _ in range(4)]
+    for process in processes:
+        process.start()
+    slots = sorted(queue.get(timeout=10) for _ in range(12))
+    for process in processes:
+        process.join()
+    # 除去 reserve 返回后读取时钟的误差，相邻预约时间点至少相隔 interval
+    assert all(b - a >= interval - 0.05 for a, b in zip(slots, slots[1:]))
+
+def test_corrupt_state_is_reset(tmp_path):
+    state_file = tmp_path / "rate.state"
+    state_file.write_text("not a number")
+    assert SharedRateLimiter(str(state_file), 1).reserve() <= 0
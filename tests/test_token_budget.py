@@ -0,0 +1,63 @@
+import json
+import os
+from token_budget import TokenBudget, token_cost
+
+def make_budget(tmp_path, **kwargs):
+    kwargs.setdefault("throttle_delay", 0)
+    return TokenBudget(str(tmp_path / "budget.json"), **kwargs)
+
+def test_run_limit_stops_before_sending(tmp_path):
+    budget = make_budget(tmp_path, run_tokens=1000)
+    budget.start_run()
+    assert budget.wait(400, 400) is None
+    budget.record(400, 400)
+    assert budget.wait(200, 200) is not None
+    assert budget.exhausted
+    run, daily = budget.usage()
+    assert run["tokens_in"] == 400 and run["stopped"]
+    assert daily["requests"] == 1
+
+def test_record_counts_cost(tmp_path):
+    budget = make_budget(tmp_path)
+    budget.start_run()
+    cost = budget.record(1000, 2000)
+    assert cost == token_cost(1000, 2000)
+    run, _ = budget.usage()
+    assert run["cost"] == round(cost, 6)
+
+def test_resume_keeps_previous_run_usage(tmp_path):
+    budget = make_budget(tmp_path)
+    run_id = budget.start_run()
+    budget.record(100, 100)
+    resumed = make_budget(tmp_path)
+    assert resumed.start_run(resume=True) == run_id
+    run, _ = resumed.usage()
+    assert run["tokens_in"] == 100 and run["stopped"] is None
+    fresh = make_budget(tmp_path)
+    fresh.start_run()
+    run, daily = fresh.usage()
+    assert run["tokens_in"] == 0 and daily["tokens_in"] == 100
+
+def test_worker_refuses_state_of_another_run(tmp_path):
+    parent = make_budget(tmp_path)
+    run_id = parent.start_run()
+    worker = make_budget(tmp_path, run_id=run_id)
+    assert worker.wait(10, 10) is None
+    worker.record(10, 10)
+
+    # 另一次运行重置了状态文件，旧运行的工作进程不能再往里记账
+    make_budget(tmp_path).start_run()
+    assert worker.wait(10, 10) is not None
+    assert worker.exhausted
+    worker.record(10, 10)
+    with open(tmp_path / "budget.json", encoding="utf-8") as f:
+        state = json.load(f)
+    assert state["run"]["tokens_in"] == 0 and state["run"]["stopped"] is None
+    assert state["daily"]["tokens_in"] == 10
+
+def test_usage_does_not_create_state_file(tmp_path):
+    budget = TokenBudget(str(tmp_path / "sub" / "budget.json"))
+    run, daily = budget.usage()
+    budget.print_summary()
+    assert run["requests"] == 0 and daily["requests"] == 0
+    assert not os.path.exists(tmp_path / "sub")
@@ -0,0 +1,33 @@
+from token_chunker import build_chunks, count_tokens, max_tokens_for, split_long_text
+
+SENTENCE = "This sentence is about startups and essays."
+
+def test_short_paragraphs_are_grouped_up_to_target():
+    items = [(i, SENTENCE) for i in range(10)]
+    tokens = count_tokens(SENTENCE)
+    chunks = build_chunks(items, target_tokens=tokens * 3, max_tokens=tokens * 10)
+    assert [[index for index, _ in chunk] for chunk in chunks] == [[0, 1, 2], [3, 4, 5], [6, 7, 8], [9]]
+
+def test_long_paragraph_is_split_into_consecutive_chunks():
+    long_text = " ".join([SENTENCE] * 12)
+    max_tokens = count_tokens(SENTENCE) * 4
+    chunks = build_chunks([(0, "Short intro here."), (1, long_text), (2, "Short outro here.")],
+                          target_tokens=max_tokens, max_tokens=max_tokens)
+    assert chunks[0] == [(0, "Short intro here.")]
+    assert chunks[-1] == [(2, "Short outro here.")]
+    pieces = chunks[1:-1]
+    assert len(pieces) > 1 and all(chunk[0][0] == 1 and len(chunk) == 1 for chunk in pieces)
+    assert " ".join(chunk[0][1] for chunk in pieces) == long_text
+
+def test_split_long_text_respects_limit():
+    text = " ".join([SENTENCE] * 20)
+    max_tokens = count_tokens(SENTENCE) * 3
+    pieces = split_long_text(text, max_tokens)
+    assert all(count_tokens(piece) <= max_tokens for piece in pieces)
+    assert " ".join(pieces) == text
+    assert split_long_text(SENTENCE) == [SENTENCE]
+
+def test_max_tokens_bounds():
+    assert max_tokens_for(0) == 256
+    assert max_tokens_for(1000) == 2064
+    assert max_tokens_for(10000) == 4000
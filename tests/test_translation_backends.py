@@ -0,0 +1,20 @@
+from token_chunker import PARAGRAPH_SEPARATOR
+from translate_simple import build_group_messages, build_messages
+from translation_backends import MockBackend
+
+def test_mock_marks_single_paragraph():
+    result = MockBackend(latency=0).chat(build_messages("Hello world."))
+    assert result['success']
+    assert result['content'] == "[模拟译文] Hello world."
+
+def test_mock_marks_every_paragraph_of_a_group():
+    texts = ["First paragraph.", "Second paragraph.", "Third paragraph."]
+    result = MockBackend(latency=0).chat(build_group_messages(texts))
+    parts = [part.strip() for part in result['content'].split(PARAGRAPH_SEPARATOR)]
+    assert parts == [f"[模拟译文] {text}" for text in texts]
+
+def test_mock_error_rates():
+    backend = MockBackend(latency=0, rate_limit_rate=1.0)
+    assert backend.chat(build_messages("x"))['status_code'] == 429
+    backend = MockBackend(latency=0, error_rate=1.0)
+    assert backend.chat(build_messages("x"))['status_code'] == 500
@@ -0,0 +1,28 @@
+import json
+from translate_simple import check_article_needs_translation
+from translation_scheduler import parse_priority, remaining_paragraphs
+
+def write_article(tmp_path, paragraphs):
+    path = tmp_path / "essay.json"
+    path.write_text(json.dumps({"paragraphs": paragraphs}, ensure_ascii=False), encoding='utf-8')
+    return str(path)
+
+def test_remaining_paragraphs_uses_the_shared_predicate(tmp_path):
+    path = write_article(tmp_path, [
+        {"original": "This one is done.", "translated": "这段已完成。"},
+        {"original": "This one is pending.", "translated": "[待翻译] This one is pending."},
+        {"original": "This one failed badly.", "translated": "[翻译失败] This one failed badly."},
+        {"original": "Too short", "translated": "[待翻译] Too short"},
+        {"original": "Quoting a marker is fine.", "translated": "引用 “[翻译失败]” 标记没有问题。"},
+    ])
+    assert remaining_paragraphs(path) == 2
+    assert check_article_needs_translation(path)
+
+def test_short_pending_paragraphs_do_not_count(tmp_path):
+    path = write_article(tmp_path, [{"original": "Notes", "translated": "[待翻译] Notes"}])
+    assert remaining_paragraphs(path) == 0
+    assert not check_article_needs_translation(path)
+
+def test_parse_priority():
+    assert parse_priority("alpha") is None
+    assert parse_priority("recency=2") == {"recency": 2.0, "popularity": 0.0, "remaining": 0.0}
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+import fcntl
+import json
+import os
+import sys
+import time
+import uuid
+from datetime import datetime
+
+# token 用量和费用预算：按本次运行和按天累计，多进程通过同一个状态文件（加文件锁）共享
+BUDGET_STATE_FILE = ".token_budget.json"
+
+# 价格：每百万 token 的费用（元），默认按 SiliconFlow 上 Qwen2.5-72B-Instruct 的价格
+DEFAULT_PRICE_IN = 4.13
+DEFAULT_PRICE_OUT = 4.13
+
+def token_cost(tokens_in, tokens_out):
+    """按 TRANSLATE_PRICE_IN / TRANSLATE_PRICE_OUT（元 / 百万 token）计算费用"""
+    price_in = float(os.getenv("TRANSLATE_PRICE_IN", DEFAULT_PRICE_IN))
+    price_out = float(os.getenv("TRANSLATE_PRICE_OUT", DEFAULT_PRICE_OUT))
+    return (tokens_in * price_in + tokens_out * price_out) / 1_000_000
+
+def empty_usage():
+    return {"tokens_in": 0, "tokens_out": 0, "cost": 0.0, "requests": 0}
+
+class TokenBudget:
+    """跨进程共享的 token / 费用预算
+
+    上限为 0 表示不限制。用量达到某个上限的 throttle_at 比例后，每个请求前额外等待
+    throttle_delay 秒放慢速度；预计超过上限时拒绝请求（exhausted 置为 True），
+    调用方不再发送请求，未完成的段落留到下次运行。状态文件记录当天和最近一次运行的累计值，
+    下次运行用 resume 继续累计上次运行的用量。
+
+    工作进程用 run_id 创建：状态文件中的运行已被另一次运行替换（如另开了一个翻译进程或 --reset-run）时，
+    不再把用量记到别人的运行上，而是按预算用完处理（exhausted 置为 True）。
+    """
+
+    def __init__(self, state_file, run_tokens=0, daily_tokens=0, run_cost=0, daily_cost=0,
+                 throttle_at=0.8, throttle_delay=2.0, run_id=None):
+        self.state_file = state_file
+        self.limits = {
+            ("run", "tokens"): run_tokens,
+            ("daily", "tokens"): daily_tokens,
+            ("run", "cost"): run_cost,
+            ("daily", "cost"): daily_cost
+        }
+        self.throttle_at = throttle_at
+        self.throttle_delay = throttle_delay
+        self.run_id = run_id
+        self.exhausted = False
+        self.stop_reason = None
+
+    @classmethod
+    def from_env(cls, state_file, run_id=None):
+        """从环境变量读取上限（TRANSLATE_RUN_TOKEN_LIMIT 等，token 数为输入加输出）"""
+        return cls(
+            state_file,
+            run_tokens=int(os.getenv("TRANSLATE_RUN_TOKEN_LIMIT", "0")),
+            daily_tokens=int(os.getenv("TRANSLATE_DAILY_TOKEN_LIMIT", "0")),
+            run_cost=float(os.getenv("TRANSLATE_RUN_COST_LIMIT", "0")),
+            daily_cost=float(os.getenv("TRANSLATE_DAILY_COST_LIMIT", "0")),
+            throttle_at=float(os.getenv("TRANSLATE_BUDGET_THROTTLE", "0.8")),
+            throttle_delay=float(os.getenv("TRANSLATE_BUDGET_DELAY", "2")),
+            run_id=run_id
+        )
+
+    def _parse(self, text):
+        """解析状态文件内容；日期变化时清零当天用量，运行 id 与 run_id 不一致时停止"""
+        try:
+            state = json.loads(text or '{}')
+        except ValueError:
+            state = {}
+        today = datetime.now().strftime('%Y-%m-%d')
+        if state.get('date') != today:
+            state['date'] = today
+            state['daily'] = empty_usage()
+        state.setdefault('run', dict(empty_usage(), id=None))
+        if self._stale(state):
+            self.exhausted = True
+            self.stop_reason = f"预算状态已属于另一次运行 {state['run'].get('id')}（本次运行 {self.run_id}）"
+        return state
+
+    def _stale(self, state):
+        return bool(self.run_id) and state['run'].get('id') != self.run_id
+
+    def _update(self, change):
+        """加锁读取状态，change(state) 修改后写回；状态已属于另一次运行时不写入"""
+        state_dir = os.path.dirname(self.state_file)
+        if state_dir:
+            os.makedirs(state_dir, exist_ok=True)
+        with open(self.state_file, 'a+', encoding='utf-8') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                state = self._parse(f.read())
+                if not self._stale(state):
+                    change(state)
+                    f.seek(0)
+                    f.truncate()
+                    json.dump(state, f, ensure_ascii=False, indent=2)
+                    f.flush()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+        return state
+
+    def start_run(self, resume=False):
+        """开始一次运行；resume 时沿用上次运行的累计用量，返回运行 id（传给工作进程）"""
+        self.run_id = None
+        self.exhausted = False
+        self.stop_reason = None
+        def change(state):
+            if resume and state['run'].get('id'):
+                state['run']['stopped'] = None
+            else:
+                state['run'] = dict(empty_usage(), id=f"{datetime.now().isoformat(timespec='seconds')}-{uuid.uuid4().hex[:6]}", stopped=None)
+            self.run_id = state['run']['id']
+        self._update(change)
+        return self.run_id
+
+    def usage(self):
+        """只读地读取累计用量（状态文件不存在时返回零，不创建文件）"""
+        text = ''
+        if os.path.exists(self.state_file):
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                fcntl.flock(f, fcntl.LOCK_SH)
+                try:
+                    text = f.read()
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+        state = self._parse(text)
+        return state['run'], state['daily']
+
+    def check(self, tokens_in, tokens_out):
+        """发送请求前检查预算，返回 "ok"、"throttle" 或 "stop"（附带原因）"""
+        run, daily = self.usage()
+        if self.exhausted:
+            return "stop", self.stop_reason
+        tokens = tokens_in + tokens_out
+        projected = {
+            ("run", "tokens"): run['tokens_in'] + run['tokens_out'] + tokens,
+            ("daily", "tokens"): daily['tokens_in'] + daily['tokens_out'] + tokens,
+            ("run", "cost"): run['cost'] + token_cost(tokens_in, tokens_out),
+            ("daily", "cost"): daily['cost'] + token_cost(tokens_in, tokens_out)
+        }
+        status, reason = "ok", None
+        for key, limit in self.limits.items():
+            if not limit:
+                continue
+            if projected[key] > limit:
+                self.exhausted = True
+                return "stop", f"{'本次运行' if key[0] == 'run' else '今日'}{'token' if key[1] == 'tokens' else '费用'}上限 {limit}"
+            if projected[key] > limit * self.throttle_at:
+                status, reason = "throttle", f"接近{'本次运行' if key[0] == 'run' else '今日'}上限"
+        return status, reason
+
+    def wait(self, tokens_in, tokens_out):
+        """检查预算，接近上限时放慢；返回 None 表示可以发送，否则返回拒绝原因"""
+        if self.exhausted:
+            return self.stop_reason
+        status, reason = self.check(tokens_in, tokens_out)
+        if status == "stop":
+            self.stop_reason = reason
+            def change(state):
+                state['run']['stopped'] = reason
+            self._update(change)
+            return reason
+        if status == "throttle" and self.throttle_delay > 0:
+            time.sleep(self.throttle_delay)
+        return None
+
+    def record(self, tokens_in, tokens_out):
+        """记录一次请求的实际用量，返回本次费用"""
+        cost = token_cost(tokens_in, tokens_out)
+        def change(state):
+            for usage in (state['run'], state['daily']):
+                usage['tokens_in'] += tokens_in
+                usage['tokens_out'] += tokens_out
+                usage['cost'] = round(usage['cost'] + cost, 6)
+                usage['requests'] += 1
+        self._update(change)
+        return cost
+
+    def print_summary(self):
+        run, daily = self.usage()
+        print("预算用量:")
+        for label, usage, kind in (("本次运行", run, "run"), ("今日", daily, "daily")):
+            limits = [f"{limit} token" if name == 'tokens' else f"¥{limit}"
+                      for (scope, name), limit in self.limits.items() if scope == kind and limit]
+            print(f"  {label}: {usage['requests']} 个请求，token {usage['tokens_in']} + {usage['tokens_out']}，"
+                  f"费用 ¥{usage['cost']:.4f}" + (f"（上限 {', '.join(limits)}）" if limits else ""))
+        if run.get('stopped'):
+            print(f"  已因预算停止（{run['stopped']}），提高上限或明天用 --resume 继续")
+
+if __name__ == "__main__":
+    # 查看预算用量
+    budget = TokenBudget.from_env(os.path.join("data", BUDGET_STATE_FILE))
+    budget.print_summary()
+    if "--reset-run" in sys.argv:
+        budget.start_run()
+        print("已重置本次运行的累计用量")
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+import re
+
+try:
+    import tiktoken
+    _encoding = tiktoken.get_encoding("cl100k_base")
+except Exception:
+    # 未安装 tiktoken 时使用字符数估算
+    _encoding = None
+
+CJK_PATTERN = re.compile(r'[\u3000-\u303f\u4e00-\u9fff\uff00-\uffef]')
+
+# 每个请求的目标输入 token 数和单段上限
+TARGET_CHUNK_TOKENS = 600
+MAX_CHUNK_TOKENS = 1200
+
+# 合并多个段落时使用的分隔标记，模型需原样保留
+PARAGRAPH_SEPARATOR = "<<<PARA>>>"
+
+def count_tokens(text):
+    """估算文本的 token 数"""
+    if not text:
+        return 0
+    if _encoding is not None:
+        return len(_encoding.encode(text))
+    # 中文约每字 1 token，英文约每 4 个字符 1 token
+    cjk_count = len(CJK_PATTERN.findall(text))
+    return cjk_count + (len(text) - cjk_count + 3) // 4
+
+def max_tokens_for(input_tokens):
+    """根据输入长度设置 max_tokens（中文译文通常比英文原文多 50% 左右的 token）"""
+    return min(4000, max(256, int(input_tokens * 2) + 64))
+
+def split_long_text(text, max_tokens=MAX_CHUNK_TOKENS):
+    """把超长段落按句子切成不超过 max_tokens 的片段"""
+    if count_tokens(text) <= max_tokens:
+        return [text]
+
+    sentences = re.split(r'(?<=[.!?])\s+', text)
+    pieces = []
+    current = ""
+    for sentence in sentences:
+        candidate = f"{current} {sentence}".strip()
+        if current and count_tokens(candidate) > max_tokens:
+            pieces.append(current)
+            current = sentence
+        else:
+            current = candidate
+    if current:
+        pieces.append(current)
+    return pieces
+
+def build_chunks(items, target_tokens=TARGET_CHUNK_TOKENS, max_tokens=MAX_CHUNK_TOKENS):
+    """把 (段落序号, 文本) 列表组合成请求块
+
+    - 相邻的短段落合并到同一个请求，直到接近 target_tokens
+    - 超过 max_tokens 的段落按句子拆开，每个片段单独请求
+    返回请求块列表，每块是 [(段落序号, 文本), ...]；
+    同一段落拆出的多个片段按顺序出现在连续的块中。
+    """
+    chunks = []
+    current = []
+    current_tokens = 0
+
+    for index, text in items:
+        tokens = count_tokens(text)
+
+        if tokens > max_tokens:
+            if current:
+                chunks.append(current)
+                current, current_tokens = [], 0
+            for piece in split_long_text(text, max_tokens):
+                chunks.append([(index, piece)])
+            continue
+
+        if current and current_tokens + tokens > target_tokens:
+            chunks.append(current)
+            current, current_tokens = [], 0
+
+        current.append((index, text))
+        current_tokens += tokens
+
+    if current:
+        chunks.append(current)
+    return chunks
@@ -1,105 +1,272 @@
 #!/usr/bin/env python3
-import requests
 import json
 import os
 import time
 from datetime import datetime
 import sys
+import multiprocessing
+from rate_limiter import SharedRateLimiter
+from translation_backends import create_backend
+from token_chunker import (
+    build_chunks, count_tokens, max_tokens_for, split_long_text,
+    PARAGRAPH_SEPARATOR, TARGET_CHUNK_TOKENS, MAX_CHUNK_TOKENS
+)
+from pipeline_metrics import PipelineMetrics
+from progress_dashboard import ProgressDashboard
+from stage_profiler import StageProfiler
+from translation_scheduler import DEFAULT_WEIGHTS, order_articles, priority_from_args
+from token_budget import TokenBudget, BUDGET_STATE_FILE, token_cost
+import paragraph_store
+from sentence_align import attach_alignment
+from glossary import Glossary, GLOSSARY_FILE, format_terms
+
+# 多进程共享的频率控制状态文件
+RATE_LIMIT_STATE_FILE = ".rate_limit_state"
+
+# 指标输出目录（事件日志和 Prometheus 文本文件）
+METRICS_DIR = "metrics"
+
+# 性能分析输出目录（--profile）
+PROFILE_DIR = os.path.join("profile", "translate")
+
+# 工作进程因预算用完而跳过文章时返回的错误
+BUDGET_SKIPPED = "预算已用完，跳过"
+
+# 段落库模式下最多缓存多少段未写出的段落
+STREAM_BUFFER_PARAGRAPHS = 64
+
+def build_messages(text, terms=()):
+    """构造单段翻译的请求消息，terms 为需要统一译法的术语 [(术语, 译法)]"""
+    prompt = f"""请将以下英文文本翻译成中文。要求：
+1. 保持原文的语义和风格
+2. 使用自然流畅的中文表达
+3. 对于专业术语，请使用准确的中文对应词汇
+4. 只返回翻译结果，不要添加任何解释
+
+{format_terms(terms)}英文原文：
+{text}"""
+    
+    return [
+        {
+            "role": "user",
+            "content": prompt
+        }
+    ]
+
+def build_group_messages(texts, terms=()):
+    """构造多段合并翻译的请求消息，段落之间用分隔标记隔开"""
+    joined = f"\n{PARAGRAPH_SEPARATOR}\n".join(texts)
+    prompt = f"""请将以下英文文本翻译成中文。原文包含 {len(texts)} 个段落，段落之间用 {PARAGRAPH_SEPARATOR} 分隔。要求：
+1. 保持原文的语义和风格
+2. 使用自然流畅的中文表达
+3. 对于专业术语，请使用准确的中文对应词汇
+4. 译文中在相同位置原样保留 {PARAGRAPH_SEPARATOR} 分隔标记，段落数量必须一致
+5. 只返回翻译结果，不要添加任何解释
+
+{format_terms(terms)}英文原文：
+{joined}"""
+    
+    return [
+        {
+            "role": "user",
+            "content": prompt
+        }
+    ]
+
+class StreamProgress:
+    """流式翻译的实时进度：显示当前工作进程接收的 token 数和速度"""
+    def __init__(self, worker_name, refresh_interval=0.5):
+        self.worker_name = worker_name
+        self.refresh_interval = refresh_interval
+        self.tokens = 0
+        self.start_time = time.time()
+        self.last_refresh = 0
+    
+    def on_token(self, text):
+        """每收到一段增量文本调用一次"""
+        self.tokens += 1
+        now = time.time()
+        if now - self.last_refresh >= self.refresh_interval:
+            self.last_refresh = now
+            self.show(now)
+    
+    def show(self, now):
+        elapsed = max(now - self.start_time, 1e-6)
+        print(f"\r    [{self.worker_name}] 已接收 {self.tokens} tokens, {self.tokens/elapsed:.1f} tokens/s",
+              end='', flush=True)
+    
+    def finish(self):
+        if self.tokens:
+            self.show(time.time())
+            print()
 
 class SimpleTranslator:
-    def __init__(self, api_key):
+    def __init__(self, api_key, rate_limiter=None, backend=None, metrics=None, budget=None, glossary=None):
         self.api_key = api_key
-        self.base_url = "https://api.siliconflow.cn/v1/chat/completions"
-        self.headers = {
-            'Authorization': f'Bearer {api_key}',
-            'Content-Type': 'application/json'
-        }
-        self.rate_limit = 0.5  # 每500ms一个请求
+        # 翻译后端（默认根据环境变量创建，见 translation_backends.create_backend）
+        self.backend = backend or create_backend(api_key)
+        # 默认每500ms一个请求（TRANSLATE_RATE_LIMIT 可覆盖，压测时可设为 0）
+        self.rate_limit = float(os.getenv("TRANSLATE_RATE_LIMIT", "0.5"))
         self.last_request_time = 0
+        self.rate_limiter = rate_limiter  # 多进程时共享的频率控制
+        # 累计请求数和 token 用量
+        self.request_count = 0
+        self.tokens_in = 0
+        self.tokens_out = 0
+        self.cost = 0.0
+        self.budget = budget  # token / 费用预算（见 token_budget.TokenBudget），None 为不限制
+        # 术语表：默认读取 data/glossary.json，TRANSLATE_GLOSSARY 可指定其他文件（设为空则不使用）
+        if glossary is None:
+            glossary = Glossary.load(os.getenv("TRANSLATE_GLOSSARY", os.path.join("data", GLOSSARY_FILE)))
+        self.glossary = glossary
+        self.metrics = metrics or PipelineMetrics()
+        self.profiler = StageProfiler(PROFILE_DIR, enabled=False)
     
     def wait_for_rate_limit(self):
         """确保请求频率控制"""
-        current_time = time.time()
-        time_since_last_request = current_time - self.last_request_time
+        with self.metrics.timer('rate_limit_wait'):
+            if self.rate_limiter:
+                self.rate_limiter.wait()
+                self.last_request_time = time.time()
+                return
+            
+            current_time = time.time()
+            time_since_last_request = current_time - self.last_request_time
+            
+            if time_since_last_request < self.rate_limit:
+                sleep_time = self.rate_limit - time_since_last_request
+                time.sleep(sleep_time)
+            
+            self.last_request_time = time.time()
+    
+    def request(self, messages):
+        """发送一次翻译请求，max_tokens 按输入长度设置，并累计 token 用量和费用"""
+        input_tokens = sum(count_tokens(m['content']) for m in messages)
+        max_tokens = max_tokens_for(input_tokens)
+        
+        with self.profiler.stage('rate_limit_wait'):
+            # 预算检查时按输出与输入 token 数相当估算
+            refused = self.budget.wait(input_tokens, input_tokens) if self.budget else None
+            if not refused:
+                self.wait_for_rate_limit()
+        if refused:
+            # 超出预算：不发送请求，段落标记为翻译失败，留到下次运行
+            self.metrics.inc('failures', cause='budget')
+            return {"success": False, "content": "", "status_code": 0,
+                    "error": f"预算已用完（{refused}）", "usage": None}
+        start = time.perf_counter()
+        with self.profiler.stage('api'):
+            if self.backend.stream:
+                # 流式模式：边接收边显示速度，只受空闲超时限制
+                progress = StreamProgress(multiprocessing.current_process().name)
+                result = self.backend.chat(messages, temperature=0.7, max_tokens=max_tokens,
+                                           on_token=progress.on_token)
+                progress.finish()
+            else:
+                result = self.backend.chat(messages, temperature=0.7, max_tokens=max_tokens)
+        latency = time.perf_counter() - start
         
-        if time_since_last_request < self.rate_limit:
-            sleep_time = self.rate_limit - time_since_last_request
-            time.sleep(sleep_time)
+        self.request_count += 1
+        self.metrics.observe('api_latency', latency)
+        self.metrics.inc('api_requests', status=result['status_code'])
         
-        self.last_request_time = time.time()
+        tokens_in = tokens_out = 0
+        cost = 0.0
+        if result['success']:
+            # 服务商没有返回 usage 时（如流式响应）使用估算值
+            usage = result.get('usage') or {}
+            tokens_in = usage.get('prompt_tokens', input_tokens)
+            tokens_out = usage.get('completion_tokens', count_tokens(result['content']))
+            self.tokens_in += tokens_in
+            self.tokens_out += tokens_out
+            cost = self.budget.record(tokens_in, tokens_out) if self.budget else token_cost(tokens_in, tokens_out)
+            self.cost += cost
+        else:
+            # 失败原因：HTTP 状态码或异常（状态码为 0 表示请求没有完成）
+            cause = f"http_{result['status_code']}" if result['status_code'] else "exception"
+            self.metrics.inc('failures', cause=cause)
+            if result['status_code']:
+                print(f"    API错误: {result['error']}")
+            else:
+                print(f"    翻译异常: {result['error']}")
+        
+        self.metrics.event(
+            'request',
+            status=result['status_code'],
+            latency=round(latency, 4),
+            tokens_in=tokens_in,
+            tokens_out=tokens_out,
+            cost=round(cost, 6),
+            error=result['error'] or None
+        )
+        return result
     
     def translate_text(self, text):
         """翻译单段文本"""
-        self.wait_for_rate_limit()
+        result = self.request(build_messages(text, self.glossary.lookup([text])))
         
-        prompt = f"""请将以下英文文本翻译成中文。要求：
-1. 保持原文的语义和风格
-2. 使用自然流畅的中文表达
-3. 对于专业术语，请使用准确的中文对应词汇
-4. 只返回翻译结果，不要添加任何解释
+        if result['success']:
+            return {
+                "success": True,
+                "translated": result['content'],
+                "original": text
+            }
+        
+        return {
+            "success": False,
+            "error": result['error'],
+            "original": text,
+            "translated": f"[翻译失败] {text[:50]}..."
+        }
+    
+    def translate_group(self, texts):
+        """在一次请求中翻译多个段落，返回与 texts 一一对应的结果列表
 
-英文原文：
-{text}"""
+        译文中的分隔标记数量不对时，退回逐段翻译。
+        """
+        if len(texts) == 1:
+            return [self.translate_text(texts[0])]
         
-        try:
-            payload = {
-                "model": "Qwen/Qwen2.5-72B-Instruct",
-                "messages": [
+        result = self.request(build_group_messages(texts, self.glossary.lookup(texts)))
+        if result['success']:
+            parts = [part.strip() for part in result['content'].split(PARAGRAPH_SEPARATOR)]
+            if len(parts) == len(texts) and all(parts):
+                return [
                     {
-                        "role": "user",
-                        "content": prompt
+                        "success": True,
+                        "translated": part,
+                        "original": text
                     }
-                ],
-                "temperature": 0.7,
-                "max_tokens": 4000
-            }
-            
-            response = requests.post(
-                self.base_url,
-                headers=self.headers,
-                json=payload,
-                timeout=20
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                translated_text = result['choices'][0]['message']['content'].strip()
-                return {
-                    "success": True,
-                    "translated": translated_text,
-                    "original": text
-                }
-            else:
-                error_details = ""
-                try:
-                    error_json = response.json()
-                    error_details = str(error_json)
-                except:
-                    error_details = response.text
-                print(f"    API错误: {response.status_code} - {error_details}")
-                return {
+                    for part, text in zip(parts, texts)
+                ]
+            print(f"    分段数量不匹配（{len(parts)}/{len(texts)}），改为逐段翻译")
+            self.metrics.inc('failures', cause='separator_mismatch')
+        elif self.budget and self.budget.exhausted:
+            # 预算用完时不再逐段重试
+            return [
+                {
                     "success": False,
-                    "error": f"HTTP {response.status_code}: {error_details}",
+                    "error": result['error'],
                     "original": text,
                     "translated": f"[翻译失败] {text[:50]}..."
                 }
-                
-        except Exception as e:
-            print(f"    翻译异常: {e}")
-            return {
-                "success": False,
-                "error": str(e),
-                "original": text,
-                "translated": f"[翻译失败] {text[:50]}..."
-            }
+                for text in texts
+            ]
+        
+        self.metrics.inc('retries', len(texts))
+        return [self.translate_text(text) for text in texts]
 
 def translate_article(article_file, translator):
-    """翻译单篇文章"""
+    """翻译单篇文章中未翻译和翻译失败的段落，已有的译文（包括句子对齐）保持不变"""
     print(f"\n处理文章: {os.path.basename(article_file)}")
+    metrics = translator.metrics
+    profiler = translator.profiler
+    article_start = time.perf_counter()
     
     # 读取文章数据
     try:
-        with open(article_file, 'r', encoding='utf-8') as f:
+        with metrics.timer('json_read'), profiler.stage('json_read'), \
+                open(article_file, 'r', encoding='utf-8') as f:
             article_data = json.load(f)
     except Exception as e:
         print(f"读取文件失败: {e}")
@@ -107,15 +274,12 @@ def translate_article(article_file, translator):
     
     # 检查是否已经翻译过
     if 'paragraphs' in article_data and article_data['paragraphs']:
-        # 检查是否有段落需要翻译
-        needs_translation = False
-        for para in article_data['paragraphs']:
-            if para.get('translated', '').startswith('[待翻译]') or para.get('translated', '') == '':
-                needs_translation = True
-                break
-        
-        if not needs_translation:
+        # 检查是否有段落需要翻译（与 check_article_needs_translation 使用同一判断）
+        if not any(needs_paragraph_translation(para) for para in article_data['paragraphs']):
             print("  文章已翻译完成，跳过")
+            # 进度面板按 article 事件统计完成的文章数
+            metrics.event('article', file=os.path.basename(article_file), paragraphs=0, success=0, failed=0,
+                          requests=0, seconds=round(time.perf_counter() - article_start, 3))
             return True
     
     # 获取段落内容
@@ -134,39 +298,85 @@ def translate_article(article_file, translator):
         print("  未找到段落内容")
         return False
     
-    print(f"  找到 {len(paragraphs)} 个段落待翻译")
+    # 已翻译的段落沿用原有数据，只请求其余段落
+    kept = kept_paragraphs(article_data.get('paragraphs') or [], paragraphs)
+    
+    # 按 token 预算合并短段落、拆分长段落（太短的段落直接保留原文）
+    with profiler.stage('chunking'):
+        pending = [(i, p) for i, p in enumerate(paragraphs) if i not in kept and len(p.strip().split()) >= 3]
+        chunks = build_chunks(pending)
+    print(f"  找到 {len(paragraphs)} 个段落，{len(pending)} 个待翻译")
+    metrics.event('article_start', file=os.path.basename(article_file))
+    # 长段落拆成多个片段时，以最后一个片段完成作为该段落完成
+    last_chunk_of = {}
+    for n, chunk in enumerate(chunks):
+        for i, _ in chunk:
+            last_chunk_of[i] = n
+    tokens_in_before = translator.tokens_in
+    tokens_out_before = translator.tokens_out
+    cost_before = translator.cost
+    requests_before = translator.request_count
+    
+    translated_parts = {}
+    failed_indices = set()
+    deferred_indices = set()  # 因预算用完没有翻译的段落
+    
+    for n, chunk in enumerate(chunks):
+        if translator.budget and translator.budget.exhausted:
+            # 预算用完：剩余段落标记为翻译失败，留到下次运行
+            print(f"  预算已用完，剩余 {len(chunks) - n} 个请求留到下次运行")
+            deferred_indices.update(i for rest in chunks[n:] for i, _ in rest)
+            break
+        first, last = chunk[0][0] + 1, chunk[-1][0] + 1
+        label = f"{first}" if first == last else f"{first}-{last}"
+        print(f"  翻译段落 {label}/{len(paragraphs)}（请求 {n+1}/{len(chunks)}）")
+        
+        results = translator.translate_group([text for _, text in chunk])
+        for (i, _), result in zip(chunk, results):
+            if result['success']:
+                translated_parts.setdefault(i, []).append(result['translated'])
+            elif translator.budget and translator.budget.exhausted:
+                deferred_indices.add(i)
+            else:
+                failed_indices.add(i)
+                print(f"    ✗ 段落 {i+1} 翻译失败: {result.get('error', '未知错误')}")
+        if all(result['success'] for result in results):
+            print(f"    ✓ 翻译成功")
+        
+        finished = {i for i, _ in chunk if last_chunk_of[i] == n}
+        metrics.event(
+            'chunk',
+            file=os.path.basename(article_file),
+            paragraphs=len(finished),
+            failed=len(finished & failed_indices)
+        )
     
-    # 翻译每个段落
     translated_paragraphs = []
-    success_count = 0
+    success_count = len(kept)  # 之前已翻译的段落也计入
+    translated_count = 0
     
     for i, paragraph in enumerate(paragraphs):
-        print(f"  翻译段落 {i+1}/{len(paragraphs)}")
-        
-        # 跳过太短的段落
-        if len(paragraph.strip().split()) < 3:
-            translated_paragraphs.append({
-                "original": paragraph,
-                "translated": paragraph  # 短段落直接保留原文
-            })
+        if i in kept:
+            translated_paragraphs.append(kept[i])
             continue
-        
-        # 翻译段落
-        result = translator.translate_text(paragraph)
-        
-        if result['success']:
-            translated_paragraphs.append({
-                "original": paragraph,
-                "translated": result['translated']
-            })
-            success_count += 1
-            print(f"    ✓ 翻译成功")
+        if len(paragraph.strip().split()) < 3:
+            translated = paragraph  # 短段落直接保留原文
+        elif i in failed_indices:
+            translated = f"[翻译失败] {paragraph[:50]}..."
+        elif i in deferred_indices:
+            # 保持待翻译状态，下次运行继续
+            translated = f"[待翻译] {paragraph[:50]}..." if len(paragraph) > 50 else f"[待翻译] {paragraph}"
         else:
-            translated_paragraphs.append({
-                "original": paragraph,
-                "translated": f"[翻译失败] {paragraph[:50]}..."
-            })
-            print(f"    ✗ 翻译失败: {result.get('error', '未知错误')}")
+            # 被拆分的长段落按顺序拼接各片段的译文
+            translated = ''.join(translated_parts[i])
+            success_count += 1
+            translated_count += 1
+        para = {
+            "original": paragraph,
+            "translated": translated
+        }
+        attach_alignment(para)  # 句子对齐，供页面高亮和按句重新翻译
+        translated_paragraphs.append(para)
     
     # 更新文章数据
     article_data['paragraphs'] = translated_paragraphs
@@ -174,19 +384,186 @@ def translate_article(article_file, translator):
     article_data['translation_stats'] = {
         "total_paragraphs": len(paragraphs),
         "success_count": success_count,
-        "success_rate": f"{success_count/len(paragraphs)*100:.1f}%"
+        "success_rate": f"{success_count/len(paragraphs)*100:.1f}%",
+        "api_requests": translator.request_count - requests_before,
+        "tokens_in": translator.tokens_in - tokens_in_before,
+        "tokens_out": translator.tokens_out - tokens_out_before,
+        "cost": round(translator.cost - cost_before, 4)
     }
     
+    metrics.inc('paragraphs_translated', translated_count)
+    metrics.inc('paragraphs_failed', len(failed_indices))
+    
     # 保存翻译结果
     try:
-        with open(article_file, 'w', encoding='utf-8') as f:
+        with metrics.timer('json_write'), profiler.stage('json_write'), \
+                open(article_file, 'w', encoding='utf-8') as f:
             json.dump(article_data, f, ensure_ascii=False, indent=2)
-        print(f"  保存成功: {success_count}/{len(paragraphs)} 段落翻译成功")
+        print(f"  保存成功: 本次翻译 {translated_count} 段，共 {success_count}/{len(paragraphs)} 段落已翻译")
+        metrics.event(
+            'article',
+            file=os.path.basename(article_file),
+            paragraphs=len(paragraphs),
+            success=success_count,
+            failed=len(failed_indices),
+            requests=article_data['translation_stats']['api_requests'],
+            seconds=round(time.perf_counter() - article_start, 3)
+        )
         return True
     except Exception as e:
         print(f"  保存失败: {e}")
         return False
 
+def kept_paragraphs(existing, paragraphs):
+    """已有段落中原文一致且不需要重新翻译的部分，返回 {序号: 段落}"""
+    return {
+        i: existing[i] for i, paragraph in enumerate(paragraphs)
+        if i < len(existing) and isinstance(existing[i], dict)
+        and existing[i].get('original') == paragraph and not needs_paragraph_translation(existing[i])
+    }
+
+def needs_paragraph_translation(para):
+    """段落是否还需要调用API（未翻译或翻译失败，且不是太短的段落）"""
+    translated = para.get('translated', '')
+    pending = translated == '' or translated.startswith('[待翻译]') or translated.startswith('[翻译失败]')
+    return pending and len(para['original'].strip().split()) >= 3
+
+def translate_article_store(article_file, translator):
+    """用段落库逐段翻译单篇文章
+
+    从 data/paragraphs/<slug>.jsonl 逐行读取段落，只翻译未完成的段落，译文逐段追加写出，
+    内存中最多保留一个请求块和 STREAM_BUFFER_PARAGRAPHS 段，最后再流式导出 data/processed 的 JSON。
+    段落库不存在或 JSON 被其他脚本更新过时，先从 JSON 重新转换生成。
+    """
+    slug = os.path.basename(article_file)[:-len('.json')]
+    data_dir = os.path.dirname(os.path.dirname(article_file))
+    store_file = paragraph_store.store_path(data_dir, slug)
+    print(f"\n处理文章: {os.path.basename(article_file)}（段落库）")
+    metrics = translator.metrics
+    profiler = translator.profiler
+    article_start = time.perf_counter()
+
+    try:
+        if not os.path.exists(store_file) or os.path.getmtime(article_file) > os.path.getmtime(store_file):
+            with metrics.timer('json_read'), profiler.stage('json_read'):
+                paragraph_store.convert_json_to_store(article_file, store_file)
+        header = paragraph_store.read_header(store_file)
+    except Exception as e:
+        print(f"读取文件失败: {e}")
+        return False
+
+    metrics.event('article_start', file=os.path.basename(article_file))
+    tokens_in_before = translator.tokens_in
+    tokens_out_before = translator.tokens_out
+    cost_before = translator.cost
+    requests_before = translator.request_count
+
+    total = 0
+    success_count = 0
+    translated_count = 0
+    failed_count = 0
+    buffer = []   # 按顺序等待写出的段落
+    group = []    # 等待合并翻译的段落
+    group_tokens = 0
+
+    def record(para, ok, translated, error=None):
+        nonlocal success_count, translated_count, failed_count
+        if ok:
+            para['translated'] = translated
+            success_count += 1
+            translated_count += 1
+        elif translator.budget and translator.budget.exhausted:
+            # 因预算用完没有翻译：保持待翻译状态，下次运行继续
+            original = para['original']
+            para['translated'] = f"[待翻译] {original[:50]}..." if len(original) > 50 else f"[待翻译] {original}"
+        else:
+            para['translated'] = f"[翻译失败] {para['original'][:50]}..."
+            failed_count += 1
+            print(f"    ✗ 段落翻译失败: {error or '未知错误'}")
+        attach_alignment(para)  # 未翻译的段落同时去掉旧的对齐
+
+    def flush(writer):
+        nonlocal group, group_tokens
+        if group:
+            print(f"  翻译 {len(group)} 个段落（已读取 {total} 段）")
+            results = translator.translate_group([para['original'] for para in group])
+            for para, result in zip(group, results):
+                record(para, result['success'], result.get('translated'), result.get('error'))
+            if all(result['success'] for result in results):
+                print(f"    ✓ 翻译成功")
+            metrics.event(
+                'chunk',
+                file=os.path.basename(article_file),
+                paragraphs=len(group),
+                failed=sum(1 for result in results if not result['success'])
+            )
+            group, group_tokens = [], 0
+        for para in buffer:
+            writer.write(para)
+        buffer.clear()
+
+    try:
+        with paragraph_store.ParagraphWriter(store_file, header) as writer:
+            for para in paragraph_store.iter_paragraphs(store_file):
+                total += 1
+                if len(para['original'].strip().split()) < 3:
+                    para['translated'] = para['original']  # 短段落直接保留原文
+                    buffer.append(para)
+                elif not needs_paragraph_translation(para):
+                    success_count += 1  # 之前已翻译
+                    buffer.append(para)
+                else:
+                    tokens = count_tokens(para['original'])
+                    if tokens > MAX_CHUNK_TOKENS:
+                        # 超长段落按句子拆开，各片段单独请求后拼接
+                        flush(writer)
+                        pieces = [translator.translate_text(piece) for piece in split_long_text(para['original'])]
+                        failed = [piece for piece in pieces if not piece['success']]
+                        record(para, not failed, ''.join(piece['translated'] for piece in pieces if piece['success']),
+                               failed[0].get('error') if failed else None)
+                        metrics.event('chunk', file=os.path.basename(article_file), paragraphs=1, failed=1 if failed else 0)
+                        writer.write(para)
+                        continue
+                    if group and group_tokens + tokens > TARGET_CHUNK_TOKENS:
+                        flush(writer)
+                    group.append(para)
+                    group_tokens += tokens
+                    buffer.append(para)
+                if len(buffer) >= STREAM_BUFFER_PARAGRAPHS:
+                    flush(writer)
+            flush(writer)
+
+            header['translation_completed'] = datetime.now().isoformat()
+            header['translation_stats'] = {
+                "total_paragraphs": total,
+                "success_count": success_count,
+                "success_rate": f"{success_count/total*100:.1f}%" if total else "0.0%",
+                "api_requests": translator.request_count - requests_before,
+                "tokens_in": translator.tokens_in - tokens_in_before,
+                "tokens_out": translator.tokens_out - tokens_out_before,
+                "cost": round(translator.cost - cost_before, 4)
+            }
+
+        with metrics.timer('json_write'), profiler.stage('json_write'):
+            paragraph_store.export_store_to_json(store_file, article_file)
+    except Exception as e:
+        print(f"  保存失败: {e}")
+        return False
+
+    metrics.inc('paragraphs_translated', translated_count)
+    metrics.inc('paragraphs_failed', failed_count)
+    print(f"  保存成功: 本次翻译 {translated_count} 段，共 {success_count}/{total} 段落已翻译")
+    metrics.event(
+        'article',
+        file=os.path.basename(article_file),
+        paragraphs=total,
+        success=translated_count,
+        failed=failed_count,
+        requests=header['translation_stats']['api_requests'],
+        seconds=round(time.perf_counter() - article_start, 3)
+    )
+    return True
+
 def check_article_needs_translation(article_file):
     """检查文章是否需要翻译"""
     try:
@@ -196,22 +573,79 @@ def check_article_needs_translation(article_file):
         # 检查是否已经翻译过
         if 'paragraphs' in data and data['paragraphs']:
             # 检查是否有段落需要翻译
-            for para in data['paragraphs']:
-                translated = para.get('translated', '')
-                if translated.startswith('[待翻译]') or translated.startswith('[翻译失败]') or translated == '':
-                    return True
-            return False
+            return any(needs_paragraph_translation(para) for para in data['paragraphs'])
         else:
             # 没有paragraphs字段，需要翻译
             return True
     except:
         return True
 
-def translate_batch(data_dir, api_key):
-    """批量翻译所有未完成的文章"""
-    translator = SimpleTranslator(api_key)
+# 工作进程内的翻译器（由 init_worker 创建）
+_worker_translator = None
+_worker_translate = translate_article
+
+def init_worker(api_key, state_file, interval, events_file=None, store=False, budget_file=None, run_id=None):
+    """初始化工作进程，所有进程共享同一个频率限制和 token 预算"""
+    global _worker_translator, _worker_translate
+    _worker_translate = translate_article_store if store else translate_article
+    rate_limiter = SharedRateLimiter(state_file, interval)
+    _worker_translator = SimpleTranslator(
+        api_key,
+        rate_limiter=rate_limiter,
+        metrics=PipelineMetrics(events_file),
+        budget=TokenBudget.from_env(budget_file, run_id=run_id) if budget_file else None
+    )
+
+def translate_article_in_worker(article_file):
+    """在工作进程中翻译单篇文章，同时返回本进程的累计指标"""
+    if _worker_translator.budget and _worker_translator.budget.exhausted:
+        return article_file, False, BUDGET_SKIPPED, os.getpid(), _worker_translator.metrics.to_dict()
+    try:
+        ok, error = _worker_translate(article_file, _worker_translator), None
+    except Exception as e:
+        ok, error = False, str(e)
+    return article_file, ok, error, os.getpid(), _worker_translator.metrics.to_dict()
+
+def count_translatable_paragraphs(article_file):
+    """统计文章中还需要调用API的段落数（已翻译和太短的段落不计，与 translate_article 一致）"""
+    try:
+        with open(article_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except:
+        return 0
+    if 'content' in data and 'paragraphs' in data['content']:
+        paragraphs = data['content']['paragraphs']
+    else:
+        paragraphs = [p['original'] if isinstance(p, dict) else p for p in data.get('paragraphs', [])]
+    kept = kept_paragraphs(data.get('paragraphs') or [], paragraphs)
+    return sum(1 for i, p in enumerate(paragraphs) if i not in kept and len(p.strip().split()) >= 3)
+
+def translate_batch(data_dir, api_key, workers=1, progress=False, profile=False, store=False, dedup=False,
+                    priority=DEFAULT_WEIGHTS, resume=False):
+    """批量翻译所有未完成的文章，按 priority 权重决定顺序（None 为按文件名）
+
+    token / 费用预算用完时停止发送请求，resume 时沿用上次运行的累计用量。
+    """
+    translate = translate_article_store if store else translate_article
+    metrics_dir = os.path.join(data_dir, METRICS_DIR)
+    events_file = os.path.join(metrics_dir, 'events.jsonl')
+    metrics = PipelineMetrics(events_file)
+    budget_file = os.path.join(data_dir, BUDGET_STATE_FILE)
+    budget = TokenBudget.from_env(budget_file)
+    budget.start_run(resume=resume)
+    translator = SimpleTranslator(api_key, metrics=metrics, budget=budget)
+    if profile:
+        translator.profiler = StageProfiler(os.path.join(data_dir, PROFILE_DIR), enabled=True)
+        if workers > 1:
+            print("性能分析模式只支持单进程，忽略 --workers")
+            workers = 1
     processed_dir = os.path.join(data_dir, 'processed')
     
+    # 先做全语料段落去重：相同段落只翻译一次，剩下的（如去重阶段失败的段落）再按文章翻译
+    if dedup:
+        from paragraph_dedup import dedup_corpus
+        dedup_corpus(data_dir, translator)
+    
     # 获取所有需要翻译的文章
     articles_to_translate = []
     
@@ -221,7 +655,10 @@ def translate_batch(data_dir, api_key):
             if check_article_needs_translation(article_file):
                 articles_to_translate.append(article_file)
     
+    articles_to_translate = order_articles(data_dir, articles_to_translate, priority)
     print(f"找到 {len(articles_to_translate)} 篇文章需要翻译")
+    if articles_to_translate:
+        print(f"  优先翻译: {', '.join(os.path.basename(f) for f in articles_to_translate[:5])}")
     
     if not articles_to_translate:
         print("所有文章已完成翻译！")
@@ -230,12 +667,59 @@ def translate_batch(data_dir, api_key):
     # 批量翻译
     success_count = 0
     failed_count = 0
+    skipped_count = 0
+    
+    # 进度面板：读取事件日志，写状态文件；progress=True 时在终端实时显示
+    dashboard = ProgressDashboard(
+        events_file,
+        os.path.join(metrics_dir, 'status.json'),
+        total_paragraphs=sum(count_translatable_paragraphs(f) for f in articles_to_translate),
+        total_articles=len(articles_to_translate),
+        live=progress
+    )
+    dashboard.start()
+    
+    if workers > 1:
+        # 多进程翻译，通过共享状态文件控制总请求频率
+        print(f"启动 {workers} 个工作进程")
+        state_file = os.path.join(data_dir, RATE_LIMIT_STATE_FILE)
+        with multiprocessing.Pool(
+            workers,
+            initializer=init_worker,
+            initargs=(api_key, state_file, translator.rate_limit, events_file, store, budget_file, budget.run_id)
+        ) as pool:
+            worker_metrics = {}
+            results = pool.imap_unordered(translate_article_in_worker, articles_to_translate)
+            for i, (article_file, ok, error, pid, snapshot) in enumerate(results):
+                worker_metrics[pid] = snapshot
+                if error == BUDGET_SKIPPED:
+                    skipped_count += 1
+                    continue
+                print(f"\n进度: {i+1}/{len(articles_to_translate)}")
+                if ok:
+                    success_count += 1
+                    print(f"✓ 成功翻译: {os.path.basename(article_file)}")
+                elif error:
+                    failed_count += 1
+                    print(f"✗ 翻译异常: {os.path.basename(article_file)} - {error}")
+                else:
+                    failed_count += 1
+                    print(f"✗ 翻译失败: {os.path.basename(article_file)}")
+        for snapshot in worker_metrics.values():
+            metrics.merge(snapshot)
+        articles_to_translate = []
     
     for i, article_file in enumerate(articles_to_translate):
+        if budget.exhausted:
+            # 预算用完：剩下的文章留到下次运行
+            skipped_count = len(articles_to_translate) - i
+            break
         print(f"\n进度: {i+1}/{len(articles_to_translate)}")
         
         try:
-            if translate_article(article_file, translator):
+            with translator.profiler.article(os.path.basename(article_file)[:-len('.json')]):
+                ok = translate(article_file, translator)
+            if ok:
                 success_count += 1
                 print(f"✓ 成功翻译: {os.path.basename(article_file)}")
             else:
@@ -245,16 +729,32 @@ def translate_batch(data_dir, api_key):
             failed_count += 1
             print(f"✗ 翻译异常: {os.path.basename(article_file)} - {e}")
     
+    dashboard.stop()
+    
     print(f"\n批量翻译完成:")
     print(f"  成功: {success_count} 篇")
     print(f"  失败: {failed_count} 篇")
     print(f"  总计: {success_count + failed_count} 篇")
+    if skipped_count:
+        print(f"  预算用完未处理: {skipped_count} 篇")
+    
+    metrics.print_summary()
+    budget.print_summary()
+    translator.profiler.write_summary()
+    prometheus_file = os.path.join(metrics_dir, 'translate.prom')
+    metrics.write_prometheus(prometheus_file)
+    print(f"  指标文件: {prometheus_file}, 事件日志: {events_file}")
     
     return failed_count == 0
 
-def translate_single_article(article_id, data_dir, api_key):
+def translate_single_article(article_id, data_dir, api_key, profile=False, store=False, resume=False):
     """翻译单篇文章"""
-    translator = SimpleTranslator(api_key)
+    translate = translate_article_store if store else translate_article
+    budget = TokenBudget.from_env(os.path.join(data_dir, BUDGET_STATE_FILE))
+    budget.start_run(resume=resume)
+    translator = SimpleTranslator(api_key, budget=budget)
+    if profile:
+        translator.profiler = StageProfiler(os.path.join(data_dir, PROFILE_DIR), enabled=True)
     
     # 查找文章文件
     processed_dir = os.path.join(data_dir, 'processed')
@@ -283,46 +783,83 @@ def translate_single_article(article_id, data_dir, api_key):
         print(f"错误: 未找到文章ID {article_id}")
         return False
     
-    return translate_article(article_file, translator)
+    with translator.profiler.article(os.path.basename(article_file)[:-len('.json')]):
+        ok = translate(article_file, translator)
+    translator.profiler.write_summary()
+    budget.print_summary()
+    return ok
 
-from dotenv import load_dotenv
+def print_usage():
+    """显示命令行用法"""
+    print("用法:")
+    print("  python translate_simple.py single <article_id>  # 翻译单篇文章")
+    print("  python translate_simple.py batch               # 批量翻译所有未完成的文章")
+    print("  python translate_simple.py batch --workers N   # 使用N个进程批量翻译（共享请求频率限制）")
+    print("  --stream                                       # 流式接收译文（空闲超时代替总超时）")
+    print("  --progress                                     # 终端实时进度面板（建议把输出重定向到日志文件）")
+    print("  --profile                                      # 按文章和阶段统计耗时并保存 cProfile 结果到 data/profile/translate")
+    print("  --store                                        # 使用 data/paragraphs 段落库逐段读写（超长文章不整篇载入内存）")
+    print("  --dedup                                        # 批量翻译前全语料段落去重，相同段落只翻译一次")
+    print("  --priority recency=1,popularity=1,remaining=0.5 # 批量翻译顺序的权重（alpha 为按文件名），也可用 TRANSLATE_PRIORITY")
+    print("  --resume                                       # 继续累计上次运行的预算用量（预算用完后提高上限或次日继续）")
+    print("预算（环境变量，0 为不限制；token 数为输入加输出，费用单位为元）:")
+    print("  TRANSLATE_RUN_TOKEN_LIMIT / TRANSLATE_DAILY_TOKEN_LIMIT / TRANSLATE_RUN_COST_LIMIT / TRANSLATE_DAILY_COST_LIMIT")
+    print("  TRANSLATE_PRICE_IN / TRANSLATE_PRICE_OUT      # 每百万 token 价格，用于计算费用")
+    print("  TRANSLATE_BUDGET_THROTTLE=0.8 TRANSLATE_BUDGET_DELAY=2  # 用量超过上限的 80% 后每个请求额外等待 2 秒")
+    print("  状态文件 data/metrics/status.json 在批量翻译时持续更新，可用于无终端运行")
+    print("示例:")
+    print("  python translate_simple.py single field")
+    print("  python translate_simple.py batch")
+    print("  python translate_simple.py batch --workers 4")
+    print("离线测试（不调用真实API）:")
+    print("  TRANSLATE_BACKEND=mock python translate_simple.py batch")
+    print("  TRANSLATE_API_BASE=http://127.0.0.1:8765/v1/chat/completions python translate_simple.py batch  # 配合 mock_server.py")
 
 if __name__ == "__main__":
+    # 只在作为脚本运行时加载 .env（被其他模块导入时不需要 dotenv）
+    from dotenv import load_dotenv
     load_dotenv()
     # API密钥
     API_KEY = os.getenv("TRANSLATE_API_KEY")
 
-    if not API_KEY:
+    # 模拟后端不需要 API 密钥
+    if not API_KEY and os.getenv("TRANSLATE_BACKEND") != "mock":
         print("错误: 未找到 API 密钥。请在 .env 文件中设置 TRANSLATE_API_KEY。")
         sys.exit(1)
     
     # 数据目录
     DATA_DIR = "data"
     
+    # 流式模式（环境变量会传给工作进程）
+    if "--stream" in sys.argv:
+        os.environ["TRANSLATE_STREAM"] = "1"
+    
     if len(sys.argv) > 1:
         command = sys.argv[1]
         
         if command == "single" and len(sys.argv) > 2:
             # 翻译单篇文章
             article_id = sys.argv[2]
-            translate_single_article(article_id, DATA_DIR, API_KEY)
+            translate_single_article(article_id, DATA_DIR, API_KEY,
+                                     profile="--profile" in sys.argv,
+                                     store="--store" in sys.argv,
+                                     resume="--resume" in sys.argv)
         
         elif command == "batch":
             # 批量翻译所有未完成的文章
-            translate_batch(DATA_DIR, API_KEY)
+            workers = 1
+            if "--workers" in sys.argv:
+                workers = int(sys.argv[sys.argv.index("--workers") + 1])
+            translate_batch(DATA_DIR, API_KEY, workers=workers,
+                            progress="--progress" in sys.argv,
+                            profile="--profile" in sys.argv,
+                            store="--store" in sys.argv,
+                            dedup="--dedup" in sys.argv,
+                            priority=priority_from_args(sys.argv),
+                            resume="--resume" in sys.argv)
         
         else:
-            print("用法:")
-            print("  python translate_simple.py single <article_id>  # 翻译单篇文章")
-            print("  python translate_simple.py batch               # 批量翻译所有未完成的文章")
-            print("示例:")
-            print("  python translate_simple.py single field")
-            print("  python translate_simple.py batch")
+            print_usage()
     
     else:
-        print("用法:")
-        print("  python translate_simple.py single <article_id>  # 翻译单篇文章")
-        print("  python translate_simple.py batch               # 批量翻译所有未完成的文章")
-        print("示例:")
-        print("  python translate_simple.py single field")
-        print("  python translate_simple.py batch")
\ No newline at end of file
+        print_usage()
\ No newline at end of file
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+import json
+import os
+import sys
+from article_index import ArticleIndex
+from translation_memory import TranslationMemory, MEMORY_FILE
+
+# 每个请求合并翻译的标题数
+TITLES_PER_REQUEST = 40
+
+def needs_title_translation(title_zh):
+    """中文标题缺失或仍是占位文本"""
+    return (not title_zh or
+            title_zh.startswith('[待翻译]') or
+            title_zh.startswith('[需要翻译') or
+            '[翻译失败]' in title_zh)
+
+def header_title_zh(data):
+    """processed 文件中的中文标题（旧格式用 title_translated）"""
+    if 'title_translated' in data and 'title_zh' not in data:
+        return data['title_translated']
+    return data.get('title_zh', '')
+
+def load_headers(processed_dir):
+    """读取所有 processed 文件，返回 {文件路径: 数据}"""
+    headers = {}
+    for filename in sorted(os.listdir(processed_dir)):
+        if filename.endswith('.json'):
+            path = os.path.join(processed_dir, filename)
+            with open(path, 'r', encoding='utf-8') as f:
+                headers[path] = json.load(f)
+    return headers
+
+def translate_titles(data_dir, translator=None, dry_run=False):
+    """翻译所有缺少中文标题的文章，一次写入 articles.json 和对应的 processed 文件"""
+    index = ArticleIndex.load(os.path.join(data_dir, 'articles.json'))
+    processed_dir = os.path.join(data_dir, 'processed')
+    headers = load_headers(processed_dir)
+    memory = TranslationMemory(os.path.join(data_dir, MEMORY_FILE))
+
+    # 已有的译文：文章列表、processed 文件和翻译记忆
+    known = {}
+    for article in index.articles:
+        if not needs_title_translation(article.get('title_zh', '')):
+            known.setdefault(article['title'], article['title_zh'])
+    for data in headers.values():
+        if not needs_title_translation(header_title_zh(data)):
+            known.setdefault(data['title'], header_title_zh(data))
+
+    titles = {a['title'] for a in index.articles} | {d['title'] for d in headers.values()}
+    missing = []
+    for title in sorted(titles - set(known)):
+        cached = memory.lookup(title)
+        if cached:
+            known[title] = cached
+        else:
+            missing.append(title)
+
+    print(f"共 {len(titles)} 个标题，{len(missing)} 个需要调用API翻译")
+    if dry_run:
+        for title in missing:
+            print(f"  {title}")
+        return True
+
+    # 合并请求翻译缺失的标题
+    failed = []
+    for start in range(0, len(missing), TITLES_PER_REQUEST):
+        batch = missing[start:start + TITLES_PER_REQUEST]
+        print(f"  翻译标题 {start+1}-{start+len(batch)}/{len(missing)}")
+        for title, result in zip(batch, translator.translate_group(batch)):
+            if result['success']:
+                known[title] = result['translated']
+                memory.add(title, result['translated'], kind='title')
+            else:
+                failed.append(title)
+                print(f"    ✗ {title}: {result.get('error', '未知错误')}")
+
+    # 一次更新文章列表和 processed 文件头
+    for article in index.articles:
+        if needs_title_translation(article.get('title_zh', '')) and article['title'] in known:
+            article['title_zh'] = known[article['title']]
+    updated_files = 0
+    for path, data in headers.items():
+        if needs_title_translation(header_title_zh(data)) and data['title'] in known:
+            if 'title_translated' in data and 'title_zh' not in data:
+                data['title_translated'] = known[data['title']]
+            else:
+                data['title_zh'] = known[data['title']]
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            updated_files += 1
+
+    index.save(os.path.join(data_dir, 'articles.json'), os.path.join(data_dir, 'index'))
+    print(f"完成！文章列表更新 {len(index.changed())} 条，processed 文件更新 {updated_files} 个，失败 {len(failed)} 个")
+    return not failed
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    load_dotenv()
+    DATA_DIR = "data"
+
+    if "--dry-run" in sys.argv:
+        translate_titles(DATA_DIR, dry_run=True)
+        sys.exit(0)
+
+    API_KEY = os.getenv("TRANSLATE_API_KEY")
+    if not API_KEY and os.getenv("TRANSLATE_BACKEND") != "mock":
+        print("错误: 未找到 API 密钥。请在 .env 文件中设置 TRANSLATE_API_KEY。")
+        sys.exit(1)
+
+    from translate_simple import SimpleTranslator
+    ok = translate_titles(DATA_DIR, SimpleTranslator(API_KEY))
+    sys.exit(0 if ok else 1)
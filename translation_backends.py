@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+import json
+import os
+import random
+import threading
+import time
+from token_chunker import count_tokens, PARAGRAPH_SEPARATOR
+
+# 默认的翻译服务（SiliconFlow，OpenAI 兼容接口）
+DEFAULT_BASE_URL = "https://api.siliconflow.cn/v1/chat/completions"
+DEFAULT_MODEL = "Qwen/Qwen2.5-72B-Instruct"
+
+class TranslationBackend:
+    """翻译后端接口
+
+    chat() 接收 OpenAI 格式的 messages，返回统一的结果字典：
+    {"success": bool, "content": str, "status_code": int, "error": str, "usage": dict 或 None}
+    usage 为服务商返回的 prompt_tokens / completion_tokens（没有时为 None）。
+    流式模式下每收到一段增量文本就调用一次 on_token(text)。
+    """
+    name = "base"
+    stream = False
+
+    def chat(self, messages, temperature=0.7, max_tokens=4000, on_token=None):
+        raise NotImplementedError
+
+class HTTPBackend(TranslationBackend):
+    """OpenAI 兼容的 chat-completions HTTP 后端"""
+    name = "http"
+
+    def __init__(self, api_key, base_url=DEFAULT_BASE_URL, model=DEFAULT_MODEL, timeout=20,
+                 stream=False, idle_timeout=20):
+        self.base_url = base_url
+        self.model = model
+        self.timeout = timeout
+        # 流式模式：不限制总时长，只要求两次数据之间不超过 idle_timeout 秒
+        self.stream = stream
+        self.idle_timeout = idle_timeout
+        self.headers = {
+            'Authorization': f'Bearer {api_key}',
+            'Content-Type': 'application/json'
+        }
+
+    def build_payload(self, messages, temperature, max_tokens):
+        """构造请求体"""
+        payload = {
+            "model": self.model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens
+        }
+        if self.stream:
+            payload["stream"] = True
+        return payload
+
+    def read_stream(self, response, on_token=None):
+        """读取 SSE 响应，拼接增量文本，返回 (文本, usage)"""
+        parts = []
+        usage = None
+        # SSE 固定为 UTF-8；响应头没有 charset 时 requests 会按 ISO-8859-1 解码，因此按字节读取后自行解码
+        for raw in response.iter_lines():
+            line = raw.decode('utf-8')
+            if not line or not line.startswith('data:'):
+                continue
+            data = line[len('data:'):].strip()
+            if data == '[DONE]':
+                break
+            chunk = json.loads(data)
+            if chunk.get('usage'):
+                usage = chunk['usage']
+            if not chunk.get('choices'):
+                continue
+            delta = chunk['choices'][0].get('delta', {}).get('content') or ''
+            if delta:
+                parts.append(delta)
+                if on_token:
+                    on_token(delta)
+        return ''.join(parts).strip(), usage
+
+    def chat(self, messages, temperature=0.7, max_tokens=4000, on_token=None):
+        import requests  # 只有 HTTP 后端需要，模拟后端和只读命令不加载
+        try:
+            response = requests.post(
+                self.base_url,
+                headers=self.headers,
+                json=self.build_payload(messages, temperature, max_tokens),
+                # 流式模式下 requests 的读超时即两次数据之间的空闲超时
+                timeout=(self.timeout, self.idle_timeout) if self.stream else self.timeout,
+                stream=self.stream
+            )
+        except Exception as e:
+            return {
+                "success": False,
+                "content": "",
+                "status_code": 0,
+                "error": str(e),
+                "usage": None
+            }
+
+        if response.status_code == 200:
+            try:
+                if self.stream:
+                    content, usage = self.read_stream(response, on_token)
+                else:
+                    result = response.json()
+                    content = result['choices'][0]['message']['content'].strip()
+                    usage = result.get('usage')
+                return {
+                    "success": True,
+                    "content": content,
+                    "status_code": 200,
+                    "error": "",
+                    "usage": usage
+                }
+            except Exception as e:
+                return {
+                    "success": False,
+                    "content": "",
+                    "status_code": 200,
+                    "error": f"响应读取失败: {e}",
+                    "usage": None
+                }
+
+        try:
+            error_details = str(response.json())
+        except:
+            error_details = response.text
+        return {
+            "success": False,
+            "content": "",
+            "status_code": response.status_code,
+            "error": f"HTTP {response.status_code}: {error_details}",
+            "usage": None
+        }
+
+class MockBackend(TranslationBackend):
+    """确定性的本地模拟后端，用于离线测试和性能测量
+
+    - latency / jitter: 每次请求的延迟（秒）及随机抖动
+    - distribution: 延迟分布，uniform（latency + [0, jitter]）、
+      lognormal（中位数 latency，对数标准差 jitter）或 exponential（latency + 均值 jitter 的指数分布）
+    - error_rate: 返回 HTTP 500 的概率
+    - rate_limit_rate: 返回 HTTP 429 的概率
+    - seed: 随机种子，同样的参数和请求顺序得到同样的结果
+    - stream: 按词回调 on_token，模拟流式响应
+    """
+    name = "mock"
+
+    def __init__(self, latency=0.05, jitter=0.0, error_rate=0.0, rate_limit_rate=0.0, seed=0,
+                 stream=False, distribution="uniform"):
+        self.stream = stream
+        self.latency = latency
+        self.jitter = jitter
+        self.distribution = distribution
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+
+    def next_outcome(self):
+        """决定下一次请求的延迟和状态码"""
+        with self.lock:
+            if self.distribution == "lognormal":
+                delay = self.latency * self.random.lognormvariate(0, self.jitter)
+            elif self.distribution == "exponential" and self.jitter > 0:
+                delay = self.latency + self.random.expovariate(1 / self.jitter)
+            else:
+                delay = self.latency + self.random.uniform(0, self.jitter)
+            roll = self.random.random()
+
+        if roll < self.rate_limit_rate:
+            return delay, 429
+        if roll < self.rate_limit_rate + self.error_rate:
+            return delay, 500
+        return delay, 200
+
+    def fake_translation(self, messages):
+        """生成模拟译文（取提示词中的原文部分，合并请求的每个段落分别标记）"""
+        prompt = messages[-1]['content']
+        text = prompt.split("英文原文：", 1)[-1].strip()
+        parts = [f"[模拟译文] {part.strip()}" for part in text.split(PARAGRAPH_SEPARATOR)]
+        return f"\n{PARAGRAPH_SEPARATOR}\n".join(parts)
+
+    def chat(self, messages, temperature=0.7, max_tokens=4000, on_token=None):
+        delay, status_code = self.next_outcome()
+        time.sleep(delay)
+
+        if status_code == 429:
+            return {
+                "success": False,
+                "content": "",
+                "status_code": 429,
+                "error": "HTTP 429: rate limit exceeded (mock)",
+                "usage": None
+            }
+        if status_code != 200:
+            return {
+                "success": False,
+                "content": "",
+                "status_code": status_code,
+                "error": f"HTTP {status_code}: internal error (mock)",
+                "usage": None
+            }
+        content = self.fake_translation(messages)
+        if self.stream and on_token:
+            for word in content.split(' '):
+                on_token(word + ' ')
+        return {
+            "success": True,
+            "content": content,
+            "status_code": 200,
+            "error": "",
+            "usage": {
+                "prompt_tokens": sum(count_tokens(m['content']) for m in messages),
+                "completion_tokens": count_tokens(content)
+            }
+        }
+
+def create_backend(api_key):
+    """根据环境变量创建翻译后端
+
+    TRANSLATE_BACKEND: http（默认）或 mock
+    TRANSLATE_API_BASE / TRANSLATE_MODEL: 覆盖 HTTP 后端的地址和模型
+    TRANSLATE_STREAM=1: 使用流式（SSE）响应，TRANSLATE_IDLE_TIMEOUT 为空闲超时秒数
+    MOCK_LATENCY / MOCK_JITTER / MOCK_DISTRIBUTION / MOCK_ERROR_RATE / MOCK_429_RATE / MOCK_SEED: 模拟后端参数
+    """
+    backend = os.getenv("TRANSLATE_BACKEND", "http")
+
+    if backend == "mock":
+        return MockBackend(
+            latency=float(os.getenv("MOCK_LATENCY", "0.05")),
+            jitter=float(os.getenv("MOCK_JITTER", "0")),
+            distribution=os.getenv("MOCK_DISTRIBUTION", "uniform"),
+            error_rate=float(os.getenv("MOCK_ERROR_RATE", "0")),
+            rate_limit_rate=float(os.getenv("MOCK_429_RATE", "0")),
+            seed=int(os.getenv("MOCK_SEED", "0")),
+            stream=os.getenv("TRANSLATE_STREAM") == "1"
+        )
+
+    return HTTPBackend(
+        api_key,
+        base_url=os.getenv("TRANSLATE_API_BASE", DEFAULT_BASE_URL),
+        model=os.getenv("TRANSLATE_MODEL", DEFAULT_MODEL),
+        stream=os.getenv("TRANSLATE_STREAM") == "1",
+        idle_timeout=float(os.getenv("TRANSLATE_IDLE_TIMEOUT", "20"))
+    )
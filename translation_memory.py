@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+import hashlib
+import json
+import os
+import re
+from datetime import datetime
+
+# 翻译记忆：原文（规范化后）的哈希 → 译文，追加写入 JSONL，多次运行之间复用
+MEMORY_FILE = "translation_memory.jsonl"
+
+def normalize_text(text):
+    """规范化原文：合并空白，去掉首尾空白"""
+    return re.sub(r'\s+', ' ', text).strip()
+
+def text_key(text):
+    return hashlib.sha1(normalize_text(text).encode('utf-8')).hexdigest()
+
+class TranslationMemory:
+    """按原文查找已有译文，新译文追加到文件末尾（同一原文以最后一条为准）"""
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # 上次写入中断留下的半行
+                    self.entries[entry['key']] = entry
+
+    def __len__(self):
+        return len(self.entries)
+
+    def lookup(self, text):
+        entry = self.entries.get(text_key(text))
+        return entry['target'] if entry else None
+
+    def add(self, text, translation, kind='paragraph'):
+        entry = {
+            "key": text_key(text),
+            "kind": kind,
+            "source": normalize_text(text),
+            "target": translation,
+            "created_at": datetime.now().isoformat()
+        }
+        self.entries[entry['key']] = entry
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
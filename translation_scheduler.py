@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+import json
+import math
+import os
+import sys
+from datetime import datetime
+from article_index import normalize_date
+
+# 翻译任务调度：按优先级排列待翻译的文章，API 吞吐有限时让最重要的文章先完成
+# 优先级 = 各信号（归一化到 0~1）的加权和：
+#   recency    发表日期越新越高（articles.json，无日期为 0）
+#   popularity 阅读量越高越高（可选文件 data/popularity.json：{"文件名（不含扩展名）": 阅读量}）
+#   remaining  剩余待翻译段落越少越高（短文章先完成）
+POPULARITY_FILE = "popularity.json"
+DEFAULT_WEIGHTS = {"recency": 1.0, "popularity": 1.0, "remaining": 0.5}
+
+def parse_priority(spec):
+    """解析权重配置，如 "recency=2,remaining=0"；"alpha" 表示按文件名排序（旧行为），返回 None"""
+    if not spec:
+        return dict(DEFAULT_WEIGHTS)
+    if spec == 'alpha':
+        return None
+    weights = dict.fromkeys(DEFAULT_WEIGHTS, 0.0)
+    for item in spec.split(','):
+        name, _, value = item.partition('=')
+        name = name.strip()
+        if name not in DEFAULT_WEIGHTS:
+            raise ValueError(f"未知的优先级信号: {name}（可用: {', '.join(DEFAULT_WEIGHTS)}）")
+        weights[name] = float(value) if value else 1.0
+    return weights
+
+def slug_of(filename):
+    return os.path.splitext(os.path.basename(filename))[0]
+
+def load_dates(data_dir):
+    """文章列表中的发表日期 {slug: 日期序数}，同一篇文章出现多次时取最新的日期"""
+    try:
+        with open(os.path.join(data_dir, 'articles.json'), 'r', encoding='utf-8') as f:
+            articles = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    dates = {}
+    for article in articles:
+        date = normalize_date(article.get('date'))
+        if date == 'Unknown':
+            continue
+        slug = slug_of(article['filename'])
+        ordinal = datetime.strptime(date, '%Y-%m-%d').toordinal()
+        dates[slug] = max(dates.get(slug, 0), ordinal)
+    return dates
+
+def load_popularity(data_dir):
+    """可选的阅读量文件，不存在时返回空字典（该信号不起作用）"""
+    path = os.path.join(data_dir, POPULARITY_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return {slug_of(k): float(v) for k, v in json.load(f).items()}
+
+def remaining_paragraphs(article_file):
+    """剩余待翻译的段落数（与 check_article_needs_translation 使用同一判断）"""
+    # translate_simple 导入了本模块，在函数内导入避免循环导入
+    from translate_simple import needs_paragraph_translation
+    try:
+        with open(article_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return 0
+    if data.get('paragraphs'):
+        return sum(1 for p in data['paragraphs'] if isinstance(p, dict) and needs_paragraph_translation(p))
+    # 还没有段落结构：全文待翻译
+    return len(data.get('content', {}).get('paragraphs', []))
+
+def score_articles(data_dir, article_files, weights):
+    """计算每篇文章的优先级，返回 [(文件, 分数, 信号字典)]"""
+    dates = load_dates(data_dir)
+    popularity = load_popularity(data_dir)
+    remaining = {f: remaining_paragraphs(f) for f in article_files}
+
+    known_dates = [dates[slug_of(f)] for f in article_files if slug_of(f) in dates]
+    oldest, newest = (min(known_dates), max(known_dates)) if known_dates else (0, 0)
+    max_views = max((popularity.get(slug_of(f), 0) for f in article_files), default=0)
+    max_remaining = max(remaining.values(), default=0)
+
+    scored = []
+    for article_file in article_files:
+        slug = slug_of(article_file)
+        signals = {
+            "recency": (dates[slug] - oldest) / max(newest - oldest, 1) if slug in dates else 0.0,
+            "popularity": math.log1p(popularity.get(slug, 0)) / math.log1p(max_views) if max_views else 0.0,
+            "remaining": 1 - math.log1p(remaining[article_file]) / math.log1p(max_remaining) if max_remaining else 0.0
+        }
+        score = sum(weights[name] * value for name, value in signals.items())
+        scored.append((article_file, score, dict(signals, paragraphs=remaining[article_file])))
+    return scored
+
+def order_articles(data_dir, article_files, weights=None):
+    """按优先级从高到低排列待翻译的文章；weights 为 None 时按文件名排序"""
+    if weights is None:
+        return sorted(article_files, key=os.path.basename)
+    scored = score_articles(data_dir, article_files, weights)
+    # 分数相同时按文件名，保证顺序稳定
+    scored.sort(key=lambda item: (-item[1], os.path.basename(item[0])))
+    return [article_file for article_file, _, _ in scored]
+
+def priority_from_args(argv):
+    """命令行 --priority 优先，其次环境变量 TRANSLATE_PRIORITY"""
+    spec = os.getenv("TRANSLATE_PRIORITY", "")
+    if "--priority" in argv:
+        spec = argv[argv.index("--priority") + 1]
+    return parse_priority(spec)
+
+if __name__ == "__main__":
+    # 查看当前的翻译队列（不翻译）
+    DATA_DIR = "data"
+    processed_dir = os.path.join(DATA_DIR, 'processed')
+    weights = priority_from_args(sys.argv)
+    top = 20
+    if "--top" in sys.argv:
+        top = int(sys.argv[sys.argv.index("--top") + 1])
+
+    from translate_simple import check_article_needs_translation
+    pending = [
+        os.path.join(processed_dir, f) for f in os.listdir(processed_dir)
+        if f.endswith('.json') and check_article_needs_translation(os.path.join(processed_dir, f))
+    ]
+    print(f"待翻译文章 {len(pending)} 篇，权重: {weights or '按文件名'}")
+    if weights is None:
+        for i, article_file in enumerate(order_articles(DATA_DIR, pending)[:top]):
+            print(f"  {i+1:>3}. {os.path.basename(article_file)}")
+        sys.exit(0)
+    scored = score_articles(DATA_DIR, pending, weights)
+    scored.sort(key=lambda item: (-item[1], os.path.basename(item[0])))
+    for i, (article_file, score, signals) in enumerate(scored[:top]):
+        print(f"  {i+1:>3}. {os.path.basename(article_file):<28} 分数 {score:.3f}  "
+              f"(日期 {signals['recency']:.2f}, 阅读 {signals['popularity']:.2f}, "
+              f"剩余 {signals['paragraphs']} 段)")